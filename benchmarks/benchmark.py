@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Benchmarks do parsing e do cálculo das notas, com baseline versionada.
+
+Para cada cenário (número de atividades × tamanho da página), gera um
+`Adalove.html` sintético com `corpus`, confere que todos os backends
+extraem exatamente o boletim gerado e mede:
+
+- tempo: o melhor de várias repetições (`timeit`, com o número de chamadas
+  por repetição calibrado automaticamente);
+- pico de memória: `tracemalloc` durante uma chamada (só alocações feitas
+  pelo Python; o que os parsers em C alocam por conta própria não entra);
+- pico de RSS: a chamada roda sozinha em um subprocesso novo, e o uso de
+  recursos dele (`os.wait4`) dá o pico de memória residente, que inclui o
+  que selectolax e lxml alocam em C. Desconta-se o pico já atingido na
+  preparação (leitura do arquivo, imports), que o subprocesso informa antes
+  da chamada. Só em sistemas com o módulo `resource` (Linux, macOS).
+
+As medidas das etapas internas de `calcular_notas` são o recorte da tabela
+(`recortar_tabela`), a extração por backend, a extração direto do arquivo,
+o parsing do documento inteiro (sem recorte) e o cálculo
+(`atividades_de_linhas`, `consolidar`, `calcular`).
+
+Os resultados são comparados com `baseline.json`. Se algum tempo ou pico
+passar da baseline além da tolerância, o script sai com código 1 (medidas
+abaixo de TEMPO_MINIMO só reprovam por memória, e variações de RSS abaixo
+de RSS_MINIMO não reprovam: nessa escala domina o ruído).
+A baseline é da máquina em que foi gravada e não é versionada: grave-a
+(`--salvar-baseline`) na mesma máquina em que as comparações serão feitas.
+Se a plataforma ou a versão do Python forem outras, os tempos são só
+exibidos e apenas a memória reprova.
+
+Uso:
+    python benchmarks/benchmark.py                     # compara com a baseline
+    python benchmarks/benchmark.py --rapido            # sem o cenário de 32 MB
+    python benchmarks/benchmark.py --salvar-baseline   # grava uma nova baseline
+"""
+
+import os
+import sys
+import json
+import timeit
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows: sem pico de RSS
+    resource = None
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(DIRETORIO), 'src'))
+
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+from corpus import gerar_boletim, gravar_html
+from extrator import ORDEM_BACKENDS, backend_disponivel, escolher_backend, extrair_linhas, \
+    extrair_linhas_arquivo, recortar_tabela
+from motor import atividades_de_linhas, consolidar, calcular, calcular_linhas
+
+console = Console()
+
+# Configurações
+ARQUIVO_BASELINE = os.path.join(DIRETORIO, 'baseline.json')
+VERSAO_FORMATO = 2
+REPETICOES = 5
+# Mesmo o melhor de várias repetições oscila uns 25% em máquinas
+# compartilhadas; o pico de memória é determinístico, então a tolerância
+# dele pode ser bem menor
+TOLERANCIA_TEMPO = 0.50    # até 50% mais lento que a baseline
+TOLERANCIA_MEMORIA = 0.10  # até 10% mais memória que a baseline
+TOLERANCIA_RSS = 0.20      # até 20% mais RSS (granularidade de páginas, alocadores em C)
+TEMPO_MINIMO = 100e-6      # medidas mais rápidas que isso (s) não reprovam por tempo
+RSS_MINIMO = 1 << 20       # aumentos de RSS menores que isso (bytes) não reprovam
+# ru_maxrss vem em KB no Linux e em bytes no macOS
+UNIDADE_RSS = 1 if sys.platform == 'darwin' else 1024
+
+# (nome, atividades, tamanho da página em bytes, incluído no modo rápido)
+CENARIOS = [
+    ('pagina', 40, 0, True),
+    ('media', 120, 4 << 20, True),
+    ('grande', 400, 32 << 20, False),
+]
+
+
+def medir_tempo(funcao, repeticoes=REPETICOES):
+    """Melhor tempo por chamada, em segundos (`timeit` com autorange)."""
+    timer = timeit.Timer(funcao)
+    numero, _ = timer.autorange()
+    return min(timer.repeat(repeticoes, numero)) / numero
+
+
+def medir_pico(funcao):
+    """Pico de memória alocada pelo Python durante uma chamada, em bytes."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        funcao()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def nomes_medidas(backends):
+    """Nomes das medidas de um cenário, na ordem da tabela."""
+    return (['recorte'] + [f'extracao_{backend}' for backend in backends]
+            + ['arquivo', f'documento_{escolher_backend()}',
+               'atividades', 'consolidar', 'calcular', 'calcular_linhas'])
+
+
+def preparar_medida(caminho, esperado, medida):
+    """
+    Monta só as entradas de uma medida e devolve a função a medir.
+
+    A preparação é mínima para que, no subprocesso do RSS, o pico já
+    atingido antes da chamada seja o menor possível.
+    """
+    escolher_backend()  # importa o backend padrão fora da medida
+    if medida == 'recorte':
+        return lambda: recortar_tabela(caminho)
+    if medida == 'arquivo':
+        return lambda: extrair_linhas_arquivo(caminho)
+    if medida.startswith('extracao_'):
+        backend = medida.partition('_')[2]
+        backend_disponivel(backend)
+        trecho = recortar_tabela(caminho)
+        return lambda: extrair_linhas(trecho, backend)
+    if medida.startswith('documento_'):
+        backend = medida.partition('_')[2]
+        with open(caminho, 'r', encoding='utf-8') as f:
+            documento = f.read()
+        return lambda: extrair_linhas(documento, backend)
+    if medida == 'atividades':
+        return lambda: atividades_de_linhas(esperado)
+    if medida == 'calcular_linhas':
+        return lambda: calcular_linhas(esperado)
+    atividades = atividades_de_linhas(esperado)
+    if medida == 'consolidar':
+        return lambda: consolidar(atividades)
+    if medida == 'calcular':
+        boletim = consolidar(atividades)
+        return lambda: calcular(boletim)
+    raise ValueError(f"Medida desconhecida: {medida}")
+
+
+def conferir_cenario(caminho, esperado, backends):
+    """
+    Confere que todos os backends extraem exatamente o boletim gerado.
+
+    Raises:
+        AssertionError: Se algum backend divergir.
+    """
+    trecho = recortar_tabela(caminho)
+    for backend in backends:
+        linhas = extrair_linhas(trecho, backend)
+        assert linhas == esperado, f"backend {backend} extraiu um boletim diferente do gerado"
+    assert extrair_linhas_arquivo(caminho) == esperado, "extrair_linhas_arquivo divergiu do boletim gerado"
+
+
+def medidas_cenario(caminho, esperado, backends):
+    """
+    Monta as funções a medir em um cenário, conferindo antes os resultados.
+
+    Returns:
+        list: Tuplas (nome da medida, função sem argumentos).
+
+    Raises:
+        AssertionError: Se algum backend não extrair o boletim gerado.
+    """
+    conferir_cenario(caminho, esperado, backends)
+    return [(medida, preparar_medida(caminho, esperado, medida)) for medida in nomes_medidas(backends)]
+
+
+def _executar_medida_rss(caminho, atividades, medida):
+    """
+    Lado do subprocesso de `medir_rss`: prepara a medida, informa o pico de
+    RSS até ali e executa a chamada uma vez.
+    """
+    funcao = preparar_medida(caminho, gerar_boletim(atividades), medida)
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, flush=True)
+    funcao()
+
+
+def medir_rss(caminho, atividades, medida):
+    """
+    Pico de RSS de uma chamada, em bytes, medido em um subprocesso novo.
+
+    Returns:
+        int: Aumento do pico de RSS causado pela chamada, ou None sem `resource`.
+    """
+    if resource is None:
+        return None
+    processo = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--rss', caminho, str(atividades), medida],
+        stdout=subprocess.PIPE, text=True
+    )
+    saida = processo.stdout.read()
+    processo.stdout.close()
+    # Uso de recursos só deste filho (RUSAGE_CHILDREN acumularia o maior de todos)
+    _, status, uso = os.wait4(processo.pid, 0)
+    processo.returncode = os.waitstatus_to_exitcode(status)
+    if processo.returncode != 0:
+        raise RuntimeError(f"subprocesso do RSS falhou em {medida} (código {processo.returncode})")
+    return max(uso.ru_maxrss - int(saida), 0) * UNIDADE_RSS
+
+
+def executar(cenarios, repeticoes=REPETICOES):
+    """
+    Roda os cenários.
+
+    Returns:
+        dict: {'cenario/medida': {'tempo': segundos, 'pico': bytes, 'rss': bytes ou None}}.
+    """
+    backends = [nome for nome in ORDEM_BACKENDS if backend_disponivel(nome)]
+    resultados = {}
+    with tempfile.TemporaryDirectory() as diretorio:
+        for nome, atividades, tamanho, _ in cenarios:
+            caminho = os.path.join(diretorio, f'{nome}.html')
+            esperado = gravar_html(caminho, atividades, tamanho)
+            megabytes = os.path.getsize(caminho) / (1 << 20)
+            console.print(f"[dim]▶ {nome}: {atividades} atividades, {megabytes:.1f} MB[/]")
+            for medida, funcao in medidas_cenario(caminho, esperado, backends):
+                resultados[f'{nome}/{medida}'] = {
+                    'tempo': medir_tempo(funcao, repeticoes),
+                    'pico': medir_pico(funcao),
+                    'rss': medir_rss(caminho, atividades, medida),
+                }
+    return resultados
+
+
+def ler_baseline(caminho=ARQUIVO_BASELINE):
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return None
+    if baseline.get('versao') != VERSAO_FORMATO:
+        return None
+    return baseline
+
+
+def gravar_baseline(resultados, caminho=ARQUIVO_BASELINE):
+    """Grava a baseline (arquivo temporário + rename), preservando cenários não medidos."""
+    anterior = ler_baseline(caminho)
+    medidas = dict(anterior['medidas']) if anterior else {}
+    medidas.update(resultados)
+    temp_path = caminho + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'versao': VERSAO_FORMATO,
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'medidas': dict(sorted(medidas.items())),
+        }, f, indent=2)
+        f.write('\n')
+    os.replace(temp_path, caminho)
+
+
+def _formatar_tempo(segundos):
+    if segundos < 1e-3:
+        return f"{segundos * 1e6:.1f} µs"
+    return f"{segundos * 1e3:.2f} ms"
+
+
+def _formatar_memoria(n):
+    for unidade in ('B', 'KB', 'MB'):
+        if n < 1024:
+            return f"{n:.0f} {unidade}" if unidade == 'B' else f"{n:.1f} {unidade}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def _variacao(atual, referencia):
+    return atual / referencia - 1 if referencia else 0.0
+
+
+def _piorou_rss(atual, base, tolerancia):
+    """Aumento de RSS além da tolerância e de RSS_MINIMO (ruído de páginas)."""
+    if atual is None or base is None:
+        return False
+    return atual - base > RSS_MINIMO and _variacao(atual, base) > tolerancia
+
+
+def comparar(resultados, baseline, tolerancia_tempo=TOLERANCIA_TEMPO, tolerancia_memoria=TOLERANCIA_MEMORIA,
+             tolerancia_rss=TOLERANCIA_RSS):
+    """
+    Exibe os resultados ao lado da baseline.
+
+    Com `tolerancia_tempo=None`, os tempos são só exibidos (não reprovam).
+
+    Returns:
+        list: Nomes das medidas que regrediram.
+    """
+    medidas_base = baseline['medidas'] if baseline else {}
+    tabela = Table(title="⏱️ Benchmarks", box=box.SIMPLE)
+    tabela.add_column("Medida", no_wrap=True)
+    tabela.add_column("Tempo", justify="right", style="cyan", no_wrap=True)
+    tabela.add_column("Δ tempo", justify="right", no_wrap=True)
+    tabela.add_column("Pico", justify="right", style="cyan", no_wrap=True)
+    tabela.add_column("Δ pico", justify="right", no_wrap=True)
+    tabela.add_column("RSS", justify="right", style="cyan", no_wrap=True)
+    tabela.add_column("Δ RSS", justify="right", no_wrap=True)
+    tabela.add_column("", no_wrap=True)
+
+    regressoes = []
+    for chave, atual in resultados.items():
+        base = medidas_base.get(chave)
+        rss = _formatar_memoria(atual['rss']) if atual.get('rss') is not None else "-"
+        if base is None:
+            tabela.add_row(chave, _formatar_tempo(atual['tempo']), "", _formatar_memoria(atual['pico']), "",
+                           rss, "", "[dim]sem baseline[/]")
+            continue
+        delta_tempo = _variacao(atual['tempo'], base['tempo'])
+        delta_pico = _variacao(atual['pico'], base['pico'])
+        tempo_piorou = (tolerancia_tempo is not None and delta_tempo > tolerancia_tempo
+                        and base['tempo'] >= TEMPO_MINIMO)
+        rss_piorou = _piorou_rss(atual.get('rss'), base.get('rss'), tolerancia_rss)
+        piorou = tempo_piorou or delta_pico > tolerancia_memoria or rss_piorou
+        if piorou:
+            regressoes.append(chave)
+        cor_tempo = ("dim" if tolerancia_tempo is None else "red" if tempo_piorou
+                     else "green" if delta_tempo < 0 else "white")
+        cor_pico = "red" if delta_pico > tolerancia_memoria else "green" if delta_pico < 0 else "white"
+        if atual.get('rss') is None or base.get('rss') is None:
+            delta_rss = ""
+        else:
+            variacao_rss = atual['rss'] - base['rss']
+            cor_rss = "red" if rss_piorou else "green" if variacao_rss < 0 else "white"
+            sinal = "-" if variacao_rss < 0 else "+"
+            delta_rss = f"[{cor_rss}]{sinal}{_formatar_memoria(abs(variacao_rss))}[/]"
+        tabela.add_row(
+            chave,
+            _formatar_tempo(atual['tempo']), f"[{cor_tempo}]{delta_tempo:+.0%}[/]",
+            _formatar_memoria(atual['pico']), f"[{cor_pico}]{delta_pico:+.0%}[/]",
+            rss, delta_rss,
+            "[bold red]REGRESSÃO[/]" if piorou else "[green]ok[/]",
+        )
+    console.print(tabela)
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks do parsing e do cálculo das notas')
+    parser.add_argument('--rapido', action='store_true',
+                        help='Pula os cenários grandes (páginas de dezenas de MB)')
+    parser.add_argument('--repeticoes', '-r', type=int, default=REPETICOES,
+                        help=f'Repetições por medida; vale a melhor (padrão: {REPETICOES})')
+    parser.add_argument('--baseline', default=ARQUIVO_BASELINE, metavar='ARQUIVO',
+                        help='Arquivo da baseline (padrão: benchmarks/baseline.json)')
+    parser.add_argument('--salvar-baseline', action='store_true',
+                        help='Grava os resultados como nova baseline em vez de comparar')
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA_TEMPO,
+                        help=f'Piora de tempo tolerada, em fração (padrão: {TOLERANCIA_TEMPO})')
+    parser.add_argument('--tolerancia-memoria', type=float, default=TOLERANCIA_MEMORIA,
+                        help=f'Piora de pico de memória tolerada, em fração (padrão: {TOLERANCIA_MEMORIA})')
+    parser.add_argument('--tolerancia-rss', type=float, default=TOLERANCIA_RSS,
+                        help=f'Piora de pico de RSS tolerada, em fração (padrão: {TOLERANCIA_RSS})')
+    # Uso interno: subprocesso de `medir_rss`
+    parser.add_argument('--rss', nargs=3, metavar=('ARQUIVO', 'ATIVIDADES', 'MEDIDA'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.rss:
+        caminho, atividades, medida = args.rss
+        _executar_medida_rss(caminho, int(atividades), medida)
+        return 0
+
+    cenarios = [cenario for cenario in CENARIOS if cenario[3] or not args.rapido]
+    resultados = executar(cenarios, args.repeticoes)
+    baseline = ler_baseline(args.baseline)
+
+    if args.salvar_baseline:
+        comparar(resultados, None)
+        gravar_baseline(resultados, args.baseline)
+        console.print(f"[green]✓[/] Baseline gravada em [cyan]{args.baseline}[/]")
+        return 0
+
+    if baseline is None:
+        comparar(resultados, None)
+        console.print("[yellow]⚠[/] Nenhuma baseline encontrada; use --salvar-baseline para criar uma.")
+        return 0
+
+    tolerancia_tempo = args.tolerancia
+    if baseline.get('python') != platform.python_version() or baseline.get('plataforma') != platform.platform():
+        console.print(f"[yellow]⚠[/] Baseline gravada em outro ambiente "
+                      f"([dim]{baseline.get('plataforma')}, Python {baseline.get('python')}[/]); "
+                      "os tempos não são comparáveis e só a memória será verificada.")
+        tolerancia_tempo = None
+
+    regressoes = comparar(resultados, baseline, tolerancia_tempo, args.tolerancia_memoria, args.tolerancia_rss)
+    if regressoes:
+        console.print(f"[bold red]✗ {len(regressoes)} medida(s) regrediram:[/] {', '.join(regressoes)}")
+        return 1
+    console.print("[green]✓[/] Nenhuma regressão em relação à baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
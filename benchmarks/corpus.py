@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Gerador de páginas sintéticas no formato do `Adalove.html`.
+
+Produz um boletim aleatório (mas reprodutível pela semente) e o HTML
+correspondente, com a mesma estrutura da página salva do Adalove: linhas
+`tr.styled-tr`, células com `data-label` (com o rótulo móvel antes do
+valor), ícones SVG e o ruído do MUI ao redor (CSS do emotion, menus,
+cartões e o bundle JSON em `<script>`), inclusive menções a `styled-tr`
+fora da tabela. O documento é completado com ruído até o tamanho pedido,
+então o mesmo boletim pode ser testado em páginas de poucos KB a dezenas
+de MB.
+
+Uso:
+    python benchmarks/corpus.py --linhas 60 --tamanho 20MB -o Adalove_sintetico.html
+"""
+
+import os
+import sys
+import random
+import argparse
+from html import escape
+
+# Configurações
+LINHAS_PADRAO = 40
+SEMENTE_PADRAO = 0
+FRACAO_RUIDO_ANTES = 0.6  # parte do ruído de preenchimento antes da tabela
+
+TIPOS_ATIVIDADE = [
+    'Autoestudo', 'Ponderada', 'Artefato', 'Participação', 'Apresentação',
+    'Relatório', 'Sprint Review', 'Avaliação em Pares',
+]
+TEMAS = [
+    'Modelagem de dados', 'Arquitetura & APIs', 'Testes de usabilidade', 'Estatística descritiva',
+    'Programação orientada a objetos', 'Banco de dados relacional', 'Algoritmos de ordenação',
+    'Experiência do usuário', 'Negócios: canvas & proposta de valor', 'Redes neurais',
+    'Computação gráfica', 'Ética em IA', 'Sistemas embarcados', 'Cálculo numérico',
+]
+TEXTOS_MENU = [
+    'Vida acadêmica', 'Calendário', 'Autoestudos', 'Frequência', 'Notas', 'Perfil',
+    'Mensagens', 'Documentos', 'Configurações', 'Sair',
+]
+
+PAGINA_INICIO = (
+    '<!DOCTYPE html><html lang="pt-BR"><head><meta charset="utf-8">'
+    '<title>Adalove</title><meta name="viewport" content="width=device-width,initial-scale=1">'
+)
+ICONE_SVG = (
+    '<svg class="MuiSvgIcon-root MuiSvgIcon-fontSizeSmall css-{id}" focusable="false" '
+    'aria-hidden="true" viewBox="0 0 24 24" data-testid="AssignmentIcon">'
+    '<path d="M19 3h-4.18C14.4 1.84 13.3 1 12 1c-1.3 0-2.4.84-2.82 2H5c-1.1 0-2 .9-2 2v14c0 '
+    '1.1.9 2 2 2h14c1.1 0 2-.9 2-2V5c0-1.1-.9-2-2-2z"></path></svg>'
+)
+
+
+def _id_css(rng):
+    """Sufixo de classe no estilo do emotion (ex: '1x2y3z')."""
+    return ''.join(rng.choice('0123456789abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(5, 7)))
+
+
+def _formatar_numero(valor):
+    """Número como aparece no Adalove: vírgula decimal, sem casas se inteiro."""
+    if valor == int(valor):
+        return str(int(valor))
+    return f"{valor:.1f}".replace('.', ',')
+
+
+def gerar_boletim(linhas=LINHAS_PADRAO, semente=SEMENTE_PADRAO, fracao_pendentes=0.3):
+    """
+    Sorteia um boletim com `linhas` atividades, sendo a última a prova.
+
+    Returns:
+        list: Tuplas `(nome, peso, nota)` como `extrator.extrair_linhas`
+        deve devolvê-las (nota None = pendente).
+    """
+    rng = random.Random(semente)
+    boletim = []
+    for i in range(max(linhas - 1, 0)):
+        nome = f"{rng.choice(TIPOS_ATIVIDADE)} {i + 1} - {rng.choice(TEMAS)}"
+        peso = float(rng.choice([1, 1, 2, 2, 3, 5])) / rng.choice([1, 1, 2])
+        nota = None if rng.random() < fracao_pendentes else round(rng.uniform(3, 10) * 2) / 2
+        boletim.append((nome, peso, nota))
+    if linhas:
+        boletim.append((f"Prova de Módulo {rng.randint(1, 12)}", float(rng.choice([20, 25, 30])), None))
+    return boletim
+
+
+def _celula(rotulo, conteudo, rng):
+    return (f'<td data-label="{rotulo}" class="MuiTableCell-root MuiTableCell-body '
+            f'MuiTableCell-sizeMedium css-{_id_css(rng)}">{conteudo}</td>')
+
+
+def _valor(rotulo, valor, rng):
+    """Conteúdo de uma célula numérica: rótulo móvel e depois o valor."""
+    texto = '-' if valor is None else _formatar_numero(valor)
+    return (f'<span class="mobile-label css-{_id_css(rng)}">{rotulo}</span>'
+            f'<p class="MuiTypography-root MuiTypography-body2 css-{_id_css(rng)}">{texto}</p>')
+
+
+def gerar_tabela(boletim, semente=SEMENTE_PADRAO):
+    """HTML da tabela de notas (cabeçalho MUI + uma `tr.styled-tr` por atividade)."""
+    rng = random.Random(semente + 1)
+    partes = [
+        f'<div class="MuiTableContainer-root css-{_id_css(rng)}"><table class="MuiTable-root css-{_id_css(rng)}">'
+        f'<thead class="MuiTableHead-root css-{_id_css(rng)}"><tr class="MuiTableRow-root MuiTableRow-head">'
+        '<th>Atividades</th><th>Pontos</th><th>Notas</th><th>Feedback</th></tr></thead>'
+        f'<tbody class="MuiTableBody-root css-{_id_css(rng)}">'
+    ]
+    for nome, peso, nota in boletim:
+        nome_html = (f'<div class="MuiStack-root css-{_id_css(rng)}">{ICONE_SVG.format(id=_id_css(rng))}'
+                     f'<p class="MuiTypography-root MuiTypography-body1 css-{_id_css(rng)}">{escape(nome, quote=False)}</p></div>')
+        partes.append(
+            f'<tr class="MuiTableRow-root styled-tr css-{_id_css(rng)}">'
+            + _celula('Atividades', nome_html, rng)
+            + _celula('Pontos', _valor('Pontos', peso, rng), rng)
+            + _celula('Notas', _valor('Notas', nota, rng), rng)
+            + _celula('Feedback', f'<button class="MuiButton-root css-{_id_css(rng)}" type="button">Ver</button>', rng)
+            + '</tr>'
+        )
+    partes.append('</tbody></table></div>')
+    return ''.join(partes)
+
+
+def _bloco_css(rng):
+    regras = []
+    for _ in range(40):
+        regras.append(f'.css-{_id_css(rng)}{{display:flex;margin:{rng.randint(0, 32)}px;'
+                      f'color:rgba(0,0,0,0.{rng.randint(10, 99)});font-family:"Roboto",sans-serif}}')
+    regras.append('.styled-tr:hover{background-color:#f5f5f5}.styled-tr td{padding:8px 16px}')
+    return f'<style data-emotion="css {_id_css(rng)}">{"".join(regras)}</style>'
+
+
+def _bloco_marcacao(rng):
+    itens = ''.join(
+        f'<li class="MuiListItem-root css-{_id_css(rng)}"><a class="MuiListItemButton-root css-{_id_css(rng)}" '
+        f'href="/academic-life/{rng.randint(1, 999)}"><span class="MuiListItemText-primary">{texto}</span></a></li>'
+        for texto in rng.sample(TEXTOS_MENU, 6)
+    )
+    cartoes = ''.join(
+        f'<div class="MuiPaper-root MuiCard-root css-{_id_css(rng)}"><div class="MuiCardContent-root">'
+        f'<h6 class="MuiTypography-root MuiTypography-h6">{escape(rng.choice(TEMAS))}</h6>'
+        f'<p class="MuiTypography-root MuiTypography-body2">Encontro {rng.randint(1, 40)} &middot; '
+        f'{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}</p></div></div>'
+        for _ in range(4)
+    )
+    return f'<nav class="MuiDrawer-root css-{_id_css(rng)}"><ul class="MuiList-root">{itens}</ul></nav>{cartoes}'
+
+
+def _bloco_script(rng):
+    registros = ','.join(
+        f'{{"id":{rng.randint(1, 99999)},"className":"styled-tr css-{_id_css(rng)}",'
+        f'"label":"{rng.choice(TIPOS_ATIVIDADE)}","weight":{rng.randint(1, 5)}}}'
+        for _ in range(25)
+    )
+    return f'<script>window.__CHUNK_{_id_css(rng)}__=[{registros}];</script>'
+
+
+def gerar_ruido(tamanho, semente=SEMENTE_PADRAO):
+    """Ruído do MUI (CSS, marcação e scripts) com cerca de `tamanho` caracteres."""
+    rng = random.Random(semente + 2)
+    blocos = (_bloco_css, _bloco_marcacao, _bloco_script)
+    partes = []
+    total = 0
+    i = 0
+    while total < tamanho:
+        bloco = blocos[i % len(blocos)](rng)
+        partes.append(bloco)
+        total += len(bloco)
+        i += 1
+    return ''.join(partes)
+
+
+def gerar_html(boletim, tamanho=0, semente=SEMENTE_PADRAO):
+    """
+    Monta a página completa com a tabela do `boletim`.
+
+    Args:
+        boletim: Retorno de `gerar_boletim`.
+        tamanho: Tamanho mínimo do documento em bytes; o que faltar é
+            preenchido com ruído (FRACAO_RUIDO_ANTES antes da tabela).
+        semente: Semente do ruído e das classes CSS.
+
+    Returns:
+        str: O HTML.
+    """
+    tabela = gerar_tabela(boletim, semente)
+    cabecalho = PAGINA_INICIO + _bloco_css(random.Random(semente + 3)) + '</head><body><div id="root">'
+    rodape = '</div></body></html>'
+    # Estimativa em caracteres; os acentos ocupam 2 bytes em UTF-8, então o
+    # documento final fica um pouco acima do pedido
+    falta = max(tamanho - len(cabecalho) - len(tabela) - len(rodape), 0)
+    antes = gerar_ruido(int(falta * FRACAO_RUIDO_ANTES), semente)
+    depois = gerar_ruido(falta - len(antes), semente + 10)
+    return cabecalho + antes + tabela + depois + rodape
+
+
+def gravar_html(caminho, linhas=LINHAS_PADRAO, tamanho=0, semente=SEMENTE_PADRAO):
+    """
+    Gera e grava uma página sintética.
+
+    Returns:
+        list: O boletim esperado (ver `gerar_boletim`).
+    """
+    boletim = gerar_boletim(linhas, semente)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write(gerar_html(boletim, tamanho, semente))
+    return boletim
+
+
+def tamanho_em_bytes(texto):
+    """Converte '512', '256KB', '20MB' ou '1GB' em bytes."""
+    texto = texto.strip().upper()
+    for sufixo, fator in (('GB', 1 << 30), ('MB', 1 << 20), ('KB', 1 << 10), ('B', 1)):
+        if texto.endswith(sufixo):
+            return int(float(texto[:-len(sufixo)]) * fator)
+    return int(texto)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera um Adalove.html sintético')
+    parser.add_argument('--linhas', '-n', type=int, default=LINHAS_PADRAO,
+                        help=f'Número de atividades, incluindo a prova (padrão: {LINHAS_PADRAO})')
+    parser.add_argument('--tamanho', '-t', type=tamanho_em_bytes, default=0,
+                        help="Tamanho mínimo do documento (ex: 512KB, 20MB; padrão: só a página)")
+    parser.add_argument('--semente', '-s', type=int, default=SEMENTE_PADRAO,
+                        help='Semente do gerador (mesma semente = mesmo arquivo)')
+    parser.add_argument('--saida', '-o', default='Adalove_sintetico.html', metavar='ARQUIVO',
+                        help='Arquivo de saída (padrão: Adalove_sintetico.html)')
+    args = parser.parse_args()
+
+    boletim = gravar_html(args.saida, args.linhas, args.tamanho, args.semente)
+    tamanho = os.path.getsize(args.saida)
+    print(f"{args.saida}: {len(boletim)} atividades, {tamanho / (1 << 20):.2f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
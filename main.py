@@ -7,8 +7,16 @@ Script principal que orquestra a coleta automática de notas do Adalove
 e calcula a nota necessária na prova para atingir a média 7.0.
 
 Uso:
-    python main.py          # Coleta automática + cálculo
-    python main.py --manual # Apenas cálculo (requer Adalove.html)
+    python main.py               # Coleta automática + cálculo
+    python main.py --manual      # Apenas cálculo (requer Adalove.html)
+    python main.py --modulos     # Coleta todos os módulos em paralelo
+    python main.py --daemon      # Mantém um navegador aberto entre execuções
+    python main.py --parar-daemon
+    python main.py --sem-cache   # Ignora o cache de boletins já analisados
+    python main.py --limpar-cache
+    python main.py --batch DIR   # Processa todos os HTML de um diretório
+    python main.py --cenarios    # Matriz de cenários (média alvo × pendentes)
+    python main.py --monte-carlo 1000000 --seed 42
 """
 
 import os
@@ -75,41 +83,55 @@ def print_menu():
     console.print(Panel(menu, title="📋 Menu Principal", border_style="blue"))
 
 
-def executar_coleta():
-    """Executa o módulo de coleta."""
-    try:
-        from src.coletar import coletar_notas
-        return coletar_notas(output_dir=script_dir)
-    except ImportError:
-        # Fallback se a importação falhar
-        coletar_path = os.path.join(src_dir, 'coletar.py')
-        result = subprocess.run([sys.executable, coletar_path], cwd=script_dir)
-        return result.returncode == 0
+def executar_coleta(salvar_html=True, extracao='dom', usar_sessao=True, perfil='completo',
+                    segundo_plano=True, bloquear_urls=None):
+    """
+    Executa o módulo de coleta.
+    
+    Returns:
+        list: Linhas extraídas do boletim, ou False se a coleta falhou.
+    """
+    from src.coletar import coletar_notas
+    return coletar_notas(output_dir=script_dir, salvar_html=salvar_html, extracao=extracao,
+                         usar_sessao=usar_sessao, modo_perfil=perfil, segundo_plano=segundo_plano,
+                         bloquear_recursos=bloquear_urls is not None, bloquear_urls=bloquear_urls or ())
 
 
-def executar_calculo():
-    """Executa o módulo de cálculo."""
-    try:
-        from src.calcular import calcular_notas
-        html_path = os.path.join(script_dir, 'Adalove.html')
-        return calcular_notas(file_path=html_path)
-    except ImportError:
-        # Fallback se a importação falhar
-        calcular_path = os.path.join(src_dir, 'calcular.py')
-        html_path = os.path.join(script_dir, 'Adalove.html')
-        result = subprocess.run([sys.executable, calcular_path, html_path], cwd=script_dir)
-        return result.returncode == 0
-
-
-def modo_automatico():
-    """Executa coleta + cálculo automaticamente."""
-    sucesso = executar_coleta()
-    
-    if sucesso:
+def modo_modulos(concorrencia=None):
+    """Coleta todos os módulos em abas paralelas e resume cada um."""
+    from src.coletar_modulos import coletar_modulos, CONCORRENCIA_MODULOS
+    from src.calcular import calcular_modulos
+    
+    resultados = coletar_modulos(CONCORRENCIA_MODULOS if concorrencia is None else concorrencia)
+    
+    if resultados:
+        console.print()
+        calcular_modulos(resultados)
+    else:
+        console.print(Panel(
+            "[bold red]Não foi possível coletar as notas dos módulos.[/]",
+            title="❌ Erro", border_style="red"
+        ))
+    return bool(resultados)
+
+
+def executar_calculo(usar_cache=True, linhas=None):
+    """Executa o módulo de cálculo (com as linhas em memória, se fornecidas)."""
+    from src.calcular import calcular_notas
+    html_path = os.path.join(script_dir, 'Adalove.html')
+    return calcular_notas(file_path=html_path, usar_cache=usar_cache, linhas=linhas)
+
+
+def modo_automatico(usar_cache=True, salvar_html=True, extracao='dom', usar_sessao=True,
+                    perfil='completo', segundo_plano=True, bloquear_urls=None):
+    """Executa coleta + cálculo automaticamente, sem passar pelo disco."""
+    linhas = executar_coleta(salvar_html, extracao, usar_sessao, perfil, segundo_plano, bloquear_urls)
+    
+    if linhas:
         console.print()
         console.rule("[bold]Iniciando Cálculo[/]")
         console.print()
-        executar_calculo()
+        executar_calculo(usar_cache, linhas)
     else:
         console.print(Panel(
             "[bold red]Não foi possível coletar as notas.[/]\n\n"
@@ -118,7 +140,7 @@ def modo_automatico():
         ))
 
 
-def modo_manual():
+def modo_manual(usar_cache=True):
     """Executa apenas o cálculo com arquivo existente."""
     html_path = os.path.join(script_dir, 'Adalove.html')
     
@@ -135,7 +157,139 @@ def modo_manual():
         ))
         return
     
-    executar_calculo()
+    executar_calculo(usar_cache)
+
+
+def modo_cenarios(usar_cache=True, exportar=None):
+    """Exibe a matriz de cenários com o arquivo existente."""
+    from src.calcular import calcular_cenarios
+    html_path = os.path.join(script_dir, 'Adalove.html')
+    return calcular_cenarios(file_path=html_path, usar_cache=usar_cache, exportar=exportar)
+
+
+def modo_monte_carlo(amostras, seed=None, workers=None, dist_pendentes=None, dist_prova=None,
+                     usar_cache=True):
+    """Estima a probabilidade de aprovação com o arquivo existente."""
+    from src.calcular import calcular_probabilidade
+    html_path = os.path.join(script_dir, 'Adalove.html')
+    return calcular_probabilidade(
+        file_path=html_path, usar_cache=usar_cache, amostras=amostras, seed=seed,
+        workers=workers or 1, dist_pendentes=dist_pendentes, dist_prova=dist_prova
+    )
+
+
+def distribuicao(texto):
+    """Converte 'MEDIA,DESVIO' (argumento de linha de comando) em tupla."""
+    try:
+        media, desvio = (float(v) for v in texto.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError("use o formato MEDIA,DESVIO (ex: 7.5,1.0)")
+    return (media, desvio)
+
+
+def inteiro_positivo(texto):
+    """Converte um argumento de linha de comando em inteiro maior que zero."""
+    try:
+        valor = int(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{texto}' não é um número inteiro")
+    if valor < 1:
+        raise argparse.ArgumentTypeError("o valor precisa ser maior que zero")
+    return valor
+
+
+def numero_positivo(texto):
+    """Converte um argumento de linha de comando em número maior que zero."""
+    try:
+        valor = float(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{texto}' não é um número")
+    if not 0 < valor < float('inf'):
+        raise argparse.ArgumentTypeError("o valor precisa ser um número finito maior que zero")
+    return valor
+
+
+def modo_lote(diretorio, saida=None, workers=None, chunksize=None):
+    """Processa em lote todos os boletins HTML de um diretório."""
+    from src.lote import processar_diretorio
+    
+    if not os.path.isdir(diretorio):
+        console.print(Panel(
+            f"[bold red]Diretório não encontrado:[/] [yellow]{diretorio}[/]",
+            title="❌ Erro", border_style="red"
+        ))
+        return False
+    
+    if saida is None:
+        saida = os.path.join(diretorio, 'resumo_notas.jsonl')
+    
+    console.print(f"[bold]📂 Processando boletins em:[/] [cyan]{diretorio}[/]")
+    registros, duracao = processar_diretorio(diretorio, saida, workers, chunksize)
+    
+    total = len(registros)
+    falhas = [r for r in registros if not r['ok']]
+    taxa = total / duracao if duracao > 0 else 0.0
+    
+    resumo = Table(box=box.SIMPLE, show_header=False)
+    resumo.add_column("Label", style="bold")
+    resumo.add_column("Valor", style="cyan")
+    resumo.add_row("Arquivos processados:", str(total))
+    resumo.add_row("Falhas:", str(len(falhas)))
+    resumo.add_row("Tempo total:", f"{duracao:.2f} s")
+    resumo.add_row("Vazão:", f"{taxa:.1f} arquivos/s")
+    resumo.add_row("Resumo gravado em:", saida)
+    console.print(Panel(resumo, title="📦 Lote Concluído", border_style="green"))
+    
+    for registro in falhas:
+        console.print(f"   [yellow]⚠[/] {os.path.basename(registro['arquivo'])}: {registro['erro']}")
+    
+    return True
+
+
+def modo_daemon(ocioso_min=None):
+    """Inicia o navegador em segundo plano, reaproveitado pelas próximas coletas."""
+    from src.daemon import iniciar_daemon, OCIOSO_PADRAO, ARQUIVO_LOG
+    
+    ocioso = max(1, int(ocioso_min * 60)) if ocioso_min else OCIOSO_PADRAO
+    console.print("[bold]🚀 Iniciando navegador em segundo plano...[/]")
+    estado = iniciar_daemon(ocioso)
+    
+    if estado is None:
+        console.print(Panel(
+            "[bold red]Não foi possível iniciar o daemon.[/]\n\n"
+            "É necessário Chrome, Edge ou Brave instalado (o Firefox não expõe CDP).\n"
+            f"Detalhes em: [dim]{ARQUIVO_LOG}[/]",
+            title="❌ Erro", border_style="red"
+        ))
+        return False
+    
+    info = Table(box=box.SIMPLE, show_header=False)
+    info.add_column("Label", style="bold")
+    info.add_column("Valor", style="cyan")
+    info.add_row("Navegador:", estado['navegador'])
+    info.add_row("Endpoint CDP:", f"127.0.0.1:{estado['porta']}")
+    info.add_row("Fecha após:", f"{estado['ocioso'] // 60} min sem uso")
+    console.print(Panel(info, title="♻️ Daemon Ativo", border_style="green"))
+    console.print("[dim]Faça login uma vez na janela aberta; as próximas coletas reutilizam a sessão.[/]")
+    return True
+
+
+def parar_daemon():
+    """Fecha o navegador mantido em segundo plano."""
+    from src.daemon import parar_daemon as parar
+    if parar():
+        console.print("[green]✓[/] Daemon encerrado.")
+    else:
+        console.print("[dim]Nenhum daemon em execução.[/]")
+
+
+def limpar_cache():
+    """Apaga o cache de boletins já analisados e a sessão salva."""
+    from src.cache import invalidar_cache
+    from src.sessao import descartar_sessao
+    invalidar_cache()
+    descartar_sessao()
+    console.print("[green]✓[/] Cache de boletins e sessão salva apagados.")
 
 
 def main():
@@ -145,17 +299,106 @@ def main():
                        help='Modo manual: apenas calcula com arquivo existente')
     parser.add_argument('--auto', '-a', action='store_true',
                        help='Modo automático: coleta e calcula sem menu')
+    parser.add_argument('--sem-html', action='store_true',
+                       help='Não grava o Adalove.html na coleta (cálculo direto em memória)')
+    parser.add_argument('--extracao', choices=['dom', 'rede'], default='dom',
+                       help="Coleta: 'dom' lê a tabela renderizada; 'rede' lê o JSON da API de notas (com a tabela como alternativa)")
+    parser.add_argument('--modulos', action='store_true',
+                       help='Coleta as notas de todos os módulos de uma vez, em abas paralelas')
+    parser.add_argument('--concorrencia', type=inteiro_positivo, default=None, metavar='N',
+                       help='Máximo de módulos coletados ao mesmo tempo em --modulos (padrão: 4)')
+    parser.add_argument('--daemon', action='store_true',
+                       help='Mantém um navegador aberto em segundo plano; as coletas seguintes só abrem uma aba nele')
+    parser.add_argument('--ocioso', type=numero_positivo, default=None, metavar='MIN',
+                       help='Minutos sem uso até o daemon fechar o navegador (padrão: 30)')
+    parser.add_argument('--parar-daemon', action='store_true',
+                       help='Fecha o navegador mantido pelo daemon e sai')
+    parser.add_argument('--sem-cache', action='store_true',
+                       help='Ignora o cache e analisa o HTML novamente')
+    parser.add_argument('--perfil', choices=['completo', 'cookies'], default='completo',
+                       help="Coleta: 'completo' espelha os arquivos de sessão do perfil; 'cookies' copia só os cookies do Inteli/SSO")
+    parser.add_argument('--sem-sessao', action='store_true',
+                       help='Não usa nem salva a sessão da última coleta (sempre passa pelo login)')
+    parser.add_argument('--visivel', action='store_true',
+                       help='Sempre abre a janela do navegador (sem isso, a coleta com sessão salva roda em segundo plano)')
+    parser.add_argument('--bloquear-recursos', action='store_true',
+                       help='Coleta: aborta imagens, fontes, mídia e analytics (só o necessário para a tabela é baixado)')
+    parser.add_argument('--bloquear-url', action='append', default=[], metavar='TRECHO',
+                       help='Bloqueia também as URLs que contêm TRECHO (pode repetir; implica --bloquear-recursos)')
+    parser.add_argument('--redetectar-navegadores', '--rescan-browsers', action='store_true',
+                       help='Ignora o navegador guardado em cache e procura os navegadores instalados de novo')
+    parser.add_argument('--limpar-cache', action='store_true',
+                       help='Apaga o cache de boletins já analisados e a sessão salva, e sai')
+    parser.add_argument('--cenarios', '-c', action='store_true',
+                       help='Mostra a nota necessária para uma grade de médias alvo × notas pendentes')
+    parser.add_argument('--exportar-cenarios', metavar='ARQUIVO',
+                       help='Grava a matriz de cenários em CSV (implica --cenarios)')
+    parser.add_argument('--monte-carlo', type=inteiro_positivo, metavar='AMOSTRAS',
+                       help='Estima a probabilidade de atingir a média com N amostras')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Semente do Monte Carlo (resultado reprodutível)')
+    parser.add_argument('--dist-pendentes', type=distribuicao, metavar='MEDIA,DESVIO',
+                       help='Distribuição das notas pendentes (padrão: ajustada às notas lançadas)')
+    parser.add_argument('--dist-prova', type=distribuicao, metavar='MEDIA,DESVIO',
+                       help='Distribuição da nota da prova (padrão: ajustada às notas lançadas)')
+    parser.add_argument('--batch', '-b', metavar='DIR',
+                       help='Modo lote: processa todos os arquivos HTML do diretório')
+    parser.add_argument('--workers', '-w', type=inteiro_positivo, default=None,
+                       help='Número de processos do modo lote (padrão: número de CPUs) ou do Monte Carlo (padrão: 1)')
+    parser.add_argument('--chunksize', type=inteiro_positivo, default=None,
+                       help='Arquivos enviados a cada processo por vez no modo lote')
+    parser.add_argument('--saida', '-o', metavar='ARQUIVO',
+                       help='Resumo do modo lote (.jsonl ou .csv; padrão: DIR/resumo_notas.jsonl)')
     
     args = parser.parse_args()
+    usar_cache = not args.sem_cache
+    salvar_html = not args.sem_html
+    usar_sessao = not args.sem_sessao
+    segundo_plano = not args.visivel
+    bloquear_urls = args.bloquear_url if args.bloquear_recursos or args.bloquear_url else None
+    
+    if args.limpar_cache:
+        limpar_cache()
+        return
+    
+    if args.redetectar_navegadores:
+        from src.navegadores import descartar_cache_navegador
+        descartar_cache_navegador()
+    
+    if args.parar_daemon:
+        parar_daemon()
+        return
+    
+    if args.daemon:
+        modo_daemon(args.ocioso)
+        return
+    
+    if args.cenarios or args.exportar_cenarios:
+        modo_cenarios(usar_cache, args.exportar_cenarios)
+        return
+    
+    if args.monte_carlo is not None:
+        modo_monte_carlo(args.monte_carlo, args.seed, args.workers,
+                         args.dist_pendentes, args.dist_prova, usar_cache)
+        return
+    
+    if args.modulos:
+        modo_modulos(args.concorrencia)
+        return
+    
+    if args.batch:
+        modo_lote(args.batch, args.saida, args.workers, args.chunksize)
+        return
     
     # Modos diretos via argumentos
     if args.manual:
         print_banner()
-        modo_manual()
+        modo_manual(usar_cache)
         return
     
     if args.auto:
-        modo_automatico()
+        modo_automatico(usar_cache, salvar_html, args.extracao, usar_sessao, args.perfil, segundo_plano,
+                        bloquear_urls)
         return
     
     # Menu interativo
@@ -171,12 +414,13 @@ def main():
         )
         
         if escolha == "1":
-            modo_automatico()
+            modo_automatico(usar_cache, salvar_html, args.extracao, usar_sessao, args.perfil,
+                            segundo_plano, bloquear_urls)
             console.print()
             Prompt.ask("[dim]Pressione ENTER para voltar ao menu[/]")
             
         elif escolha == "2":
-            modo_manual()
+            modo_manual(usar_cache)
             console.print()
             Prompt.ask("[dim]Pressione ENTER para voltar ao menu[/]")
             
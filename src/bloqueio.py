@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Bloqueio de requisições que não afetam a tabela de notas.
+
+Enquanto a página do módulo carrega, o Adalove baixa imagens, fontes,
+avatares, vídeos e scripts de analytics. Nada disso é necessário para a
+tabela, então, opcionalmente, essas requisições são abortadas via
+`context.route`: por tipo de recurso (TIPOS_BLOQUEADOS) e por uma lista de
+trechos de URL (PADROES_BLOQUEADOS, mais os informados pelo usuário). O
+documento, os scripts, o XHR/fetch e o CSS continuam passando.
+
+Com a sessão salva, o filtro é instalado antes de abrir o módulo (não há
+login no caminho); no login interativo, só depois dele, porque no SSO
+imagens como as do CAPTCHA são necessárias.
+
+Requisições abortadas não têm resposta, então os bytes economizados são uma
+estimativa pelo tamanho típico de cada tipo de recurso.
+"""
+
+# Configurações
+TIPOS_BLOQUEADOS = ('image', 'font', 'media')
+TIPOS_PROTEGIDOS = ('document',)  # nunca bloqueados, mesmo casando com um padrão
+PADROES_BLOQUEADOS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'analytics.google.com',
+    'doubleclick.net',
+    'connect.facebook.net',
+    'hotjar.com',
+    'clarity.ms',
+    'segment.io',
+    'cdn.segment.com',
+    'mixpanel.com',
+    'amplitude.com',
+)
+
+# Tamanho típico por tipo de recurso, para estimar os bytes economizados
+BYTES_ESTIMADOS = {
+    'image': 40 * 1024,
+    'font': 50 * 1024,
+    'media': 500 * 1024,
+    'script': 60 * 1024,
+}
+BYTES_ESTIMADOS_PADRAO = 10 * 1024  # pixels e beacons de analytics
+
+NOMES_TIPOS = {
+    'image': 'imagens',
+    'font': 'fontes',
+    'media': 'mídia',
+    'script': 'scripts',
+}
+
+
+class FiltroRequisicoes:
+    """
+    Aborta as requisições pesadas de um ou mais contextos do Playwright.
+
+    O mesmo filtro pode ser instalado em vários contextos (ex: quando o
+    módulo é reaberto com janela); os contadores se acumulam.
+
+    Atributos:
+        bloqueadas: {tipo de recurso: número de requisições abortadas}.
+        permitidas: Número de requisições que seguiram normalmente.
+        bytes_estimados: Estimativa dos bytes que deixaram de ser baixados.
+    """
+
+    def __init__(self, padroes_extras=(), tipos=TIPOS_BLOQUEADOS, padroes=PADROES_BLOQUEADOS):
+        self.tipos = frozenset(tipos)
+        self.padroes = tuple(padrao.lower() for padrao in (*padroes, *padroes_extras))
+        self.bloqueadas = {}
+        self.permitidas = 0
+        self.bytes_estimados = 0
+        self._contextos = set()
+
+    @property
+    def total_bloqueadas(self):
+        return sum(self.bloqueadas.values())
+
+    def deve_bloquear(self, tipo, url):
+        """Decide pelo tipo de recurso e pelos trechos de URL."""
+        if tipo in TIPOS_PROTEGIDOS:
+            return False
+        if tipo in self.tipos:
+            return True
+        url = url.lower()
+        return any(padrao in url for padrao in self.padroes)
+
+    def _rotear(self, route):
+        request = route.request
+        tipo = request.resource_type
+        if self.deve_bloquear(tipo, request.url):
+            self.bloqueadas[tipo] = self.bloqueadas.get(tipo, 0) + 1
+            self.bytes_estimados += BYTES_ESTIMADOS.get(tipo, BYTES_ESTIMADOS_PADRAO)
+            route.abort('blockedbyclient')
+        else:
+            self.permitidas += 1
+            route.fallback()
+
+    def instalar(self, context):
+        """Passa todas as requisições do contexto pelo filtro (uma vez por contexto)."""
+        if context in self._contextos:
+            return
+        context.route('**/*', self._rotear)
+        self._contextos.add(context)
+
+    def desinstalar(self, context):
+        """Deixa as requisições do contexto passarem sem filtro."""
+        if context not in self._contextos:
+            return
+        context.unroute('**/*', self._rotear)
+        self._contextos.discard(context)
+
+    def resumo(self):
+        """Texto curto com as requisições bloqueadas por tipo (ex: 'imagens: 12, fontes: 3')."""
+        return ', '.join(f"{NOMES_TIPOS.get(tipo, tipo)}: {quantidade}"
+                         for tipo, quantidade in sorted(self.bloqueadas.items(), key=lambda item: -item[1]))
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Cache em disco dos boletins já analisados.
+
+Cada boletim é identificado pelo hash do conteúdo do HTML (BLAKE2b). Um
+índice associa o caminho do arquivo ao seu tamanho, mtime e hash, de modo
+que uma execução com o arquivo inalterado resolve tudo com um único `stat`,
+sem ler nem analisar o HTML. As linhas extraídas ficam em um arquivo
+JSON-lines por boletim, e o número de boletins guardados é limitado (LRU).
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+
+from extrator import extrair_linhas_arquivo, eh_prova
+
+# Configurações
+DIRETORIO_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'calculadora_prova_inteli')
+DIRETORIO_BOLETINS = os.path.join(DIRETORIO_CACHE, 'boletins')
+ARQUIVO_INDICE = os.path.join(DIRETORIO_BOLETINS, 'indice.json')
+MAX_BOLETINS = 32
+VERSAO_FORMATO = 1  # incrementar quando o formato das linhas mudar
+TAMANHO_BLOCO = 1 << 20
+
+
+def hash_arquivo(file_path):
+    """Calcula o hash BLAKE2b (128 bits) do conteúdo do arquivo."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for bloco in iter(lambda: f.read(TAMANHO_BLOCO), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def _indice_vazio():
+    return {'versao': VERSAO_FORMATO, 'arquivos': {}, 'boletins': {}}
+
+
+def _ler_indice():
+    """Lê o índice do cache; devolve um índice vazio se ausente ou inválido."""
+    try:
+        with open(ARQUIVO_INDICE, 'r', encoding='utf-8') as f:
+            indice = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return _indice_vazio()
+    if indice.get('versao') != VERSAO_FORMATO:
+        return _indice_vazio()
+    return indice
+
+
+def _gravar_indice(indice):
+    """Grava o índice de forma atômica (arquivo temporário + rename)."""
+    os.makedirs(DIRETORIO_BOLETINS, exist_ok=True)
+    temp_path = ARQUIVO_INDICE + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(indice, f)
+    os.replace(temp_path, ARQUIVO_INDICE)
+
+
+def _caminho_boletim(digest):
+    return os.path.join(DIRETORIO_BOLETINS, digest + '.jsonl')
+
+
+def _ler_boletim(digest):
+    """Lê as linhas de um boletim do cache ou None se não existir."""
+    try:
+        with open(_caminho_boletim(digest), 'r', encoding='utf-8') as f:
+            return [tuple(json.loads(linha)[:3]) for linha in f]
+    except (json.JSONDecodeError, IOError):
+        return None
+
+
+def _gravar_boletim(digest, linhas):
+    """Grava as linhas de um boletim, uma por linha: [nome, peso, nota, prova]."""
+    os.makedirs(DIRETORIO_BOLETINS, exist_ok=True)
+    temp_path = _caminho_boletim(digest) + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        for nome, peso, nota in linhas:
+            f.write(json.dumps([nome, peso, nota, eh_prova(nome)], ensure_ascii=False))
+            f.write('\n')
+    os.replace(temp_path, _caminho_boletim(digest))
+
+
+def _remover_boletim(indice, digest):
+    """Remove um boletim do cache e todas as referências a ele no índice."""
+    indice['boletins'].pop(digest, None)
+    for path, info in list(indice['arquivos'].items()):
+        if info['hash'] == digest:
+            del indice['arquivos'][path]
+    try:
+        os.remove(_caminho_boletim(digest))
+    except OSError:
+        pass
+
+
+def _aplicar_limite(indice):
+    """Descarta os boletins menos usados recentemente além de MAX_BOLETINS."""
+    excedentes = len(indice['boletins']) - MAX_BOLETINS
+    if excedentes > 0:
+        por_uso = sorted(indice['boletins'], key=indice['boletins'].get)
+        for digest in por_uso[:excedentes]:
+            _remover_boletim(indice, digest)
+
+
+def carregar_linhas(file_path, usar_cache=True):
+    """
+    Retorna as linhas do boletim, usando o cache sempre que possível.
+
+    Args:
+        file_path: Caminho para o arquivo HTML.
+        usar_cache: Se False, sempre analisa o HTML (e não grava no cache).
+
+    Returns:
+        list: Tuplas `(nome, peso, nota)`, como em `extrair_linhas_arquivo`.
+    """
+    if not usar_cache:
+        return extrair_linhas_arquivo(file_path)
+
+    path = os.path.abspath(file_path)
+    st = os.stat(path)
+    indice = _ler_indice()
+
+    # Caminho rápido: arquivo inalterado desde a última execução (só um stat)
+    info = indice['arquivos'].get(path)
+    if info and info['tamanho'] == st.st_size and info['mtime_ns'] == st.st_mtime_ns:
+        digest = info['hash']
+    else:
+        digest = hash_arquivo(path)
+
+    linhas = _ler_boletim(digest) if digest in indice['boletins'] else None
+    if linhas is None:
+        linhas = extrair_linhas_arquivo(path)
+        if not linhas:
+            return linhas
+        try:
+            _gravar_boletim(digest, linhas)
+        except IOError:
+            return linhas
+
+    indice['arquivos'][path] = {'tamanho': st.st_size, 'mtime_ns': st.st_mtime_ns, 'hash': digest}
+    indice['boletins'][digest] = time.time()
+    _aplicar_limite(indice)
+    try:
+        _gravar_indice(indice)
+    except IOError:
+        pass
+    return linhas
+
+
+def invalidar_cache(file_path=None):
+    """
+    Invalida o cache de boletins.
+
+    Args:
+        file_path: Se informado, remove apenas o boletim desse arquivo.
+            Se None, apaga o cache inteiro.
+    """
+    if file_path is None:
+        shutil.rmtree(DIRETORIO_BOLETINS, ignore_errors=True)
+        return
+
+    indice = _ler_indice()
+    info = indice['arquivos'].pop(os.path.abspath(file_path), None)
+    if info:
+        _remover_boletim(indice, info['hash'])
+        _gravar_indice(indice)
@@ -34,7 +34,6 @@ def install_dependencies():
 
 install_dependencies()
 
-from bs4 import BeautifulSoup
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
@@ -43,6 +42,10 @@ from rich.prompt import Prompt, FloatPrompt
 from rich import box
 import pyfiglet
 
+from cache import carregar_linhas
+from motor import (MEDIA_ALVO, STATUS_APROVADO, STATUS_IMPOSSIVEL, STATUS_SEM_PROVA,
+                   atividades_de_linhas, consolidar, calcular)
+
 # Configuração do Console
 console = Console()
 
@@ -55,14 +58,6 @@ def print_header():
     console.print("\n")
 
 
-def parse_float(text):
-    """Converte texto para float lidando com vírgulas e erros."""
-    try:
-        return float(text.replace(',', '.'))
-    except ValueError:
-        return None
-
-
 def get_style_nota(nota):
     """Retorna a cor baseada na nota."""
     if nota is None:
@@ -75,18 +70,21 @@ def get_style_nota(nota):
         return "bold red"
 
 
-def calcular_notas(file_path=None):
+def carregar_atividades(file_path=None, usar_cache=True, linhas=None):
     """
-    Calcula as notas e a nota necessária na prova.
+    Resolve o caminho do HTML e carrega as atividades do boletim.
     
     Args:
         file_path: Caminho para o arquivo HTML. Se None, usa 'Adalove.html'.
+        usar_cache: Se True, reaproveita as linhas já extraídas de um arquivo idêntico.
+        linhas: Linhas já extraídas (ex: pela coleta). Se informadas, nenhum
+            arquivo é lido.
     
     Returns:
-        bool: True se o cálculo foi bem-sucedido.
+        list: Atividades do boletim, ou None se houve erro (já exibido).
     """
-    os.system('cls' if os.name == 'nt' else 'clear')
-    print_header()
+    if linhas:
+        return atividades_de_linhas(linhas)
 
     # Recebe o caminho do arquivo
     if file_path is None:
@@ -103,73 +101,247 @@ def calcular_notas(file_path=None):
             "Salve a página do portal como HTML na mesma pasta deste script.",
             title="Arquivo Ausente", border_style="red"
         ))
-        return False
+        return None
 
-    # Parsing
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    soup = BeautifulSoup(content, 'html.parser')
-    rows = soup.find_all('tr', class_='styled-tr')
+    # Parsing (apenas a região da tabela de notas, ou direto do cache)
+    linhas = carregar_linhas(file_path, usar_cache=usar_cache)
 
-    if not rows:
+    if not linhas:
         console.print(Panel.fit(
             "[bold red]Nenhuma atividade encontrada![/]\n\n"
             "Verifique se o arquivo HTML está correto e contém a tabela de notas.",
             title="Erro de Parsing", border_style="red"
         ))
+        return None
+
+    return atividades_de_linhas(linhas)
+
+
+def calcular_notas(file_path=None, usar_cache=True, linhas=None):
+    """
+    Calcula as notas e a nota necessária na prova.
+    
+    Args:
+        file_path: Caminho para o arquivo HTML. Se None, usa 'Adalove.html'.
+        usar_cache: Se True, reaproveita as linhas já extraídas de um arquivo idêntico.
+        linhas: Linhas já extraídas em memória (dispensa o arquivo HTML).
+    
+    Returns:
+        bool: True se o cálculo foi bem-sucedido.
+    """
+    os.system('cls' if os.name == 'nt' else 'clear')
+    print_header()
+
+    atividades = carregar_atividades(file_path, usar_cache, linhas)
+    if atividades is None:
         return False
 
-    soma_ponderada = 0.0
-    peso_total = 0.0
-    peso_prova = 0.0
-    atividades_pendentes = []
+    boletim = consolidar(atividades)
 
-    # Tabela Visual
-    table = Table(title="📊 Boletim Atual", box=box.ROUNDED, show_lines=True)
-    table.add_column("Atividade", style="cyan", no_wrap=False, max_width=50)
-    table.add_column("Peso", justify="center", style="magenta")
-    table.add_column("Nota", justify="center")
-    table.add_column("Status", justify="center")
+    exibir_boletim(atividades, boletim)
+    notas_pendentes = perguntar_notas_pendentes(boletim.pendentes)
+    resultado = calcular(boletim, notas_pendentes, MEDIA_ALVO)
+
+    return exibir_resultado(resultado)
+
+
+def calcular_cenarios(file_path=None, usar_cache=True, exportar=None):
+    """
+    Exibe a nota necessária na prova para uma grade de cenários.
+    
+    Cruza várias médias alvo com várias notas assumidas para as pendentes,
+    tudo calculado de uma vez (ver `cenarios.matriz_cenarios`).
+    
+    Args:
+        file_path: Caminho para o arquivo HTML. Se None, usa 'Adalove.html'.
+        usar_cache: Se True, reaproveita as linhas já extraídas de um arquivo idêntico.
+        exportar: Se informado, grava a matriz completa nesse arquivo CSV.
+    
+    Returns:
+        bool: True se o cálculo foi bem-sucedido.
+    """
+    from cenarios import MEDIAS_ALVO_PADRAO, NOTAS_PENDENTES_PADRAO, matriz_cenarios, exportar_cenarios
+
+    os.system('cls' if os.name == 'nt' else 'clear')
+    print_header()
+
+    atividades = carregar_atividades(file_path, usar_cache)
+    if atividades is None:
+        return False
 
-    for row in rows:
-        nome_div = row.find('td', attrs={'data-label': 'Atividades'})
-        raw_text = list(nome_div.stripped_strings)
-        nome_atividade = " ".join(raw_text)
+    boletim = consolidar(atividades)
+    if boletim.peso_prova == 0:
+        return exibir_resultado(calcular(boletim))
+
+    medias, notas = MEDIAS_ALVO_PADRAO, NOTAS_PENDENTES_PADRAO
+    matriz = matriz_cenarios(boletim, medias, notas)
+
+    table = Table(title="🗺️ Nota Necessária na Prova por Cenário", box=box.ROUNDED)
+    table.add_column("Média alvo ↓ / Pendentes →", justify="center", style="bold")
+    for nota in notas:
+        table.add_column(f"{nota:g}", justify="center")
+
+    for media, linha in zip(medias, matriz):
+        celulas = []
+        for necessaria in linha:
+            if necessaria <= 0:
+                celulas.append(Text("✓", style="bold green"))
+            elif necessaria > 10:
+                celulas.append(Text("✗", style="bold red"))
+            else:
+                celulas.append(Text(f"{necessaria:.1f}", style=get_style_nota(10 - necessaria)))
+        table.add_row(f"{media:.1f}", *celulas)
+
+    console.print(table)
+    console.print(
+        f"[dim]{len(boletim.pendentes)} atividade(s) pendente(s) · peso da prova {boletim.peso_prova} · "
+        "✓ já aprovado · ✗ exigiria mais que 10[/]"
+    )
 
-        peso_div = row.find('td', attrs={'data-label': 'Pontos'})
-        peso = parse_float(list(peso_div.stripped_strings)[-1])
+    if exportar:
+        exportar_cenarios(matriz, medias, notas, exportar)
+        console.print(f"\n[green]✓[/] Matriz exportada em: [cyan]{exportar}[/]")
 
-        notas_div = row.find('td', attrs={'data-label': 'Notas'})
-        nota_text = list(notas_div.stripped_strings)[-1]
-        nota = parse_float(nota_text)
+    return True
 
-        if peso is not None:
-            peso_total += peso
 
-        is_prova = "Prova" in nome_atividade and "Módulo" in nome_atividade
+def calcular_modulos(resultados, nota_pendentes=MEDIA_ALVO):
+    """
+    Exibe, em uma única tabela, a situação de cada módulo coletado.
+
+    Args:
+        resultados: {nome do módulo: linhas `(nome, peso, nota)`}, como
+            devolvido por `coletar_modulos.coletar_modulos`.
+        nota_pendentes: Nota assumida para as atividades pendentes.
+
+    Returns:
+        bool: True se algum módulo foi exibido.
+    """
+    if not resultados:
+        return False
 
-        if is_prova:
-            peso_prova = peso
-            table.add_row(f"[bold]{nome_atividade}[/]", str(peso), "-", "[bold blue]🎯 A CALCULAR[/]")
+    table = Table(title="📚 Situação por Módulo", box=box.ROUNDED)
+    table.add_column("Módulo", style="white")
+    table.add_column("Atividades", justify="center")
+    table.add_column("Pendentes", justify="center")
+    table.add_column("Média projetada", justify="center")
+    table.add_column("Nota necessária na prova", justify="center")
+
+    for modulo, linhas in resultados.items():
+        boletim = consolidar(atividades_de_linhas(linhas))
+        resultado = calcular(boletim, nota_pendentes)
+
+        if resultado.status == STATUS_SEM_PROVA:
+            necessaria = Text("sem prova", style="dim white")
+        elif resultado.status == STATUS_APROVADO:
+            necessaria = Text("✓ já aprovado", style="bold green")
+        elif resultado.status == STATUS_IMPOSSIVEL:
+            necessaria = Text(f"✗ {resultado.nota_necessaria:.2f}", style="bold red")
+        else:
+            necessaria = Text(f"{resultado.nota_necessaria:.2f}",
+                              style=get_style_nota(10 - resultado.nota_necessaria))
+
+        projetada = resultado.media_projetada
+        table.add_row(
+            modulo, str(len(linhas)), str(len(boletim.pendentes)),
+            Text(f"{projetada:.2f}" if projetada is not None else "-", style=get_style_nota(projetada)),
+            necessaria
+        )
+
+    console.print(table)
+    console.print(f"[dim]Atividades pendentes simuladas com nota {nota_pendentes:g}.[/]")
+    return True
+
+
+def calcular_probabilidade(file_path=None, usar_cache=True, amostras=None, seed=None, workers=1,
+                           dist_pendentes=None, dist_prova=None):
+    """
+    Estima por Monte Carlo a probabilidade de fechar com média 7.0.
+    
+    Args:
+        file_path: Caminho para o arquivo HTML. Se None, usa 'Adalove.html'.
+        usar_cache: Se True, reaproveita as linhas já extraídas de um arquivo idêntico.
+        amostras: Número de amostras. Se None, usa `montecarlo.AMOSTRAS_PADRAO`.
+        seed: Semente do gerador, para resultados reprodutíveis.
+        workers: Número de processos usados na simulação.
+        dist_pendentes: (média, desvio) das pendentes. Se None, ajusta às notas lançadas.
+        dist_prova: (média, desvio) da prova. Se None, ajusta às notas lançadas.
+    
+    Returns:
+        bool: True se o cálculo foi bem-sucedido.
+    """
+    from montecarlo import AMOSTRAS_PADRAO, ajustar_distribuicao, estimar_probabilidade
+
+    os.system('cls' if os.name == 'nt' else 'clear')
+    print_header()
+
+    atividades = carregar_atividades(file_path, usar_cache)
+    if atividades is None:
+        return False
+
+    boletim = consolidar(atividades)
+    if boletim.peso_prova == 0:
+        return exibir_resultado(calcular(boletim))
+
+    historico = ajustar_distribuicao(atividades)
+    dist_pendentes = dist_pendentes or historico
+    dist_prova = dist_prova or historico
+
+    with console.status("[bold]🎲 Simulando...[/]"):
+        estimativa = estimar_probabilidade(
+            boletim, dist_pendentes, dist_prova, MEDIA_ALVO,
+            amostras=amostras or AMOSTRAS_PADRAO, seed=seed, workers=workers
+        )
+
+    # Convergência: no máximo ~10 pontos da curva
+    passo = max(1, len(estimativa.convergencia) // 10)
+    convergencia = Table(title="📈 Convergência", box=box.SIMPLE)
+    convergencia.add_column("Amostras", justify="right", style="magenta")
+    convergencia.add_column("Estimativa", justify="right", style="cyan")
+    for n, p in estimativa.convergencia[passo - 1::passo]:
+        convergencia.add_row(f"{n:,}", f"{p:.2%}")
+    console.print(convergencia)
+    console.print()
+
+    inf, sup = estimativa.intervalo
+    console.print(Panel(
+        f"Probabilidade de fechar com média [bold yellow]{MEDIA_ALVO}[/]: "
+        f"[bold cyan]{estimativa.probabilidade:.2%}[/]\n\n"
+        f"IC 95%: {inf:.2%} – {sup:.2%} (erro padrão {estimativa.erro_padrao:.4%})\n"
+        f"Pendentes ~ N({dist_pendentes[0]:.2f}, {dist_pendentes[1]:.2f}) · "
+        f"Prova ~ N({dist_prova[0]:.2f}, {dist_prova[1]:.2f})\n"
+        f"[dim]{estimativa.amostras:,} amostras · seed {estimativa.seed}[/]",
+        border_style="cyan", title="🎲 MONTE CARLO 🎲", padding=(1, 5)
+    ))
+
+    return True
+
+
+def exibir_boletim(atividades, boletim):
+    """Imprime a tabela do boletim e o resumo da soma ponderada lançada."""
+    table = Table(title="📊 Boletim Atual", box=box.ROUNDED, show_lines=True)
+    table.add_column("Atividade", style="cyan", no_wrap=False, max_width=50)
+    table.add_column("Peso", justify="center", style="magenta")
+    table.add_column("Nota", justify="center")
+    table.add_column("Status", justify="center")
+
+    for atv in atividades:
+        if atv.prova:
+            table.add_row(f"[bold]{atv.nome}[/]", str(atv.peso), "-", "[bold blue]🎯 A CALCULAR[/]")
             continue
 
-        status = ""
-        nota_display = "-"
-        
-        if nota is not None:
-            soma_ponderada += (nota * peso)
-            nota_display = f"{nota:.1f}"
+        if atv.nota is not None:
+            nota_display = f"{atv.nota:.1f}"
             status = "[green]✓ Lançada[/]"
         else:
-            atividades_pendentes.append({'nome': nome_atividade, 'peso': peso})
+            nota_display = "-"
             status = "[yellow]⏳ Pendente[/]"
 
-        nome_truncado = nome_atividade[:47] + "..." if len(nome_atividade) > 50 else nome_atividade
+        nome_truncado = atv.nome[:47] + "..." if len(atv.nome) > 50 else atv.nome
         table.add_row(
             nome_truncado, 
-            str(peso), 
-            Text(nota_display, style=get_style_nota(nota)),
+            str(atv.peso), 
+            Text(nota_display, style=get_style_nota(atv.nota)),
             status
         )
 
@@ -180,65 +352,80 @@ def calcular_notas(file_path=None):
     resumo = Table(box=box.SIMPLE, show_header=False)
     resumo.add_column("Label", style="bold")
     resumo.add_column("Valor", style="cyan")
-    resumo.add_row("Peso Total do Módulo:", f"{peso_total}")
-    resumo.add_row("Soma Ponderada Atual:", f"{soma_ponderada:.2f}")
+    resumo.add_row("Peso Total do Módulo:", f"{boletim.peso_total}")
+    resumo.add_row("Soma Ponderada Atual:", f"{boletim.soma_lancada:.2f}")
     console.print(resumo)
     console.print()
 
-    # Tratamento de atividades pendentes
-    if atividades_pendentes:
-        console.print(Panel(
-            "[bold]Opções para notas pendentes:[/]\n\n"
-            "• [cyan]ENTER[/] ou [cyan]7[/] → Preenche tudo com 7.0\n"
-            "• [cyan]Outro número[/] (ex: 8.5) → Aplica essa nota em todas\n"
-            "• [cyan]n[/] ou [cyan]não[/] → Inserir cada nota manualmente",
-            title="🎲 Simulação de Notas", style="blue"
-        ))
-        
-        resposta = Prompt.ask(
-            "[bold]Digite:[/] [cyan]número[/] para nota padrão, [cyan]n[/] para manual, ou [cyan]ENTER[/] para 7.0",
-            default="7"
-        ).strip().lower()
-        
-        if resposta in ["n", "no", "não", "nao", "manual"]:
-            console.print("\n[bold]Inserção manual de notas:[/]\n")
-            for atv in atividades_pendentes:
-                while True:
-                    nota_input = FloatPrompt.ask(f"Nota para [cyan]{atv['nome'][:40]}...[/] (Peso {atv['peso']})")
-                    if 0 <= nota_input <= 10:
-                        soma_ponderada += (nota_input * atv['peso'])
-                        console.print(f"[dim] → Registrado: {nota_input} × {atv['peso']} = {nota_input*atv['peso']:.2f}[/]")
-                        break
-                    console.print("[red]A nota deve ser entre 0 e 10.[/]")
-                print()
-        else:
-            if resposta in ["", "y", "yes", "s", "sim"]:
+
+def perguntar_notas_pendentes(pendentes):
+    """
+    Pergunta ao usuário como simular as notas pendentes.
+
+    Returns:
+        Uma nota única para todas as pendentes (float) ou uma lista com a
+        nota de cada uma, no formato aceito por `motor.calcular`.
+    """
+    if not pendentes:
+        return MEDIA_ALVO
+
+    console.print(Panel(
+        "[bold]Opções para notas pendentes:[/]\n\n"
+        "• [cyan]ENTER[/] ou [cyan]7[/] → Preenche tudo com 7.0\n"
+        "• [cyan]Outro número[/] (ex: 8.5) → Aplica essa nota em todas\n"
+        "• [cyan]n[/] ou [cyan]não[/] → Inserir cada nota manualmente",
+        title="🎲 Simulação de Notas", style="blue"
+    ))
+    
+    resposta = Prompt.ask(
+        "[bold]Digite:[/] [cyan]número[/] para nota padrão, [cyan]n[/] para manual, ou [cyan]ENTER[/] para 7.0",
+        default="7"
+    ).strip().lower()
+    
+    if resposta in ["n", "no", "não", "nao", "manual"]:
+        console.print("\n[bold]Inserção manual de notas:[/]\n")
+        notas = []
+        for atv in pendentes:
+            while True:
+                nota_input = FloatPrompt.ask(f"Nota para [cyan]{atv.nome[:40]}...[/] (Peso {atv.peso})")
+                if 0 <= nota_input <= 10:
+                    notas.append(nota_input)
+                    console.print(f"[dim] → Registrado: {nota_input} × {atv.peso} = {nota_input*atv.peso:.2f}[/]")
+                    break
+                console.print("[red]A nota deve ser entre 0 e 10.[/]")
+            print()
+        return notas
+
+    if resposta in ["", "y", "yes", "s", "sim"]:
+        nota_padrao = 7.0
+    else:
+        try:
+            nota_padrao = float(resposta.replace(',', '.'))
+            if nota_padrao < 0 or nota_padrao > 10:
+                console.print("[yellow]Nota fora do intervalo 0-10. Usando 7.0[/]")
                 nota_padrao = 7.0
-            else:
-                try:
-                    nota_padrao = float(resposta.replace(',', '.'))
-                    if nota_padrao < 0 or nota_padrao > 10:
-                        console.print("[yellow]Nota fora do intervalo 0-10. Usando 7.0[/]")
-                        nota_padrao = 7.0
-                except ValueError:
-                    console.print("[yellow]Valor inválido. Usando 7.0[/]")
-                    nota_padrao = 7.0
-            
-            console.print(f"\n[bold]Aplicando nota [cyan]{nota_padrao}[/] em todas as pendentes:[/]\n")
-            for atv in atividades_pendentes:
-                soma_ponderada += (nota_padrao * atv['peso'])
-                console.print(f"[dim] → {atv['nome'][:40]}...: {nota_padrao} × {atv['peso']} = {nota_padrao*atv['peso']:.2f}[/]")
-            console.print()
-
-    # Cálculo Final
-    MEDIA_ALVO = 7.0
-    target_score = MEDIA_ALVO * peso_total
-    pontos_restantes = target_score - soma_ponderada
+        except ValueError:
+            console.print("[yellow]Valor inválido. Usando 7.0[/]")
+            nota_padrao = 7.0
+    
+    console.print(f"\n[bold]Aplicando nota [cyan]{nota_padrao}[/] em todas as pendentes:[/]\n")
+    for atv in pendentes:
+        console.print(f"[dim] → {atv.nome[:40]}...: {nota_padrao} × {atv.peso} = {nota_padrao*atv.peso:.2f}[/]")
+    console.print()
+    return nota_padrao
+
+
+def exibir_resultado(resultado):
+    """
+    Imprime o painel com o resultado final.
 
+    Returns:
+        bool: False se não foi possível identificar a prova.
+    """
     console.rule("[bold white]RESULTADO DA ANÁLISE[/]")
     print()
 
-    if peso_prova == 0:
+    if resultado.status == STATUS_SEM_PROVA:
         console.print(Panel(
             "[bold red]Não foi possível identificar o peso da prova automaticamente.[/]\n\n"
             "Verifique se existe uma atividade 'Prova de Módulo' no boletim.",
@@ -246,31 +433,27 @@ def calcular_notas(file_path=None):
         ))
         return False
 
-    nota_necessaria = pontos_restantes / peso_prova
-
-    if nota_necessaria <= 0:
-        media_projetada = soma_ponderada / peso_total
+    if resultado.status == STATUS_APROVADO:
         console.print(Panel(
             f"[bold green]APROVADO NA SIMULAÇÃO![/]\n\n"
-            f"Sua média projetada: [bold]{media_projetada:.2f}[/]\n"
-            f"Você já atingiu a pontuação para média {MEDIA_ALVO}!",
+            f"Sua média projetada: [bold]{resultado.media_projetada:.2f}[/]\n"
+            f"Você já atingiu a pontuação para média {resultado.media_alvo}!",
             border_style="green", title="🎉 SUCESSO 🎉", padding=(1, 5)
         ))
     
-    elif nota_necessaria > 10:
-        max_media = (soma_ponderada + (10 * peso_prova)) / peso_total
+    elif resultado.status == STATUS_IMPOSSIVEL:
         console.print(Panel(
             f"[bold red]MATEMATICAMENTE COMPLICADO[/]\n\n"
-            f"Você precisaria de [bold]{nota_necessaria:.2f}[/] na prova.\n"
-            f"Média máxima possível (gabaritando): [bold]{max_media:.2f}[/]",
+            f"Você precisaria de [bold]{resultado.nota_necessaria:.2f}[/] na prova.\n"
+            f"Média máxima possível (gabaritando): [bold]{resultado.media_maxima:.2f}[/]",
             border_style="red", title="💀 PERIGO 💀", padding=(1, 5)
         ))
     
     else:
         console.print(Panel(
-            f"Para fechar com média [bold yellow]{MEDIA_ALVO}[/]:\n\n"
-            f"Você precisa tirar [bold cyan]{nota_necessaria:.2f}[/] na Prova\n"
-            f"(Peso da prova: {peso_prova})",
+            f"Para fechar com média [bold yellow]{resultado.media_alvo}[/]:\n\n"
+            f"Você precisa tirar [bold cyan]{resultado.nota_necessaria:.2f}[/] na Prova\n"
+            f"(Peso da prova: {resultado.peso_prova})",
             border_style="yellow", title="🎯 META 🎯", padding=(1, 5)
         ))
 
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Matriz de cenários da nota necessária na prova.
+
+Em vez de uma simulação por vez, calcula de uma só vez (vetorizado com
+NumPy) a nota necessária na prova para todas as combinações de média alvo
+e de nota assumida para as atividades pendentes.
+"""
+
+import os
+import sys
+import csv
+import subprocess
+
+# Instalação automática de dependências
+def install_dependencies():
+    """Instala o NumPy automaticamente se não estiver presente."""
+    try:
+        __import__('numpy')
+    except ImportError:
+        print("Instalando dependências: numpy...")
+        subprocess.check_call([sys.executable, '-m', 'pip', 'install', '-q', 'numpy'])
+        print("Dependências instaladas! Reiniciando...\n")
+        os.execv(sys.executable, [sys.executable] + sys.argv)
+
+install_dependencies()
+
+import numpy as np
+
+# Grade padrão: médias alvo de 5.0 a 9.0 (passo 0.5) × pendentes de 0 a 10 (passo 1)
+MEDIAS_ALVO_PADRAO = np.arange(5.0, 9.0 + 0.25, 0.5)
+NOTAS_PENDENTES_PADRAO = np.arange(0.0, 10.0 + 0.5, 1.0)
+
+
+def matriz_cenarios(boletim, medias_alvo=MEDIAS_ALVO_PADRAO, notas_pendentes=NOTAS_PENDENTES_PADRAO):
+    """
+    Calcula a nota necessária na prova para cada cenário.
+
+    Args:
+        boletim: Boletim retornado por `motor.consolidar`.
+        medias_alvo: Sequência de médias finais desejadas (linhas).
+        notas_pendentes: Sequência de notas assumidas para todas as
+            atividades pendentes (colunas).
+
+    Returns:
+        numpy.ndarray: Matriz `len(medias_alvo) × len(notas_pendentes)`.
+        Valores <= 0 indicam média já garantida; > 10, meta inalcançável.
+    """
+    if boletim.peso_prova == 0:
+        raise ValueError("Boletim sem prova do módulo.")
+
+    medias = np.asarray(medias_alvo, dtype=float)
+    notas = np.asarray(notas_pendentes, dtype=float)
+    peso_pendentes = sum(boletim.pesos_pendentes)
+
+    somas = boletim.soma_lancada + notas * peso_pendentes
+    return (medias[:, None] * boletim.peso_total - somas[None, :]) / boletim.peso_prova
+
+
+def exportar_cenarios(matriz, medias_alvo, notas_pendentes, saida):
+    """Grava a matriz em CSV: uma linha por média alvo, uma coluna por nota."""
+    with open(saida, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['media_alvo'] + [f"pendentes_{nota:g}" for nota in notas_pendentes])
+        for media, linha in zip(medias_alvo, matriz):
+            writer.writerow([f"{media:g}"] + [f"{valor:.4f}" for valor in linha])
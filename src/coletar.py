@@ -45,8 +45,19 @@ from rich import box
 import pyfiglet
 import time
 import json
-import shutil
-import tempfile
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from extrator import parse_float, linhas_de_json
+from daemon import conectar_daemon, estado_daemon, registrar_uso
+from cache import DIRETORIO_CACHE
+from bloqueio import FiltroRequisicoes
+from cookies import criar_perfil_cookies
+from espelho import espelhar
+from navegadores import descobrir_navegador, ORIGEM_CACHE as ORIGEM_CACHE_NAVEGADOR
+from perfis import descobrir_perfil, ORIGEM_CACHE
+from sessao import carregar_sessao, salvar_sessao, descartar_sessao, sessao_aceita
 
 # Configuração do Console Rich
 console = Console()
@@ -56,6 +67,201 @@ ADALOVE_URL = "https://adalove.inteli.edu.br/academic-life"
 OUTPUT_FILE = "Adalove.html"
 TIMEOUT_LOGIN = 300000  # 5 minutos para fazer login
 TIMEOUT_NAVEGACAO = 60000  # 1 minuto para navegação normal
+TIMEOUT_SESSAO = 15000  # 15 segundos para o módulo abrir com a sessão salva
+TIMEOUT_API_NOTAS = 15000  # 15 segundos para a resposta da API de notas
+TIMEOUT_ESTABILIZACAO = 10000  # 10 segundos para a tabela parar de mudar
+INTERVALO_ESTABILIZACAO = 100  # ms entre as contagens de linhas
+CONTAGENS_ESTAVEIS = 4  # contagens iguais seguidas para considerar a tabela pronta
+ATRASO_OBSERVADOR = 50  # ms para agrupar as mutações do DOM vistas pelos init scripts
+VIEWPORT_SEGUNDO_PLANO = {'width': 1280, 'height': 720}  # coleta headless com sessão salva
+
+# Chromium baixado pelo Playwright, quando nenhum navegador é encontrado
+NAVEGADOR_CHROMIUM = {'name': 'chromium', 'channel': None, 'type': 'chromium', 'path': None, 'executable_path': False}
+
+# Como preparar o perfil do navegador
+PERFIL_COMPLETO = 'completo'  # espelho dos arquivos de sessão do perfil
+PERFIL_COOKIES = 'cookies'    # perfil mínimo só com os cookies do Inteli/SSO
+
+# Inicialização: detecção, busca e cópia do perfil rodam em um pool enquanto
+# o driver do Playwright sobe. O perfil é procurado em todos os navegadores
+# Chromium ao mesmo tempo que a detecção, antes de se saber qual será usado.
+NAVEGADORES_COM_PERFIL = ('chrome', 'brave', 'edge')
+WORKERS_INICIALIZACAO = 8  # >= número de tarefas (a cópia espera pelas demais)
+
+# Espelho persistente do perfil do navegador, sincronizado a cada coleta
+DIRETORIO_ESPELHO = os.path.join(DIRETORIO_CACHE, 'perfil')
+ARQUIVOS_ESSENCIAIS_PERFIL = [
+    'Cookies',
+    'Login Data',
+    'Web Data',
+    'Preferences',
+    'Secure Preferences',
+    'Network',
+    'Local Storage',
+    'Session Storage',
+    'IndexedDB',
+]
+
+# Executado via wait_for_function: verdadeiro quando o número de linhas da
+# tabela se repete por `contagens` verificações seguidas. Usa polling por
+# intervalo (e não por requestAnimationFrame) porque o navegador suspende
+# os quadros de abas em segundo plano.
+SCRIPT_TABELA_ESTAVEL = """
+(contagens) => {
+    const n = document.querySelectorAll('tr.styled-tr').length;
+    const estado = window.__adaloveEstabilidade || (window.__adaloveEstabilidade = {n: -1, iguais: 0});
+    if (n > 0 && n === estado.n) {
+        estado.iguais++;
+    } else {
+        estado.n = n;
+        estado.iguais = 0;
+    }
+    return estado.iguais >= contagens;
+}
+"""
+
+# Modos de extração das notas
+EXTRACAO_DOM = 'dom'    # lê a tabela renderizada
+EXTRACAO_REDE = 'rede'  # lê o JSON da API de notas; DOM como alternativa
+
+# Executado em todo documento do contexto: avisa (via console) quando a aba
+# "Notas" fica visível. As verificações são agrupadas por ATRASO_OBSERVADOR
+# com setTimeout (e não requestAnimationFrame, suspenso em abas em segundo
+# plano e em janelas minimizadas).
+MARCA_NOTAS_DETECTADA = '__adalove_notas_detectada__'
+SCRIPT_DETECTAR_NOTAS = """
+(() => {
+    if (window.top !== window || window.__adaloveDetector) return;
+    window.__adaloveDetector = true;
+    const visivel = (el) => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    const temAbaNotas = () => {
+        for (const el of document.querySelectorAll('button, [role="tab"], .MuiTab-root')) {
+            if (el.textContent.includes('Notas') && visivel(el)) return true;
+        }
+        return false;
+    };
+    let agendado = false;
+    const verificar = () => {
+        agendado = false;
+        if (temAbaNotas()) {
+            observer.disconnect();
+            console.debug('%s');
+        }
+    };
+    const observer = new MutationObserver(() => {
+        if (!agendado) {
+            agendado = true;
+            setTimeout(verificar, %d);
+        }
+    });
+    const iniciar = () => {
+        observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+        verificar();
+    };
+    if (document.documentElement) iniciar();
+    else document.addEventListener('DOMContentLoaded', iniciar);
+})();
+""" % (MARCA_NOTAS_DETECTADA, ATRASO_OBSERVADOR)
+
+# Executado em todo documento do Adalove: fecha o popup de faltas assim que
+# ele é montado e avisa o Python pela binding BINDING_POPUP_FECHADO. As
+# verificações são agrupadas como em SCRIPT_DETECTAR_NOTAS; o observer fica
+# em `window.__adaloveFechador` para SCRIPT_PARAR_FECHADOR_POPUP desligá-lo.
+BINDING_POPUP_FECHADO = '__adalovePopupFechado'
+SELETORES_FECHAR_POPUP = [
+    'button[aria-label="close"]',
+    'button[aria-label="Close"]',
+    'button[aria-label="fechar"]',
+    '.MuiDialog-root button:has(svg)',
+    '.MuiModal-root button:has(svg)',
+    '[role="dialog"] button:has(svg path[fill="#2D253F"])',
+    'button:has(svg path[d*="M36.4808 4.68875"])',
+    '.MuiIconButton-root:has(svg path[d*="36.4808"])',
+]
+SCRIPT_FECHAR_POPUP = """
+(() => {
+    if (!location.hostname.endsWith('inteli.edu.br') || window.__adaloveFechador) return;
+    const seletores = %s;
+    const clicados = new WeakSet();
+    const visivel = (el) => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    let agendado = false;
+    const fechar = () => {
+        agendado = false;
+        for (const seletor of seletores) {
+            let botao;
+            try {
+                botao = document.querySelector(seletor);
+            } catch (e) {
+                continue;  // seletor não suportado (ex: :has em navegadores antigos)
+            }
+            if (botao && !clicados.has(botao) && visivel(botao)) {
+                clicados.add(botao);
+                botao.click();
+                if (window.%s) window.%s(seletor);
+                return;
+            }
+        }
+    };
+    const observer = new MutationObserver(() => {
+        if (!agendado) {
+            agendado = true;
+            setTimeout(fechar, %d);
+        }
+    });
+    window.__adaloveFechador = observer;
+    const iniciar = () => {
+        observer.observe(document.documentElement, {childList: true, subtree: true});
+        fechar();
+    };
+    if (document.documentElement) iniciar();
+    else document.addEventListener('DOMContentLoaded', iniciar);
+})();
+""" % (json.dumps(SELETORES_FECHAR_POPUP), BINDING_POPUP_FECHADO, BINDING_POPUP_FECHADO, ATRASO_OBSERVADOR)
+
+# Desliga o observer de SCRIPT_FECHAR_POPUP no documento (a marca continua,
+# então o script não volta a ser instalado nele)
+SCRIPT_PARAR_FECHADOR_POPUP = """
+() => {
+    const observer = window.__adaloveFechador;
+    if (observer && observer.disconnect) observer.disconnect();
+}
+"""
+
+# URLs candidatas a endpoint de notas (o endpoint real não é documentado)
+PADRAO_URL_API_NOTAS = re.compile(r'grade|nota|score|avalia|assessment', re.IGNORECASE)
+
+# Executado no navegador: lê só as células rotuladas de cada `tr.styled-tr` e
+# devolve [nome, último texto de Pontos, último texto de Notas] por linha,
+# com a mesma semântica de `stripped_strings` usada pelo extrator.
+SCRIPT_EXTRAIR_LINHAS = """
+() => {
+    const textos = (td) => {
+        const partes = [];
+        if (!td) return partes;
+        const walker = document.createTreeWalker(td, NodeFilter.SHOW_TEXT);
+        while (walker.nextNode()) {
+            const texto = walker.currentNode.nodeValue.trim();
+            if (texto) partes.push(texto);
+        }
+        return partes;
+    };
+    return Array.from(document.querySelectorAll('tr.styled-tr'), (tr) => {
+        const nome = textos(tr.querySelector('td[data-label="Atividades"]'));
+        const peso = textos(tr.querySelector('td[data-label="Pontos"]'));
+        const nota = textos(tr.querySelector('td[data-label="Notas"]'));
+        return [nome.join(' '), peso.length ? peso[peso.length - 1] : '', nota.length ? nota[nota.length - 1] : ''];
+    });
+}
+"""
+
+
+def formatar_bytes(n):
+    """Formata um número de bytes em B/KB/MB/GB."""
+    for unidade in ('B', 'KB', 'MB'):
+        if n < 1024:
+            return f"{n:.0f} {unidade}" if unidade == 'B' else f"{n:.1f} {unidade}"
+        n /= 1024
+    return f"{n:.1f} GB"
 
 
 def print_header():
@@ -106,240 +312,113 @@ def obter_user_data_dir(navegador_name):
     return None
 
 
-def encontrar_perfil_inteli(user_data_dir):
+def buscar_perfil(navegador_name):
+    """
+    Localiza o diretório de dados e o perfil do Inteli de um navegador, sem
+    imprimir nada (roda no pool da inicialização, um por navegador).
+    
+    Returns:
+        tuple: (diretório de dados ou None, retorno de `descobrir_perfil` ou None).
+    """
+    user_data_dir = obter_user_data_dir(navegador_name)
+    if not user_data_dir:
+        return None, None
+    return user_data_dir, descobrir_perfil(user_data_dir)
+
+
+def encontrar_perfil_inteli(user_data_dir, achado=None):
     """
     Procura o perfil do Chrome/Edge/Brave que está vinculado ao domínio inteli.edu.br.
     Retorna o nome do diretório do perfil (ex: 'Profile 1', 'Default') ou None.
+    A busca usa o cache, o Local State e, por último, os perfis (ver `perfis`).
+    Se `achado` (retorno de `descobrir_perfil`) vier pronto, só exibe o resultado.
     """
     if not user_data_dir or not os.path.exists(user_data_dir):
         return None
     
     console.print("[dim]🔍 Procurando perfil vinculado ao Inteli...[/]")
     
-    # Lista de possíveis pastas de perfil
-    perfis_possiveis = ['Default'] + [f'Profile {i}' for i in range(1, 20)]
-    
-    for perfil in perfis_possiveis:
-        perfil_path = os.path.join(user_data_dir, perfil)
-        
-        if not os.path.exists(perfil_path):
-            continue
-        
-        # Verifica o arquivo Preferences que contém info da conta
-        prefs_file = os.path.join(perfil_path, 'Preferences')
-        if os.path.exists(prefs_file):
-            try:
-                with open(prefs_file, 'r', encoding='utf-8') as f:
-                    prefs = json.load(f)
-                
-                # Procura por email do Inteli nas preferências
-                account_info = prefs.get('account_info', [])
-                for account in account_info:
-                    email = account.get('email', '')
-                    if 'inteli.edu.br' in email.lower():
-                        console.print(f"   [green]✓[/] Encontrado perfil: [cyan]{email}[/]")
-                        return perfil
-                
-                # Também verifica em signin
-                signin = prefs.get('signin', {})
-                allowed_account = signin.get('allowed_first_run_account', '')
-                if 'inteli.edu.br' in allowed_account.lower():
-                    console.print(f"   [green]✓[/] Encontrado perfil: [cyan]{allowed_account}[/]")
-                    return perfil
-                    
-            except (json.JSONDecodeError, IOError):
-                continue
-        
-        # Verifica também o arquivo "Secure Preferences" como fallback
-        secure_prefs_file = os.path.join(perfil_path, 'Secure Preferences')
-        if os.path.exists(secure_prefs_file):
-            try:
-                with open(secure_prefs_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if 'inteli.edu.br' in content.lower():
-                        console.print(f"   [green]✓[/] Perfil Inteli encontrado: [cyan]{perfil}[/]")
-                        return perfil
-            except IOError:
-                continue
+    perfil, email, origem = achado or descobrir_perfil(user_data_dir)
+    if perfil:
+        detalhe = " [dim](cache)[/]" if origem == ORIGEM_CACHE else ""
+        console.print(f"   [green]✓[/] Encontrado perfil: [cyan]{email or perfil}[/]{detalhe}")
+        return perfil
     
     console.print("   [yellow]⚠[/] Nenhum perfil do Inteli encontrado automaticamente")
     return None
 
 
-def copiar_perfil_para_temp(user_data_dir, perfil_nome):
+def copiar_perfil_para_temp(user_data_dir, perfil_nome, temp_base=None):
     """
-    Copia os arquivos essenciais do perfil (cookies, login data) para um diretório temporário.
+    Sincroniza os arquivos essenciais do perfil (cookies, login data) com um espelho persistente.
     Isso permite usar o perfil sem conflito com o Chrome em execução.
-    Retorna o caminho do diretório temporário.
+    Só o que mudou desde a última coleta é copiado (ver `espelho.espelhar`).
+    `temp_base` troca o diretório do espelho (o daemon usa um próprio).
+    Retorna o caminho do diretório de dados do espelho.
     """
     perfil_original = os.path.join(user_data_dir, perfil_nome)
     
     if not os.path.exists(perfil_original):
         return None
     
-    # Cria diretório temporário
-    temp_base = os.path.join(tempfile.gettempdir(), 'adalove_chrome_profile')
+    temp_base = temp_base or DIRETORIO_ESPELHO
     temp_user_data = os.path.join(temp_base, 'User Data')
     temp_perfil = os.path.join(temp_user_data, perfil_nome)
+    os.makedirs(temp_perfil, exist_ok=True)
     
-    # Limpa diretório anterior se existir
-    if os.path.exists(temp_base):
-        try:
-            shutil.rmtree(temp_base)
-        except:
-            pass
+    console.print("[dim]📋 Sincronizando dados de sessão do perfil...[/]")
     
-    os.makedirs(temp_perfil, exist_ok=True)
+    # Arquivo Local State do diretório raiz + arquivos essenciais do perfil
+    relatorio = espelhar(user_data_dir, temp_user_data, ['Local State'])
+    espelhar(perfil_original, temp_perfil, ARQUIVOS_ESSENCIAIS_PERFIL, relatorio)
     
-    console.print("[dim]📋 Copiando dados de sessão do perfil...[/]")
-    
-    # Arquivos essenciais para manter a sessão/login
-    arquivos_essenciais = [
-        'Cookies',
-        'Login Data',
-        'Web Data',
-        'Preferences',
-        'Secure Preferences',
-        'Network',
-        'Local Storage',
-        'Session Storage',
-        'IndexedDB',
-    ]
-    
-    # Copia também o arquivo Local State do diretório raiz
-    local_state = os.path.join(user_data_dir, 'Local State')
-    if os.path.exists(local_state):
+    # Travas deixadas por uma execução anterior interrompida
+    for trava in ('SingletonLock', 'SingletonSocket', 'SingletonCookie'):
         try:
-            shutil.copy2(local_state, os.path.join(temp_user_data, 'Local State'))
-        except:
+            os.remove(os.path.join(temp_user_data, trava))
+        except OSError:
             pass
     
-    for arquivo in arquivos_essenciais:
-        origem = os.path.join(perfil_original, arquivo)
-        destino = os.path.join(temp_perfil, arquivo)
-        
-        try:
-            if os.path.isdir(origem):
-                if os.path.exists(destino):
-                    shutil.rmtree(destino)
-                shutil.copytree(origem, destino)
-            elif os.path.isfile(origem):
-                shutil.copy2(origem, destino)
-        except Exception:
-            continue
-    
-    console.print(f"   [green]✓[/] Perfil copiado para temp")
+    metodos = ', '.join(f"{metodo}: {n}" for metodo, n in relatorio.metodos.items())
+    console.print(
+        f"   [green]✓[/] Perfil sincronizado: {formatar_bytes(relatorio.bytes_copiados)} copiados "
+        f"({relatorio.copiados} arquivos), {formatar_bytes(relatorio.bytes_ignorados)} reaproveitados "
+        f"({relatorio.ignorados} arquivos), {relatorio.removidos} removidos "
+        f"[dim]em {relatorio.duracao * 1000:.0f} ms{f' ({metodos})' if metodos else ''}[/]"
+    )
+    return temp_user_data
+
+
+def copiar_cookies_para_temp(user_data_dir, perfil_nome):
+    """
+    Monta um perfil mínimo só com os cookies do Inteli e do SSO.
+    Retorna o caminho do diretório de dados, ou None se não foi possível
+    (ex: banco de cookies travado pelo navegador aberto no Windows).
+    """
+    console.print("[dim]🍪 Extraindo apenas os cookies do Inteli...[/]")
+    try:
+        temp_user_data, total, gravados = criar_perfil_cookies(user_data_dir, perfil_nome)
+    except (sqlite3.Error, OSError) as e:
+        console.print(f"   [yellow]⚠[/] Não foi possível ler os cookies ({e}); copiando o perfil.")
+        return None
+    console.print(f"   [green]✓[/] Perfil mínimo criado: {total} cookies, {formatar_bytes(gravados)}")
     return temp_user_data
 
 
-def detectar_navegador():
+def detectar_navegador(usar_cache=True):
     """
     Detecta qual navegador está instalado no sistema.
-    Retorna dict com informações do navegador ou None.
+    Retorna dict com informações do navegador (incluindo 'version') ou None.
     
-    Prioridade: Chrome > Brave > Edge > Firefox
+    Prioridade: Chrome > Brave > Edge > Firefox. O resultado fica em cache e
+    é validado com um `stat` do executável (ver `navegadores`).
     """
-    sistema = platform.system().lower()
-    
-    navegadores = {
-        'chrome': {
-            'channel': 'chrome',
-            'paths': {
-                'linux': [
-                    '/usr/bin/google-chrome',
-                    '/usr/bin/google-chrome-stable',
-                    '/snap/bin/chromium',
-                    '/usr/bin/chromium',
-                    '/usr/bin/chromium-browser',
-                ],
-                'darwin': [
-                    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
-                ],
-                'windows': [
-                    os.path.expandvars(r'%ProgramFiles%\Google\Chrome\Application\chrome.exe'),
-                    os.path.expandvars(r'%ProgramFiles(x86)%\Google\Chrome\Application\chrome.exe'),
-                    os.path.expandvars(r'%LocalAppData%\Google\Chrome\Application\chrome.exe'),
-                ],
-            }
-        },
-        'brave': {
-            'channel': 'chrome',
-            'executable_path': True,
-            'paths': {
-                'linux': [
-                    '/usr/bin/brave-browser',
-                    '/usr/bin/brave',
-                    '/snap/bin/brave',
-                    '/opt/brave.com/brave/brave-browser',
-                ],
-                'darwin': [
-                    '/Applications/Brave Browser.app/Contents/MacOS/Brave Browser',
-                ],
-                'windows': [
-                    os.path.expandvars(r'%ProgramFiles%\BraveSoftware\Brave-Browser\Application\brave.exe'),
-                    os.path.expandvars(r'%ProgramFiles(x86)%\BraveSoftware\Brave-Browser\Application\brave.exe'),
-                    os.path.expandvars(r'%LocalAppData%\BraveSoftware\Brave-Browser\Application\brave.exe'),
-                ],
-            }
-        },
-        'edge': {
-            'channel': 'msedge',
-            'paths': {
-                'linux': [
-                    '/usr/bin/microsoft-edge',
-                    '/usr/bin/microsoft-edge-stable',
-                ],
-                'darwin': [
-                    '/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge',
-                ],
-                'windows': [
-                    os.path.expandvars(r'%ProgramFiles%\Microsoft\Edge\Application\msedge.exe'),
-                    os.path.expandvars(r'%ProgramFiles(x86)%\Microsoft\Edge\Application\msedge.exe'),
-                ],
-            }
-        },
-        'firefox': {
-            'channel': None,
-            'type': 'firefox',
-            'paths': {
-                'linux': [
-                    '/usr/bin/firefox',
-                    '/snap/bin/firefox',
-                ],
-                'darwin': [
-                    '/Applications/Firefox.app/Contents/MacOS/firefox',
-                ],
-                'windows': [
-                    os.path.expandvars(r'%ProgramFiles%\Mozilla Firefox\firefox.exe'),
-                    os.path.expandvars(r'%ProgramFiles(x86)%\Mozilla Firefox\firefox.exe'),
-                ],
-            }
-        },
-    }
-    
-    # Normaliza o nome do sistema
-    if sistema == 'darwin':
-        sistema_key = 'darwin'
-    elif sistema == 'windows':
-        sistema_key = 'windows'
-    else:
-        sistema_key = 'linux'
-    
-    # Procura navegadores instalados
-    for nome, config in navegadores.items():
-        paths = config['paths'].get(sistema_key, [])
-        for path in paths:
-            if os.path.exists(path):
-                console.print(f"[green]✓[/] Navegador detectado: [bold cyan]{nome.capitalize()}[/]")
-                return {
-                    'name': nome,
-                    'channel': config.get('channel'),
-                    'type': config.get('type', 'chromium'),
-                    'path': path,
-                    'executable_path': config.get('executable_path', False)
-                }
-    
-    return None
+    navegador, origem = descobrir_navegador(usar_cache)
+    if navegador:
+        versao = f" {navegador['version']}" if navegador.get('version') else ""
+        detalhe = " [dim](cache)[/]" if origem == ORIGEM_CACHE_NAVEGADOR else ""
+        console.print(f"[green]✓[/] Navegador detectado: [bold cyan]{navegador['name'].capitalize()}[/]{versao}{detalhe}")
+    return navegador
 
 
 def print_instrucoes():
@@ -358,22 +437,525 @@ def print_instrucoes():
     console.print()
 
 
-def coletar_notas(output_dir=None):
+class CapturaNotasApi:
+    """
+    Captura, na camada de rede, a resposta JSON da API de notas.
+    
+    O listener é registrado no contexto antes da navegação e apenas guarda as
+    respostas XHR/fetch JSON cuja URL casa com PADRAO_URL_API_NOTAS. O corpo
+    só é lido depois, em `aguardar`, fora do callback do Playwright.
+    """
+    
+    def __init__(self, context):
+        self.candidatas = []
+        self.url = None
+        context.on('response', self._ao_receber)
+    
+    @staticmethod
+    def _corresponde(response):
+        """Filtra as respostas que podem ser a API de notas."""
+        if response.request.resource_type not in ('xhr', 'fetch'):
+            return False
+        if 'json' not in response.headers.get('content-type', ''):
+            return False
+        return bool(PADRAO_URL_API_NOTAS.search(response.url))
+    
+    def _ao_receber(self, response):
+        if self._corresponde(response):
+            self.candidatas.append(response)
+    
+    def linhas_capturadas(self):
+        """Retorna as linhas da resposta mais recente reconhecida, ou None."""
+        while self.candidatas:
+            response = self.candidatas.pop()
+            try:
+                linhas = linhas_de_json(response.json())
+            except Exception:
+                continue
+            if linhas:
+                self.url = response.url
+                return linhas
+        return None
+    
+    def aguardar(self, page, timeout_ms):
+        """
+        Aguarda até a API de notas responder (ou o timeout acabar).
+        
+        O padrão de URL é amplo, então outras chamadas (configuração, resumo
+        de pontos) também casam: cada resposta candidata que não vira linhas
+        é descartada e a espera continua até o prazo total.
+        
+        Returns:
+            list: Linhas `(nome, peso, nota)`, ou None se nada foi reconhecido.
+        """
+        prazo = time.monotonic() + timeout_ms / 1000
+        while True:
+            linhas = self.linhas_capturadas()
+            if linhas:
+                return linhas
+            restante = (prazo - time.monotonic()) * 1000
+            if restante <= 0:
+                return None
+            try:
+                response = page.wait_for_event('response', predicate=self._corresponde, timeout=restante)
+            except PlaywrightTimeout:
+                return None
+            if response not in self.candidatas:
+                self.candidatas.append(response)
+
+
+class DetectorPaginaNotas:
+    """
+    Detecta, por eventos, a página do módulo com a aba "Notas".
+    
+    Um init script (SCRIPT_DETECTAR_NOTAS) roda em todo documento novo do
+    contexto, inclusive em abas abertas depois e após cada navegação. Ele
+    observa o DOM com um MutationObserver e, quando a aba aparece, emite
+    MARCA_NOTAS_DETECTADA no console. O Python fica parado em um único
+    `wait_for_event`, sem polling nem round-trips enquanto o usuário faz login.
+    """
+    
+    def __init__(self, context):
+        self.context = context
+        self.pagina = None
+        # Guarda detecções que acontecem antes de `aguardar` ser chamado
+        context.on('console', self._ao_console)
+        context.add_init_script(SCRIPT_DETECTAR_NOTAS)
+        # Documentos já carregados não recebem o init script
+        for pg in context.pages:
+            try:
+                pg.evaluate(SCRIPT_DETECTAR_NOTAS)
+            except Exception:
+                continue
+    
+    def _ao_console(self, mensagem):
+        if self.pagina is None and mensagem.text == MARCA_NOTAS_DETECTADA:
+            self.pagina = mensagem.page
+    
+    def aguardar(self, timeout_ms):
+        """
+        Bloqueia até alguma página mostrar a aba "Notas".
+        
+        Returns:
+            Page: A página detectada.
+        
+        Raises:
+            PlaywrightTimeout: Se nada for detectado dentro do prazo.
+        """
+        if self.pagina is not None:
+            return self.pagina
+        mensagem = self.context.wait_for_event(
+            'console',
+            predicate=lambda msg: msg.text == MARCA_NOTAS_DETECTADA,
+            timeout=timeout_ms
+        )
+        return mensagem.page
+
+
+class Cronometro:
+    """
+    Mede quanto tempo cada fase da coleta levou.
+    
+    Fases sequenciais são registradas com `marcar`; etapas que rodam ao
+    mesmo tempo (em threads) com `medir`, que guarda início e fim de cada uma
+    para a linha do tempo.
+    """
+    
+    LARGURA_LINHA_DO_TEMPO = 30  # caracteres da barra mais longa
+    
+    def __init__(self):
+        self.fases = []
+        self.intervalos = []
+        self.inicio = self._ultimo = time.perf_counter()
+    
+    def marcar(self, fase):
+        """Registra a fase que acabou de terminar (desde a marca anterior)."""
+        agora = time.perf_counter()
+        self.fases.append((fase, agora - self._ultimo))
+        self._ultimo = agora
+    
+    def medir(self, fase, funcao, *args, **kwargs):
+        """Executa `funcao` registrando o intervalo dela (seguro entre threads)."""
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            self.intervalos.append((fase, inicio - self.inicio, time.perf_counter() - self.inicio))
+    
+    def exibir_linha_do_tempo(self, titulo="🧵 Inicialização em paralelo"):
+        """Imprime o início, o fim e uma barra para cada etapa medida."""
+        intervalos = sorted(self.intervalos, key=lambda intervalo: intervalo[1])
+        escala = self.LARGURA_LINHA_DO_TEMPO / max(max(fim for _, _, fim in intervalos), 1e-9)
+        tabela = Table(title=titulo, box=box.SIMPLE)
+        tabela.add_column("Etapa")
+        tabela.add_column("Início", justify="right", style="dim")
+        tabela.add_column("Fim", justify="right", style="cyan")
+        tabela.add_column("", no_wrap=True)
+        for fase, inicio, fim in intervalos:
+            coluna = int(inicio * escala)
+            barra = " " * coluna + "█" * max(1, int(fim * escala) - coluna)
+            tabela.add_row(fase, f"{inicio * 1000:.0f} ms", f"{fim * 1000:.0f} ms", f"[green]{barra}[/]")
+        console.print(tabela)
+    
+    def exibir(self, titulo="⏱️ Tempos da Coleta"):
+        """Imprime a linha do tempo da inicialização, a duração de cada fase e o total."""
+        if self.intervalos:
+            self.exibir_linha_do_tempo()
+        tabela = Table(title=titulo, box=box.SIMPLE)
+        tabela.add_column("Fase")
+        tabela.add_column("Duração", justify="right", style="cyan")
+        for fase, duracao in self.fases:
+            tabela.add_row(fase, f"{duracao * 1000:.0f} ms")
+        total = sum(duracao for _, duracao in self.fases)
+        tabela.add_row("[bold]Total[/]", f"[bold]{total * 1000:.0f} ms[/]")
+        console.print(tabela)
+
+
+def aguardar_tabela_estavel(page):
+    """
+    Aguarda a tabela de notas terminar de renderizar.
+    
+    Substitui a espera fixa: retorna assim que o número de linhas `styled-tr`
+    para de mudar. Se isso não acontecer no prazo, segue com o que há.
+    """
+    try:
+        page.wait_for_function(
+            SCRIPT_TABELA_ESTAVEL, arg=CONTAGENS_ESTAVEIS,
+            polling=INTERVALO_ESTABILIZACAO, timeout=TIMEOUT_ESTABILIZACAO
+        )
+    except PlaywrightTimeout:
+        console.print("[yellow]⚠[/] A tabela continuou mudando; extraindo mesmo assim.")
+
+
+def instalar_fechador_popup(context):
+    """
+    Instala no contexto o fechamento automático do popup de faltas.
+    
+    O init script SCRIPT_FECHAR_POPUP observa o DOM de cada documento do
+    Adalove e fecha o popup no mesmo quadro em que ele aparece; o Python só
+    recebe o aviso pela binding e nunca bloqueia esperando pelo popup.
+    """
+    def ao_fechar(source, seletor):
+        console.print("   [dim]🔔 Popup fechado automaticamente[/]")
+    
+    context.expose_binding(BINDING_POPUP_FECHADO, ao_fechar)
+    context.add_init_script(SCRIPT_FECHAR_POPUP)
+    # Documentos já carregados não recebem o init script
+    for pg in context.pages:
+        try:
+            pg.evaluate(SCRIPT_FECHAR_POPUP)
+        except Exception:
+            continue
+
+
+def parar_fechador_popup(context):
+    """
+    Desliga o fechador de popup nos documentos abertos do contexto.
+    
+    Chamado quando a tabela de notas já carregou (o popup não atrapalha mais)
+    e ao devolver a aba ao daemon, cujas outras abas continuam abertas e
+    receberam o script em `instalar_fechador_popup`.
+    """
+    for pg in context.pages:
+        try:
+            pg.evaluate(SCRIPT_PARAR_FECHADOR_POPUP)
+        except Exception:
+            continue
+
+
+def extrair_linhas_pagina(page):
+    """
+    Extrai as linhas da tabela de notas direto no navegador.
+    
+    Um único `page.evaluate` devolve um JSON compacto com as três células de
+    cada linha, sem serializar o DOM inteiro nem passar por um parser HTML.
+    
+    Returns:
+        list: Tuplas `(nome, peso, nota)`, no mesmo formato do extrator.
+    """
+    return [(nome, parse_float(peso), parse_float(nota))
+            for nome, peso, nota in page.evaluate(SCRIPT_EXTRAIR_LINHAS)]
+
+
+def localizar_perfil(navegador, modo_perfil=PERFIL_COMPLETO, busca=None):
+    """
+    Encontra o perfil do Inteli e prepara a cópia usada pelo navegador.
+    
+    Com PERFIL_COOKIES, monta um perfil mínimo só com os cookies do Inteli e
+    do SSO; se o banco de cookies não puder ser lido, sincroniza o espelho
+    completo como de costume.
+    
+    Args:
+        busca: Retorno de `buscar_perfil` já feito para este navegador, se houver.
+    
+    Returns:
+        tuple: (nome do perfil ou None, diretório de dados do espelho ou None).
+    """
+    # Tenta usar o perfil real do usuário
+    if busca is None:
+        busca = obter_user_data_dir(navegador['name']), None
+    user_data_dir, achado = busca
+    
+    # Tenta encontrar o perfil vinculado ao Inteli
+    perfil_inteli = None
+    temp_user_data = None
+    if user_data_dir:
+        perfil_inteli = encontrar_perfil_inteli(user_data_dir, achado)
+        if perfil_inteli and modo_perfil == PERFIL_COOKIES:
+            temp_user_data = copiar_cookies_para_temp(user_data_dir, perfil_inteli)
+        if perfil_inteli and not temp_user_data:
+            temp_user_data = copiar_perfil_para_temp(user_data_dir, perfil_inteli)
+    
+    return perfil_inteli, temp_user_data
+
+
+class Inicializacao:
+    """
+    Etapas da inicialização que não dependem do Playwright, em andamento.
+    
+    Atributos (todos Future):
+        navegador: Retorno de `detectar_navegador`.
+        sessao: Sessão salva (ou None).
+        daemon: Retorno de `estado_daemon`.
+        perfil: Retorno de `localizar_perfil`, ou None quando a cópia foi
+            dispensada (sessão salva, daemon ou nenhum navegador).
+    """
+    
+    __slots__ = ('navegador', 'sessao', 'daemon', 'perfil')
+
+
+def iniciar_inicializacao(cronometro, usar_sessao=True, modo_perfil=PERFIL_COMPLETO):
+    """
+    Dispara a detecção do navegador, a leitura da sessão, a sonda do daemon e
+    a busca do perfil (em todos os navegadores Chromium) em um pool; a cópia
+    do perfil começa assim que o navegador e o perfil dele forem conhecidos.
+    
+    Tudo roda enquanto o driver do Playwright inicia, então a espera até o
+    navegador abrir fica perto da etapa mais lenta, e não da soma delas.
+    
+    Returns:
+        Inicializacao: As etapas em andamento.
+    """
+    executor = ThreadPoolExecutor(max_workers=WORKERS_INICIALIZACAO)
+    inicializacao = Inicializacao()
+    inicializacao.navegador = executor.submit(cronometro.medir, "Detecção do navegador", detectar_navegador)
+    inicializacao.sessao = executor.submit(cronometro.medir, "Leitura da sessão salva",
+                                           carregar_sessao if usar_sessao else lambda: None)
+    inicializacao.daemon = executor.submit(cronometro.medir, "Sonda do daemon", estado_daemon)
+    buscas = {nome: executor.submit(cronometro.medir, f"Busca do perfil ({nome.capitalize()})", buscar_perfil, nome)
+              for nome in NAVEGADORES_COM_PERFIL}
+    
+    def preparar():
+        # Com o daemon em execução, só abre uma aba no navegador já aberto;
+        # sem ele, uma sessão salva dispensa a cópia do perfil e o login.
+        navegador = inicializacao.navegador.result()
+        if not navegador or inicializacao.sessao.result() or inicializacao.daemon.result():
+            return None
+        busca = buscas[navegador['name']].result() if navegador['name'] in buscas else None
+        return cronometro.medir("Cópia do perfil", localizar_perfil, navegador, modo_perfil, busca)
+    
+    # Enviada por último: as tarefas de que ela depende já têm thread própria
+    inicializacao.perfil = executor.submit(preparar)
+    executor.shutdown(wait=False)
+    return inicializacao
+
+
+def opcoes_lancamento(navegador, headless=False, perfil_inteli=None, args_extras=()):
+    """
+    Opções de `launch` (ou `launch_persistent_context`) do navegador detectado.
+    
+    Maximiza a janela (exceto no macOS e sem janela) e, no Chromium, escolhe
+    o executável ou o canal e seleciona o perfil `perfil_inteli`, se houver.
+    `args_extras` vale só para o Chromium.
+    """
+    args = ['--start-maximized'] if platform.system() != 'Darwin' and not headless else []
+    opcoes = {'headless': headless, 'args': args}
+    if navegador['type'] == 'firefox':
+        return opcoes
+    args.extend(args_extras)
+    if perfil_inteli:
+        args.append(f'--profile-directory={perfil_inteli}')
+    if navegador.get('executable_path') and navegador['path']:
+        opcoes['executable_path'] = navegador['path']
+    elif navegador['channel']:
+        opcoes['channel'] = navegador['channel']
+    return opcoes
+
+
+def abrir_navegador(p, navegador, perfil=None, modo_perfil=PERFIL_COMPLETO):
+    """
+    Abre o navegador detectado, com o perfil do Inteli copiado quando houver.
+    
+    Args:
+        p: Instância de `sync_playwright`.
+        navegador: Dict retornado por `detectar_navegador`.
+        perfil: Future que resolve para o retorno de `localizar_perfil` (ver
+            `Inicializacao.perfil`); se None, localiza o perfil agora.
+        modo_perfil: PERFIL_COMPLETO ou PERFIL_COOKIES (quando `perfil` é None).
+    
+    Returns:
+        tuple: (browser ou None, context, page), ou None se nada pôde ser aberto.
+        Com perfil persistente não há browser (fecha-se o context).
+    """
+    browser = None
+    perfil_inteli, temp_user_data = perfil.result() if perfil else localizar_perfil(navegador, modo_perfil)
+    
+    try:
+        # Escolhe o tipo de navegador
+        if navegador['type'] == 'firefox':
+            browser = p.firefox.launch(**opcoes_lancamento(navegador))
+            context = browser.new_context(viewport=None, locale='pt-BR')
+            page = context.new_page()
+        else:
+            # Para Chrome, Edge, Brave
+            if temp_user_data and perfil_inteli:
+                console.print(f"[dim]👤 Usando sessão do perfil: {perfil_inteli}[/]")
+                context = p.chromium.launch_persistent_context(
+                    temp_user_data, viewport=None, locale='pt-BR', ignore_https_errors=True,
+                    **opcoes_lancamento(navegador, perfil_inteli=perfil_inteli)
+                )
+                page = context.pages[0] if context.pages else context.new_page()
+                
+            else:
+                console.print("[dim]📂 Abrindo navegador (será necessário fazer login)[/]")
+                browser = p.chromium.launch(**opcoes_lancamento(navegador))
+                context = browser.new_context(viewport=None, locale='pt-BR')
+                page = context.new_page()
+                
+    except Exception as e:
+        console.print(f"[yellow]⚠[/] Erro ao abrir {navegador['name']}: {e}")
+        
+        from rich.prompt import Confirm
+        if Confirm.ask("\n[yellow]Deseja baixar o Chromium como alternativa?[/]", default=False):
+            try:
+                console.print("\n[dim]📦 Baixando Chromium...[/]")
+                subprocess.check_call([sys.executable, '-m', 'playwright', 'install', 'chromium'])
+                browser = p.chromium.launch(**opcoes_lancamento(NAVEGADOR_CHROMIUM))
+                context = browser.new_context(viewport=None, locale='pt-BR')
+                page = context.new_page()
+                console.print("[green]✓[/] Chromium funcionando!")
+            except Exception as e2:
+                console.print(f"[red]✗[/] Falha ao iniciar navegador: {e2}")
+                return None
+        else:
+            console.print("[red]Operação cancelada.[/]")
+            return None
+    
+    return browser, context, page
+
+
+def preparar_contexto(context, page, extracao, janela=True):
+    """
+    Registra o fechador de popup, o detector da página do módulo e a captura
+    da API antes de qualquer navegação, e maximiza a janela no Windows
+    (exceto com `janela=False`, no navegador sem janela).
+    
+    Returns:
+        tuple: (DetectorPaginaNotas, CapturaNotasApi ou None).
+    """
+    instalar_fechador_popup(context)
+    detector = DetectorPaginaNotas(context)
+    captura = CapturaNotasApi(context) if extracao == EXTRACAO_REDE else None
+    
+    # Maximiza a janela no Windows
+    if janela and platform.system() == 'Windows':
+        try:
+            page.set_viewport_size({'width': 1920, 'height': 1080})
+            page.evaluate('() => { window.moveTo(0, 0); window.resizeTo(screen.availWidth, screen.availHeight); }')
+        except:
+            pass
+    
+    return detector, captura
+
+
+def abrir_com_sessao(p, navegador, sessao, headless=False):
+    """
+    Abre um contexto leve, sem perfil, a partir da sessão salva.
+    
+    Com `headless=True` não há janela: o navegador roda em segundo plano com
+    um viewport pequeno (VIEWPORT_SEGUNDO_PLANO), sem maximizar nada.
+    
+    Returns:
+        tuple: (browser, context, page).
+    """
+    tipo = p.firefox if navegador['type'] == 'firefox' else p.chromium
+    browser = tipo.launch(**opcoes_lancamento(navegador, headless=headless))
+    viewport = VIEWPORT_SEGUNDO_PLANO if headless else None
+    context = browser.new_context(storage_state=sessao['storage_state'], viewport=viewport, locale='pt-BR')
+    return browser, context, context.new_page()
+
+
+def fechar_navegador(browser, context, aba_daemon=None):
+    """
+    Encerra o navegador da coleta.
+    
+    Conectado ao daemon (`aba_daemon` informada), fecha só a aba aberta por
+    esta coleta e desconecta; o navegador do daemon continua aberto.
+    """
+    if aba_daemon is not None:
+        parar_fechador_popup(context)
+        try:
+            aba_daemon.close()
+        except Exception:
+            pass
+        registrar_uso()
+        browser.close()
+    elif browser:
+        browser.close()
+    else:
+        context.close()
+
+
+def coletar_notas(output_dir=None, salvar_html=True, extracao=EXTRACAO_DOM, usar_sessao=True,
+                  modo_perfil=PERFIL_COMPLETO, segundo_plano=True, bloquear_recursos=False,
+                  bloquear_urls=()):
     """
     Abre o navegador e coleta as notas do Adalove.
     
+    As linhas da tabela são extraídas no próprio navegador e devolvidas
+    diretamente, prontas para o cálculo no mesmo processo. Serializar e gravar
+    o HTML em disco é apenas uma saída opcional (útil para o modo manual depois).
+    
     Args:
         output_dir: Diretório onde salvar o HTML. Se None, usa o diretório do script.
+        salvar_html: Se True, também grava o HTML em `Adalove.html`.
+        extracao: EXTRACAO_DOM lê a tabela renderizada; EXTRACAO_REDE lê o JSON
+            da API de notas assim que ele chega, com a tabela como alternativa.
+        usar_sessao: Se True, tenta a sessão salva (direto para o último módulo)
+            e salva a sessão ao final de uma coleta bem-sucedida.
+        modo_perfil: PERFIL_COMPLETO sincroniza os arquivos de sessão do perfil;
+            PERFIL_COOKIES copia só os cookies do Inteli e do SSO.
+        segundo_plano: Se True, a coleta com sessão salva roda sem janela
+            (headless); a janela só abre se o login for necessário.
+        bloquear_recursos: Se True, aborta imagens, fontes, mídia e analytics
+            durante a coleta (ver `bloqueio`).
+        bloquear_urls: Trechos de URL bloqueados além de PADROES_BLOQUEADOS.
     
     Returns:
-        bool: True se a coleta foi bem-sucedida, False caso contrário.
+        list: Linhas `(nome, peso, nota)` extraídas, ou False se a coleta falhou.
     """
     
     os.system('cls' if os.name == 'nt' else 'clear')
     print_header()
     
-    # Detecta navegador instalado
-    navegador = detectar_navegador()
+    cronometro = Cronometro()
+    
+    # Detecção do navegador, sessão, daemon e perfil em um pool de threads,
+    # enquanto o driver do Playwright sobe nesta thread
+    inicializacao = iniciar_inicializacao(cronometro, usar_sessao, modo_perfil)
+    p = cronometro.medir("Driver do Playwright", sync_playwright().start)
+    try:
+        filtro = FiltroRequisicoes(bloquear_urls) if bloquear_recursos else None
+        return _coletar_notas(p, cronometro, inicializacao, output_dir, salvar_html, extracao,
+                              usar_sessao, modo_perfil, segundo_plano, filtro)
+    finally:
+        p.stop()
+
+
+def _coletar_notas(p, cronometro, inicializacao, output_dir, salvar_html, extracao, usar_sessao,
+                   modo_perfil, segundo_plano, filtro):
+    """Corpo de `coletar_notas`, com o driver do Playwright já iniciado."""
+    navegador = inicializacao.navegador.result()
     
     if not navegador:
         console.print(Panel(
@@ -392,7 +974,7 @@ def coletar_notas(output_dir=None):
                 console.print("\n[dim]📦 Baixando Chromium...[/]")
                 subprocess.check_call([sys.executable, '-m', 'playwright', 'install', 'chromium'])
                 console.print("[green]✓[/] Chromium instalado!")
-                navegador = {'name': 'chromium', 'channel': None, 'type': 'chromium', 'path': None, 'executable_path': False}
+                navegador = dict(NAVEGADOR_CHROMIUM)
             except Exception as e:
                 console.print(f"[red]✗[/] Erro ao instalar Chromium: {e}")
                 return False
@@ -401,105 +983,79 @@ def coletar_notas(output_dir=None):
     
     print_instrucoes()
     
-    with sync_playwright() as p:
-        console.print("[bold]🚀 Abrindo navegador...[/]")
-        
-        # Tenta usar o perfil real do usuário
-        user_data_dir = obter_user_data_dir(navegador['name'])
-        
-        # Tenta encontrar o perfil vinculado ao Inteli
-        perfil_inteli = None
-        temp_user_data = None
-        if user_data_dir:
-            perfil_inteli = encontrar_perfil_inteli(user_data_dir)
-            if perfil_inteli:
-                temp_user_data = copiar_perfil_para_temp(user_data_dir, perfil_inteli)
-        
-        browser = None
-        
+    sessao = inicializacao.sessao.result()
+    
+    console.print("[bold]🚀 Abrindo navegador...[/]")
+    
+    anexado = conectar_daemon(p) if inicializacao.daemon.result() else None
+    browser = None
+    aba_daemon = None
+    # Com sessão salva, a coleta é tentada sem janela; se o login for
+    # necessário, o navegador visível é aberto depois
+    headless = bool(sessao) and segundo_plano and not anexado
+    
+    if anexado:
+        browser, context = anexado
+        page = aba_daemon = context.new_page()
+        console.print("[dim]♻️ Reutilizando o navegador do daemon (nova aba)[/]")
+    elif sessao:
+        browser, context, page = abrir_com_sessao(p, navegador, sessao, headless)
+        if headless:
+            console.print("[dim]🔑 Usando a sessão salva da última coleta (em segundo plano, sem janela)[/]")
+        else:
+            console.print("[dim]🔑 Usando a sessão salva da última coleta[/]")
+    else:
+        # Se a cópia foi dispensada (ex: o daemon respondeu à sonda mas não à
+        # conexão), o perfil é localizado e sincronizado agora
+        perfil = inicializacao.perfil if inicializacao.perfil.result() is not None else None
+        aberto = abrir_navegador(p, navegador, perfil, modo_perfil)
+        if aberto is None:
+            return False
+        browser, context, page = aberto
+    
+    detector, captura = preparar_contexto(context, page, extracao, janela=not headless)
+    cronometro.marcar("Abertura do navegador")
+    
+    # Com sessão salva, vai direto à página do módulo coletado da última vez
+    if sessao:
+        # Sem login nesse caminho, o filtro já vale para o carregamento do
+        # módulo, que é onde estão quase todas as imagens, fontes e analytics
+        if filtro:
+            filtro.instalar(context)
+        console.print(f"\n[bold]🌐 Abrindo o último módulo coletado...[/]")
         try:
-            # Escolhe o tipo de navegador
-            if navegador['type'] == 'firefox':
-                browser = p.firefox.launch(
-                    headless=False,
-                    args=['--start-maximized'] if platform.system() != 'Darwin' else []
-                )
-                context = browser.new_context(viewport=None, locale='pt-BR')
-                page = context.new_page()
-            else:
-                # Para Chrome, Edge, Brave
-                chromium_args = ['--start-maximized'] if platform.system() != 'Darwin' else []
-                
-                if temp_user_data and perfil_inteli:
-                    console.print(f"[dim]👤 Usando sessão do perfil: {perfil_inteli}[/]")
-                    chromium_args.append(f'--profile-directory={perfil_inteli}')
-                    
-                    launch_options = {
-                        'headless': False,
-                        'args': chromium_args,
-                        'viewport': None,
-                        'locale': 'pt-BR',
-                        'ignore_https_errors': True,
-                    }
-                    
-                    if navegador.get('executable_path') and navegador['path']:
-                        launch_options['executable_path'] = navegador['path']
-                    elif navegador['channel']:
-                        launch_options['channel'] = navegador['channel']
-                    
-                    context = p.chromium.launch_persistent_context(temp_user_data, **launch_options)
-                    page = context.pages[0] if context.pages else context.new_page()
-                    
-                else:
-                    console.print("[dim]📂 Abrindo navegador (será necessário fazer login)[/]")
-                    if navegador.get('executable_path') and navegador['path']:
-                        browser = p.chromium.launch(
-                            headless=False,
-                            executable_path=navegador['path'],
-                            args=chromium_args
-                        )
-                    else:
-                        launch_options = {'headless': False, 'args': chromium_args}
-                        if navegador['channel']:
-                            launch_options['channel'] = navegador['channel']
-                        browser = p.chromium.launch(**launch_options)
-                    
-                    context = browser.new_context(viewport=None, locale='pt-BR')
-                    page = context.new_page()
-                    
-        except Exception as e:
-            console.print(f"[yellow]⚠[/] Erro ao abrir {navegador['name']}: {e}")
-            
-            from rich.prompt import Confirm
-            if Confirm.ask("\n[yellow]Deseja baixar o Chromium como alternativa?[/]", default=False):
-                try:
-                    console.print("\n[dim]📦 Baixando Chromium...[/]")
-                    subprocess.check_call([sys.executable, '-m', 'playwright', 'install', 'chromium'])
-                    browser = p.chromium.launch(
-                        headless=False,
-                        args=['--start-maximized'] if platform.system() != 'Darwin' else []
-                    )
-                    context = browser.new_context(viewport=None, locale='pt-BR')
-                    page = context.new_page()
-                    console.print("[green]✓[/] Chromium funcionando!")
-                except Exception as e2:
-                    console.print(f"[red]✗[/] Falha ao iniciar navegador: {e2}")
-                    return False
+            page.goto(sessao['url_modulo'])
+            # Desvio para outro host (SSO) = sessão expirada, sem esperar o timeout
+            if sessao_aceita(page, sessao['url_modulo']):
+                page = detector.aguardar(TIMEOUT_SESSAO)
+                cronometro.marcar("Abertura direta do módulo")
+                console.print("[green]✓[/] Sessão válida, página do módulo aberta!")
             else:
-                console.print("[red]Operação cancelada.[/]")
-                return False
-        
-        # Maximiza a janela no Windows
-        if platform.system() == 'Windows':
-            try:
-                page.set_viewport_size({'width': 1920, 'height': 1080})
-                page.evaluate('() => { window.moveTo(0, 0); window.resizeTo(screen.availWidth, screen.availHeight); }')
-            except:
-                pass
+                sessao = None
+        except PlaywrightTimeout:
+            sessao = None
         
+        if not sessao:
+            console.print("[yellow]⚠[/] Sessão salva expirada; voltando ao login.")
+            if filtro:
+                filtro.desinstalar(context)
+            if not anexado:
+                # No daemon a sessão salva não é usada, então continua válida
+                descartar_sessao()
+                fechar_navegador(browser, context)
+                aberto = abrir_navegador(p, navegador, modo_perfil=modo_perfil)
+                if aberto is None:
+                    return False
+                browser, context, page = aberto
+                headless = False
+                detector, captura = preparar_contexto(context, page, extracao)
+            cronometro.marcar("Sessão expirada")
+    
+    if not sessao:
         # Navega para o Adalove
         console.print(f"\n[bold]🌐 Acessando Adalove...[/]")
         page.goto(ADALOVE_URL)
+        cronometro.marcar("Carregamento do Adalove")
         
         console.print(Panel(
             "[bold]Aguardando login...[/]\n\n"
@@ -508,60 +1064,10 @@ def coletar_notas(output_dir=None):
             title="⏳ Aguardando", border_style="yellow"
         ))
         
-        # Função para fechar popup de faltas
-        def fechar_popup_faltas(pg):
-            """Fecha o popup de faltas que pode bloquear a interface."""
-            try:
-                close_selectors = [
-                    'button[aria-label="close"]',
-                    'button[aria-label="Close"]',
-                    'button[aria-label="fechar"]',
-                    '.MuiDialog-root button:has(svg)',
-                    '.MuiModal-root button:has(svg)',
-                    '[role="dialog"] button:has(svg path[fill="#2D253F"])',
-                    'button:has(svg path[d*="M36.4808 4.68875"])',
-                    '.MuiIconButton-root:has(svg path[d*="36.4808"])',
-                ]
-                
-                for selector in close_selectors:
-                    try:
-                        close_btn = pg.locator(selector).first
-                        if close_btn.is_visible(timeout=500):
-                            close_btn.click()
-                            console.print("   [dim]🔔 Popup fechado automaticamente[/]")
-                            time.sleep(0.5)
-                            return True
-                    except:
-                        continue
-                return False
-            except:
-                return False
-        
-        # Função para encontrar a página com a aba de notas
-        def encontrar_pagina_notas(ctx, timeout_ms):
-            """Procura em todas as páginas/abas do contexto pela aba de Notas."""
-            import time as _time
-            inicio = _time.time()
-            timeout_sec = timeout_ms / 1000
-            
-            while (_time.time() - inicio) < timeout_sec:
-                for pg in ctx.pages:
-                    try:
-                        fechar_popup_faltas(pg)
-                        notas_element = pg.locator('button:has-text("Notas"), [role="tab"]:has-text("Notas"), .MuiTab-root:has-text("Notas")').first
-                        if notas_element.is_visible(timeout=500):
-                            return pg
-                    except:
-                        continue
-                _time.sleep(1)
-            return None
-        
         try:
-            page = encontrar_pagina_notas(context, TIMEOUT_LOGIN)
-            if page:
-                console.print("\n[green]✓[/] Página do módulo detectada!")
-            else:
-                raise PlaywrightTimeout("Timeout ao procurar página de notas")
+            page = detector.aguardar(TIMEOUT_LOGIN)
+            cronometro.marcar("Login e navegação até o módulo")
+            console.print("\n[green]✓[/] Página do módulo detectada!")
             
         except PlaywrightTimeout:
             console.print(Panel(
@@ -570,57 +1076,103 @@ def coletar_notas(output_dir=None):
                 "Certifique-se de navegar até a página do módulo após o login.",
                 title="❌ Erro", border_style="red"
             ))
-            if browser:
-                browser.close()
-            else:
-                context.close()
+            fechar_navegador(browser, context, aba_daemon)
             return False
+    
+    url_modulo = page.url
+    
+    # No login interativo o filtro só entra agora: no SSO ele bloquearia
+    # imagens como as do CAPTCHA. Daqui em diante só se espera a tabela de
+    # notas (com a sessão salva, ele já está instalado e isto não faz nada).
+    if filtro:
+        filtro.instalar(context)
+    
+    # Clica na aba "Notas" (o click já espera a aba estar visível, estável
+    # e sem nada por cima, então não há espera fixa antes dele)
+    console.print("[bold]📊 Clicando na aba 'Notas'...[/]")
+    linhas = None
+    try:
+        notas_tab = page.locator('button:has-text("Notas"), [role="tab"]:has-text("Notas")').first
+        notas_tab.click()
+        cronometro.marcar("Clique na aba Notas")
         
-        time.sleep(2)
-        fechar_popup_faltas(page)
+        if captura:
+            console.print("[dim]⏳ Aguardando resposta da API de notas...[/]")
+            linhas = captura.aguardar(page, TIMEOUT_API_NOTAS)
+            cronometro.marcar("Resposta da API de notas")
         
-        # Clica na aba "Notas"
-        console.print("[bold]📊 Clicando na aba 'Notas'...[/]")
-        try:
-            fechar_popup_faltas(page)
-            
-            notas_tab = page.locator('button:has-text("Notas"), [role="tab"]:has-text("Notas")').first
-            notas_tab.click()
-            
-            time.sleep(1)
-            fechar_popup_faltas(page)
-            
+        if linhas:
+            console.print(f"[green]✓[/] Notas capturadas da API: [dim]{captura.url}[/]")
+        else:
+            if captura:
+                console.print("[yellow]⚠[/] API de notas não reconhecida, lendo a tabela da página.")
             console.print("[dim]⏳ Aguardando tabela de notas carregar...[/]")
             page.wait_for_selector('tr.styled-tr', timeout=TIMEOUT_NAVEGACAO)
-            time.sleep(2)
+            cronometro.marcar("Primeira linha da tabela")
+            aguardar_tabela_estavel(page)
+            cronometro.marcar("Estabilização da tabela")
             
             console.print("[green]✓[/] Tabela de notas carregada!")
-            
+        
+    except PlaywrightTimeout:
+        console.print("[yellow]⚠[/] Não foi possível clicar automaticamente na aba 'Notas'.")
+        reaberto = headless
+        if headless:
+            # Sem janela não há como clicar manualmente: reabre o módulo visível
+            fechar_navegador(browser, context)
+            browser, context, page = abrir_com_sessao(p, navegador, sessao)
+            detector, captura = preparar_contexto(context, page, extracao)
+            if filtro:
+                filtro.instalar(context)
+            headless = False
+        console.print("   Por favor, clique manualmente na aba 'Notas'...")
+        
+        try:
+            if reaberto:
+                page.goto(url_modulo)
+            page.wait_for_selector('tr.styled-tr', timeout=TIMEOUT_NAVEGACAO)
+            cronometro.marcar("Clique manual e primeira linha da tabela")
+            aguardar_tabela_estavel(page)
+            cronometro.marcar("Estabilização da tabela")
+            console.print("[green]✓[/] Tabela de notas detectada!")
         except PlaywrightTimeout:
-            console.print("[yellow]⚠[/] Não foi possível clicar automaticamente na aba 'Notas'.")
-            console.print("   Por favor, clique manualmente na aba 'Notas'...")
-            
+            console.print(Panel(
+                "[bold red]Tabela de notas não encontrada.[/]\n\n"
+                "Certifique-se de clicar na aba 'Notas' manualmente.",
+                title="❌ Erro", border_style="red"
+            ))
+            fechar_navegador(browser, context, aba_daemon)
+            return False
+    
+    parar_fechador_popup(context)
+    
+    # Extrai as notas direto do DOM renderizado (se a API não as trouxe)
+    if not linhas:
+        console.print("\n[bold]📄 Extraindo notas da página...[/]")
+        linhas = extrair_linhas_pagina(page)
+        cronometro.marcar("Extração das notas")
+    console.print(f"[green]✓[/] {len(linhas)} atividades extraídas")
+    if filtro and filtro.total_bloqueadas:
+        console.print(f"[dim]🚫 {filtro.total_bloqueadas} requisições bloqueadas ({filtro.resumo()}), "
+                      f"~{formatar_bytes(filtro.bytes_estimados)} economizados (estimativa)[/]")
+    
+    # Guarda a sessão e o módulo para a próxima coleta ir direto a ele
+    if usar_sessao and linhas:
+        try:
+            if salvar_sessao(context, url_modulo):
+                console.print("[dim]🔑 Sessão salva para a próxima coleta[/]")
+        except Exception:
+            pass
+    
+    # Salva o HTML (opcional)
+    if salvar_html:
+        if captura:
+            # Com a API, a tabela pode ainda não ter sido renderizada
             try:
                 page.wait_for_selector('tr.styled-tr', timeout=TIMEOUT_NAVEGACAO)
-                console.print("[green]✓[/] Tabela de notas detectada!")
-                time.sleep(2)
             except PlaywrightTimeout:
-                console.print(Panel(
-                    "[bold red]Tabela de notas não encontrada.[/]\n\n"
-                    "Certifique-se de clicar na aba 'Notas' manualmente.",
-                    title="❌ Erro", border_style="red"
-                ))
-                if browser:
-                    browser.close()
-                else:
-                    context.close()
-                return False
-        
-        # Extrai o HTML da página
-        console.print("\n[bold]📄 Extraindo HTML da página...[/]")
+                pass
         html_content = page.content()
-        
-        # Salva o HTML
         if output_dir:
             output_path = os.path.join(output_dir, OUTPUT_FILE)
         else:
@@ -632,15 +1184,17 @@ def coletar_notas(output_dir=None):
             f.write(html_content)
         
         console.print(f"[green]✓[/] HTML salvo em: [cyan]{output_path}[/]")
-        
-        # Fecha o navegador
-        console.print("\n[dim]🔒 Fechando navegador...[/]")
-        if browser:
-            browser.close()
-        else:
-            context.close()
-        
-        return True
+        cronometro.marcar("Gravação do HTML")
+    
+    # Fecha o navegador
+    console.print("\n[dim]🔒 Fechando navegador...[/]")
+    fechar_navegador(browser, context, aba_daemon)
+    cronometro.marcar("Fechamento do navegador")
+    
+    console.print()
+    cronometro.exibir()
+    
+    return linhas or False
 
 
 if __name__ == "__main__":
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Coleta assíncrona das notas de todos os módulos do Adalove.
+
+Depois do login, lista os módulos de academic-life e abre cada um em uma aba
+própria com `async_playwright`, no máximo CONCORRENCIA_MODULOS abas ao mesmo
+tempo. As abas carregam e renderizam em paralelo, então o tempo total fica
+próximo ao do módulo mais lento, e não à soma de todos.
+"""
+
+import os
+import asyncio
+import time
+
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+from rich.panel import Panel
+from rich.table import Table
+from rich import box
+
+from coletar import (
+    console, print_header, detectar_navegador, obter_user_data_dir, encontrar_perfil_inteli,
+    copiar_perfil_para_temp, opcoes_lancamento, ADALOVE_URL, TIMEOUT_LOGIN, TIMEOUT_NAVEGACAO,
+    TIMEOUT_ESTABILIZACAO, INTERVALO_ESTABILIZACAO, CONTAGENS_ESTAVEIS,
+    SCRIPT_TABELA_ESTAVEL, SCRIPT_EXTRAIR_LINHAS, SCRIPT_FECHAR_POPUP, BINDING_POPUP_FECHADO,
+)
+from extrator import parse_float
+
+# Configurações
+CONCORRENCIA_MODULOS = 4  # abas de módulo abertas ao mesmo tempo
+SELETOR_LINK_MODULO = 'a[href*="/academic-life/"]'
+SELETOR_ABA_NOTAS = 'button:has-text("Notas"), [role="tab"]:has-text("Notas")'
+
+# Abas em segundo plano não podem ter timers e renderização estrangulados,
+# senão só a aba em foco avança e a coleta volta a ser sequencial
+ARGS_ABAS_PARALELAS = [
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-backgrounding-occluded-windows',
+]
+
+# Mesma ideia de SCRIPT_TABELA_ESTAVEL, para os links da lista de módulos
+SCRIPT_LINKS_ESTAVEIS = """
+([seletor, contagens]) => {
+    const n = document.querySelectorAll(seletor).length;
+    const estado = window.__adaloveLinks || (window.__adaloveLinks = {n: -1, iguais: 0});
+    if (n > 0 && n === estado.n) {
+        estado.iguais++;
+    } else {
+        estado.n = n;
+        estado.iguais = 0;
+    }
+    return estado.iguais >= contagens;
+}
+"""
+
+# Executado na página inicial: devolve [nome, url] de cada link de módulo,
+# sem repetir URLs. O nome é o texto do link (ou do seu title/aria-label).
+SCRIPT_LISTAR_MODULOS = """
+(seletor) => {
+    const vistos = new Set();
+    const modulos = [];
+    for (const a of document.querySelectorAll(seletor)) {
+        const url = a.href.split('#')[0];
+        if (vistos.has(url) || url.replace(/\\/+$/, '') === location.href.replace(/\\/+$/, '')) continue;
+        vistos.add(url);
+        const nome = (a.innerText || a.getAttribute('title') || a.getAttribute('aria-label') || '').trim();
+        modulos.push([nome.split('\\n')[0].trim() || url, url]);
+    }
+    return modulos;
+}
+"""
+
+
+def _nomes_unicos(modulos):
+    """Garante uma chave distinta por módulo (nomes repetidos ganham sufixo)."""
+    contagem = {}
+    unicos = []
+    for nome, url in modulos:
+        contagem[nome] = contagem.get(nome, 0) + 1
+        unicos.append((nome if contagem[nome] == 1 else f"{nome} ({contagem[nome]})", url))
+    return unicos
+
+
+async def _abrir_contexto(p, navegador, temp_user_data=None, perfil_inteli=None):
+    """
+    Abre o navegador detectado, com o perfil copiado quando houver.
+
+    Returns:
+        tuple: (browser ou None, context). Com perfil persistente não há browser.
+    """
+    if navegador['type'] == 'firefox':
+        browser = await p.firefox.launch(**opcoes_lancamento(navegador))
+        return browser, await browser.new_context(viewport=None, locale='pt-BR')
+
+    if temp_user_data and perfil_inteli:
+        console.print(f"[dim]👤 Usando sessão do perfil: {perfil_inteli}[/]")
+        context = await p.chromium.launch_persistent_context(
+            temp_user_data, viewport=None, locale='pt-BR', ignore_https_errors=True,
+            **opcoes_lancamento(navegador, perfil_inteli=perfil_inteli, args_extras=ARGS_ABAS_PARALELAS)
+        )
+        return None, context
+
+    console.print("[dim]📂 Abrindo navegador (será necessário fazer login)[/]")
+    browser = await p.chromium.launch(**opcoes_lancamento(navegador, args_extras=ARGS_ABAS_PARALELAS))
+    return browser, await browser.new_context(viewport=None, locale='pt-BR')
+
+
+async def _instalar_fechador_popup(context):
+    """Versão assíncrona de `coletar.instalar_fechador_popup` (sem aviso por popup)."""
+    await context.expose_binding(BINDING_POPUP_FECHADO, lambda source, seletor: None)
+    await context.add_init_script(SCRIPT_FECHAR_POPUP)
+
+
+async def _coletar_modulo(context, semaforo, url):
+    """
+    Abre um módulo em uma aba nova e extrai sua tabela de notas.
+
+    A duração é medida só depois de conseguir a vaga no semáforo, para não
+    contar o tempo de espera na fila.
+
+    Returns:
+        tuple: (linhas `(nome, peso, nota)` ou a exceção da falha, duração em segundos).
+    """
+    async with semaforo:
+        inicio = time.perf_counter()
+        page = None
+        try:
+            page = await context.new_page()
+            await page.goto(url, timeout=TIMEOUT_NAVEGACAO)
+            await page.locator(SELETOR_ABA_NOTAS).first.click(timeout=TIMEOUT_NAVEGACAO)
+            await page.wait_for_selector('tr.styled-tr', timeout=TIMEOUT_NAVEGACAO)
+            try:
+                await page.wait_for_function(
+                    SCRIPT_TABELA_ESTAVEL, arg=CONTAGENS_ESTAVEIS,
+                    polling=INTERVALO_ESTABILIZACAO, timeout=TIMEOUT_ESTABILIZACAO
+                )
+            except PlaywrightTimeout:
+                pass  # segue com as linhas que já existem
+            brutas = await page.evaluate(SCRIPT_EXTRAIR_LINHAS)
+        except Exception as e:
+            return e, time.perf_counter() - inicio
+        finally:
+            if page is not None:
+                try:
+                    await page.close()
+                except Exception:
+                    pass  # contexto já fechado; a falha (se houver) já foi devolvida
+    linhas = [(nome, parse_float(peso), parse_float(nota)) for nome, peso, nota in brutas]
+    return linhas, time.perf_counter() - inicio
+
+
+async def _coletar_todos(navegador, temp_user_data, perfil_inteli, concorrencia):
+    """Faz login, lista os módulos e coleta todos em paralelo."""
+    async with async_playwright() as p:
+        browser, context = await _abrir_contexto(p, navegador, temp_user_data, perfil_inteli)
+        try:
+            await _instalar_fechador_popup(context)
+            page = context.pages[0] if context.pages else await context.new_page()
+
+            console.print(f"\n[bold]🌐 Acessando Adalove...[/]")
+            await page.goto(ADALOVE_URL)
+            console.print(Panel(
+                "[bold]Aguardando login...[/]\n\n"
+                "Faça login e permaneça na página inicial (academic-life).\n"
+                "Os módulos serão abertos automaticamente em abas separadas.",
+                title="⏳ Aguardando", border_style="yellow"
+            ))
+
+            try:
+                await page.wait_for_selector(SELETOR_LINK_MODULO, timeout=TIMEOUT_LOGIN)
+            except PlaywrightTimeout:
+                console.print(Panel(
+                    "[bold red]Timeout![/]\n\nNenhum módulo encontrado em academic-life.",
+                    title="❌ Erro", border_style="red"
+                ))
+                return None
+            try:
+                await page.wait_for_function(
+                    SCRIPT_LINKS_ESTAVEIS, arg=[SELETOR_LINK_MODULO, CONTAGENS_ESTAVEIS],
+                    polling=INTERVALO_ESTABILIZACAO, timeout=TIMEOUT_ESTABILIZACAO
+                )
+            except PlaywrightTimeout:
+                pass  # lista o que já foi renderizado
+
+            modulos = _nomes_unicos(await page.evaluate(SCRIPT_LISTAR_MODULOS, SELETOR_LINK_MODULO))
+            console.print(f"[green]✓[/] {len(modulos)} módulo(s) encontrado(s); "
+                          f"coletando até {concorrencia} por vez...")
+
+            semaforo = asyncio.Semaphore(concorrencia)
+            inicio = time.perf_counter()
+            coletas = await asyncio.gather(*(
+                _coletar_modulo(context, semaforo, url) for _, url in modulos
+            ))
+            duracao = time.perf_counter() - inicio
+        finally:
+            console.print("\n[dim]🔒 Fechando navegador...[/]")
+            if browser:
+                await browser.close()
+            else:
+                await context.close()
+
+    return [(nome, url, resultado, tempo) for (nome, url), (resultado, tempo) in zip(modulos, coletas)], duracao
+
+
+def exibir_coleta(coletas, duracao):
+    """Imprime o tempo de cada módulo, o tempo total e a soma dos tempos."""
+    tabela = Table(title="⏱️ Coleta por Módulo", box=box.SIMPLE)
+    tabela.add_column("Módulo")
+    tabela.add_column("Atividades", justify="right")
+    tabela.add_column("Duração", justify="right", style="cyan")
+    for nome, _, resultado, tempo in coletas:
+        if isinstance(resultado, Exception):
+            situacao = f"[red]falhou: {str(resultado).splitlines()[0]}[/]"
+        else:
+            situacao = str(len(resultado))
+        tabela.add_row(nome, situacao, f"{tempo * 1000:.0f} ms")
+    soma = sum(tempo for *_, tempo in coletas)
+    tabela.add_row("[bold]Total (paralelo)[/]", "", f"[bold]{duracao * 1000:.0f} ms[/]")
+    tabela.add_row("[dim]Soma dos módulos[/]", "", f"[dim]{soma * 1000:.0f} ms[/]")
+    console.print(tabela)
+
+
+def coletar_modulos(concorrencia=CONCORRENCIA_MODULOS):
+    """
+    Abre o navegador, espera o login e coleta as notas de todos os módulos.
+
+    Args:
+        concorrencia: Máximo de abas de módulo abertas ao mesmo tempo (pelo menos 1).
+
+    Returns:
+        dict: {nome do módulo: linhas `(nome, peso, nota)`} dos módulos
+        coletados com sucesso, ou False se nada pôde ser coletado.
+
+    Raises:
+        ValueError: Se `concorrencia` for menor que 1.
+    """
+    if concorrencia < 1:
+        raise ValueError("concorrencia precisa ser pelo menos 1")
+
+    os.system('cls' if os.name == 'nt' else 'clear')
+    print_header()
+
+    navegador = detectar_navegador()
+    if not navegador:
+        console.print(Panel(
+            "[bold red]Nenhum navegador compatível encontrado![/]\n\n"
+            "Instale o Google Chrome, Microsoft Edge ou Firefox.",
+            title="❌ Erro", border_style="red"
+        ))
+        return False
+
+    console.print("[bold]🚀 Abrindo navegador...[/]")
+
+    user_data_dir = obter_user_data_dir(navegador['name'])
+    perfil_inteli = None
+    temp_user_data = None
+    if user_data_dir:
+        perfil_inteli = encontrar_perfil_inteli(user_data_dir)
+        if perfil_inteli:
+            temp_user_data = copiar_perfil_para_temp(user_data_dir, perfil_inteli)
+
+    try:
+        coleta = asyncio.run(_coletar_todos(navegador, temp_user_data, perfil_inteli, concorrencia))
+    except Exception as e:
+        console.print(f"[red]✗[/] Falha na coleta dos módulos: {e}")
+        return False
+
+    if not coleta:
+        return False
+
+    coletas, duracao = coleta
+    exibir_coleta(coletas, duracao)
+
+    resultados = {nome: resultado for nome, _, resultado, _ in coletas
+                  if not isinstance(resultado, Exception) and resultado}
+    return resultados or False
+
+
+if __name__ == "__main__":
+    try:
+        coletar_modulos()
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Operação cancelada pelo usuário.[/]")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Perfil mínimo com apenas os cookies do Inteli.
+
+Em vez de copiar o perfil inteiro, abre o banco SQLite `Cookies` do perfil
+em modo somente leitura e monta um perfil novo e minúsculo contendo só as
+linhas dos hosts do Inteli e dos provedores de SSO, além do `Local State`.
+
+Os valores dos cookies continuam criptografados pelo Chrome (a chave fica
+no `Local State` no Windows e no chaveiro do sistema no macOS/Linux), por
+isso o resultado é um perfil para o mesmo navegador e não um
+`storage_state`: o próprio navegador descriptografa os cookies ao abrir.
+"""
+
+import os
+import shutil
+import sqlite3
+from urllib.parse import quote
+
+from cache import DIRETORIO_CACHE
+
+# Configurações
+DIRETORIO_PERFIL_COOKIES = os.path.join(DIRETORIO_CACHE, 'perfil_cookies')
+HOSTS_COOKIES = (
+    'inteli.edu.br',
+    # Provedores de SSO usados no login
+    'google.com',
+    'accounts.google.com',
+    'microsoftonline.com',
+    'login.live.com',
+)
+CAMINHOS_COOKIES = (os.path.join('Network', 'Cookies'), 'Cookies')  # Chrome >= 96, antigo
+
+
+def _uri_somente_leitura(caminho):
+    """URI SQLite somente leitura que ignora travas e o journal (snapshot)."""
+    return 'file:' + quote(os.path.abspath(caminho).replace(os.sep, '/')) + '?mode=ro&immutable=1'
+
+
+def _filtro_hosts(hosts):
+    """Cláusula WHERE (e parâmetros) para os hosts e seus subdomínios."""
+    condicoes = []
+    parametros = []
+    for host in hosts:
+        condicoes.append("(host_key = ? OR host_key = ? OR host_key LIKE ?)")
+        parametros += [host, '.' + host, '%.' + host]
+    return ' OR '.join(condicoes), parametros
+
+
+def localizar_cookies(perfil_dir):
+    """Retorna o caminho relativo do banco de cookies no perfil, ou None."""
+    for relativo in CAMINHOS_COOKIES:
+        if os.path.isfile(os.path.join(perfil_dir, relativo)):
+            return relativo
+    return None
+
+
+def criar_perfil_cookies(user_data_dir, perfil_nome, hosts=HOSTS_COOKIES, destino=DIRETORIO_PERFIL_COOKIES):
+    """
+    Monta um perfil temporário só com os cookies dos `hosts`.
+
+    Returns:
+        tuple: (diretório de dados do perfil novo, número de cookies, bytes gravados).
+
+    Raises:
+        sqlite3.Error, OSError: Se o banco não puder ser lido; quem chama
+            deve voltar à cópia completa do perfil.
+    """
+    perfil_original = os.path.join(user_data_dir, perfil_nome)
+    relativo = localizar_cookies(perfil_original)
+    if relativo is None:
+        raise FileNotFoundError(f"Banco de cookies não encontrado em {perfil_original}")
+
+    temp_user_data = os.path.join(destino, 'User Data')
+    if os.path.exists(destino):
+        shutil.rmtree(destino)
+    banco_destino = os.path.join(temp_user_data, perfil_nome, relativo)
+    os.makedirs(os.path.dirname(banco_destino))
+
+    condicao, parametros = _filtro_hosts(hosts)
+    conexao = sqlite3.connect(banco_destino, uri=True)
+    try:
+        conexao.execute("ATTACH DATABASE ? AS origem", (_uri_somente_leitura(os.path.join(perfil_original, relativo)),))
+        # Mesmo esquema (tabelas `meta` e `cookies` e seus índices) do original
+        esquema = conexao.execute(
+            "SELECT sql FROM origem.sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' "
+            "ORDER BY type = 'index'"
+        ).fetchall()
+        for (sql,) in esquema:
+            conexao.execute(sql)
+        conexao.execute("INSERT INTO main.meta SELECT * FROM origem.meta")
+        cursor = conexao.execute(f"INSERT INTO main.cookies SELECT * FROM origem.cookies WHERE {condicao}", parametros)
+        total = cursor.rowcount
+        conexao.commit()
+        conexao.execute("DETACH DATABASE origem")
+    finally:
+        conexao.close()
+
+    local_state = os.path.join(user_data_dir, 'Local State')
+    if os.path.isfile(local_state):
+        shutil.copy2(local_state, os.path.join(temp_user_data, 'Local State'))
+
+    gravados = sum(os.path.getsize(os.path.join(raiz, nome))
+                   for raiz, _, nomes in os.walk(destino) for nome in nomes)
+    return temp_user_data, total, gravados
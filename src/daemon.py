@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Navegador "quente" mantido em segundo plano entre execuções.
+
+`iniciar_daemon` dispara um processo supervisor desacoplado do terminal que
+abre o navegador (Chrome, Edge ou Brave) com um endpoint CDP em localhost e
+grava o endereço em ARQUIVO_ESTADO. As coletas seguintes se conectam com
+`connect_over_cdp`, reaproveitam o contexto já autenticado e só abrem uma aba
+nova, sem pagar a inicialização do navegador nem o login outra vez.
+
+Cada uso renova o mtime do arquivo de estado (enquanto uma coleta está
+conectada, a cada INTERVALO_USO); o supervisor fecha o navegador depois de
+`ocioso` segundos sem uso, quando o navegador é fechado pelo
+usuário ou quando `parar_daemon` é chamado, e sempre remove o estado ao sair.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import signal
+import argparse
+import threading
+import subprocess
+import urllib.request
+
+from cache import DIRETORIO_CACHE
+
+# Configurações
+DIRETORIO_DAEMON = os.path.join(DIRETORIO_CACHE, 'daemon')
+ARQUIVO_ESTADO = os.path.join(DIRETORIO_DAEMON, 'estado.json')
+ARQUIVO_LOG = os.path.join(DIRETORIO_DAEMON, 'daemon.log')
+DIRETORIO_PERFIL = os.path.join(DIRETORIO_DAEMON, 'perfil')
+OCIOSO_PADRAO = 30 * 60       # segundos sem uso até fechar o navegador
+INTERVALO_VERIFICACAO = 5     # segundos entre as verificações do supervisor
+TIMEOUT_INICIO = 30           # segundos para o endpoint CDP responder
+TIMEOUT_PARADA = 10           # segundos para o navegador fechar sozinho
+TIMEOUT_SONDA = 0.5           # segundos para a sonda HTTP do endpoint
+INTERVALO_USO = 60            # segundos entre as renovações durante uma conexão
+INTERVALO_USO_MINIMO = 1      # piso das renovações, mesmo com `ocioso` muito curto
+
+
+def _porta_livre():
+    """Pede ao sistema uma porta TCP livre em localhost."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _versao_endpoint(porta, timeout=TIMEOUT_SONDA):
+    """Consulta /json/version do endpoint CDP; None se não responder."""
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{porta}/json/version', timeout=timeout) as r:
+            return json.load(r)
+    except (OSError, ValueError):
+        return None
+
+
+def _ler_estado():
+    try:
+        with open(ARQUIVO_ESTADO, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return None
+
+
+def _gravar_estado(estado):
+    """Grava o estado de forma atômica (arquivo temporário + rename)."""
+    os.makedirs(DIRETORIO_DAEMON, exist_ok=True)
+    temp_path = ARQUIVO_ESTADO + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(estado, f)
+    os.replace(temp_path, ARQUIVO_ESTADO)
+
+
+def _remover_estado():
+    try:
+        os.remove(ARQUIVO_ESTADO)
+    except OSError:
+        pass
+
+
+def estado_daemon():
+    """
+    Retorna o estado do daemon em execução, ou None.
+
+    Um arquivo de estado cujo endpoint não responde (daemon morto sem
+    limpeza) é descartado aqui mesmo.
+    """
+    estado = _ler_estado()
+    if estado is None:
+        return None
+    if _versao_endpoint(estado['porta']) is None:
+        _remover_estado()
+        return None
+    return estado
+
+
+def registrar_uso():
+    """Renova o prazo de ociosidade do daemon."""
+    try:
+        os.utime(ARQUIVO_ESTADO)
+    except OSError:
+        pass
+
+
+def _renovar_enquanto_conectado(browser, ocioso):
+    """
+    Renova o prazo de ociosidade em uma thread até o `browser` desconectar.
+
+    Uma coleta pode ficar conectada por mais que `ocioso` (ex: esperando o
+    login), e o supervisor não tem como saber que há um cliente CDP ativo.
+    """
+    desconectado = threading.Event()
+    browser.on('disconnected', lambda _: desconectado.set())
+    intervalo = max(INTERVALO_USO_MINIMO, min(INTERVALO_USO, ocioso / 2))
+
+    def renovar():
+        while not desconectado.wait(intervalo):
+            registrar_uso()
+
+    threading.Thread(target=renovar, name='daemon-uso', daemon=True).start()
+
+
+def conectar_daemon(p):
+    """
+    Conecta-se ao navegador do daemon, se houver um em execução.
+
+    Enquanto a conexão durar, o prazo de ociosidade é renovado
+    periodicamente (ver `_renovar_enquanto_conectado`).
+
+    Args:
+        p: Instância de `sync_playwright`.
+
+    Returns:
+        tuple: (browser, context) conectados via CDP, ou None.
+    """
+    estado = estado_daemon()
+    if estado is None:
+        return None
+    try:
+        browser = p.chromium.connect_over_cdp(estado['endpoint'])
+    except Exception:
+        return None
+    registrar_uso()
+    _renovar_enquanto_conectado(browser, estado.get('ocioso', OCIOSO_PADRAO))
+    context = browser.contexts[0] if browser.contexts else browser.new_context(viewport=None, locale='pt-BR')
+    return browser, context
+
+
+def _comando_navegador(navegador, porta, user_data_dir, perfil=None):
+    """Linha de comando do navegador com o endpoint CDP habilitado."""
+    comando = [
+        navegador['path'],
+        f'--remote-debugging-port={porta}',
+        f'--user-data-dir={user_data_dir}',
+        '--no-first-run',
+        '--no-default-browser-check',
+        '--start-maximized',
+    ]
+    if perfil:
+        comando.append(f'--profile-directory={perfil}')
+    return comando
+
+
+def servir(ocioso=OCIOSO_PADRAO):
+    """
+    Laço do processo supervisor (executado em segundo plano).
+
+    Abre o navegador, publica o estado e espera até: o navegador fechar,
+    o prazo de ociosidade acabar ou chegar um SIGTERM/SIGINT.
+    """
+    from coletar import detectar_navegador, obter_user_data_dir, encontrar_perfil_inteli, copiar_perfil_para_temp
+
+    navegador = detectar_navegador()
+    if not navegador or navegador['type'] == 'firefox':
+        return 1
+
+    user_data_dir = obter_user_data_dir(navegador['name'])
+    perfil = encontrar_perfil_inteli(user_data_dir) if user_data_dir else None
+    temp_user_data = None
+    if perfil:
+        temp_user_data = copiar_perfil_para_temp(user_data_dir, perfil, temp_base=DIRETORIO_PERFIL)
+    if not temp_user_data:
+        perfil = None
+        temp_user_data = os.path.join(DIRETORIO_PERFIL, 'User Data')
+        os.makedirs(temp_user_data, exist_ok=True)
+
+    porta = _porta_livre()
+    processo = subprocess.Popen(_comando_navegador(navegador, porta, temp_user_data, perfil),
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    parar = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: parar.set())
+    signal.signal(signal.SIGINT, lambda *_: parar.set())
+
+    try:
+        limite = time.monotonic() + TIMEOUT_INICIO
+        versao = None
+        while versao is None and processo.poll() is None and time.monotonic() < limite:
+            versao = _versao_endpoint(porta)
+            if versao is None:
+                parar.wait(0.1)
+        if versao is None:
+            return 1
+
+        _gravar_estado({
+            'pid': os.getpid(),
+            'pid_navegador': processo.pid,
+            'porta': porta,
+            'endpoint': versao['webSocketDebuggerUrl'],
+            'navegador': navegador['name'],
+            'perfil': perfil,
+            'ocioso': ocioso,
+            'inicio': time.time(),
+        })
+
+        while not parar.wait(INTERVALO_VERIFICACAO):
+            if processo.poll() is not None:
+                break
+            try:
+                ultimo_uso = os.stat(ARQUIVO_ESTADO).st_mtime
+            except OSError:
+                break  # estado removido: alguém pediu para parar
+            if time.time() - ultimo_uso > ocioso:
+                break
+    finally:
+        if processo.poll() is None:
+            processo.terminate()
+            try:
+                processo.wait(TIMEOUT_PARADA)
+            except subprocess.TimeoutExpired:
+                processo.kill()
+        _remover_estado()
+    return 0
+
+
+def iniciar_daemon(ocioso=OCIOSO_PADRAO):
+    """
+    Inicia o daemon em segundo plano (ou reaproveita o que já está rodando).
+
+    Returns:
+        dict: Estado do daemon, ou None se não foi possível iniciá-lo.
+    """
+    estado = estado_daemon()
+    if estado is not None:
+        return estado
+
+    os.makedirs(DIRETORIO_DAEMON, exist_ok=True)
+    opcoes = {}
+    if os.name == 'nt':
+        opcoes['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        opcoes['start_new_session'] = True
+
+    with open(ARQUIVO_LOG, 'ab') as log:
+        supervisor = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--servir', '--ocioso', str(ocioso)],
+            stdin=subprocess.DEVNULL, stdout=log, stderr=log, **opcoes
+        )
+
+    # O supervisor só publica o estado depois que o endpoint CDP responde
+    limite = time.monotonic() + TIMEOUT_INICIO + 5
+    while time.monotonic() < limite and supervisor.poll() is None:
+        estado = _ler_estado()
+        if estado is not None:
+            return estado
+        time.sleep(0.1)
+    return None
+
+
+def parar_daemon():
+    """
+    Encerra o daemon: sinaliza o supervisor, que fecha o navegador e
+    remove o estado.
+
+    Returns:
+        bool: True se havia um daemon em execução.
+    """
+    estado = _ler_estado()
+    if estado is None:
+        return False
+
+    # No Windows o SIGTERM finaliza o processo sem passar pelo `finally` do
+    # supervisor; lá o navegador é fechado e o supervisor percebe sozinho
+    alvo = estado['pid_navegador'] if os.name == 'nt' else estado['pid']
+    try:
+        os.kill(alvo, signal.SIGTERM)
+    except OSError:
+        pass
+
+    limite = time.monotonic() + TIMEOUT_PARADA + INTERVALO_VERIFICACAO
+    while time.monotonic() < limite and os.path.exists(ARQUIVO_ESTADO):
+        time.sleep(0.1)
+    _remover_estado()
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Supervisor do navegador em segundo plano')
+    parser.add_argument('--servir', action='store_true')
+    parser.add_argument('--ocioso', type=int, default=OCIOSO_PADRAO)
+    args = parser.parse_args()
+    if args.servir:
+        sys.exit(servir(args.ocioso))
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Espelhamento incremental de diretórios.
+
+Mantém uma cópia persistente de parte de um diretório (por exemplo, os
+arquivos de sessão de um perfil do Chrome) e, a cada sincronização, copia
+apenas o que mudou: arquivos com tamanho e mtime iguais são mantidos; com o
+mesmo tamanho e mtime diferente, o conteúdo é comparado por hash antes de
+copiar. Arquivos e pastas que sumiram da origem são removidos do espelho.
+
+A varredura (criação de pastas e remoções) é feita primeiro; a comparação
+e a cópia de cada arquivo rodam depois em um pool de threads, com o motor
+de `copia` (reflink / copy_file_range quando disponíveis).
+"""
+
+import os
+import time
+import shutil
+
+from cache import hash_arquivo
+from copia import WORKERS_COPIA, copiar_arquivo, executar_em_paralelo
+
+
+class RelatorioEspelho:
+    """
+    Contadores de uma sincronização.
+
+    Atributos:
+        bytes_copiados: Bytes efetivamente copiados.
+        bytes_ignorados: Bytes de arquivos que já estavam atualizados.
+        copiados: Número de arquivos copiados.
+        ignorados: Número de arquivos mantidos.
+        removidos: Arquivos/pastas removidos do espelho.
+        falhas: Arquivos que não puderam ser lidos (ex: bloqueados).
+        metodos: {método de cópia: número de arquivos} (ver `copia`).
+        duracao: Duração total em segundos.
+    """
+
+    __slots__ = ('bytes_copiados', 'bytes_ignorados', 'copiados', 'ignorados', 'removidos',
+                 'falhas', 'metodos', 'duracao')
+
+    def __init__(self):
+        self.bytes_copiados = 0
+        self.bytes_ignorados = 0
+        self.copiados = 0
+        self.ignorados = 0
+        self.removidos = 0
+        self.falhas = 0
+        self.metodos = {}
+        self.duracao = 0.0
+
+
+def _remover(caminho):
+    """Remove um arquivo, link ou diretório inteiro."""
+    if os.path.isdir(caminho) and not os.path.islink(caminho):
+        shutil.rmtree(caminho, ignore_errors=True)
+    else:
+        os.remove(caminho)
+
+
+def _atualizado(origem, destino, st_origem):
+    """
+    Verifica se `destino` já tem o mesmo conteúdo de `origem`.
+
+    Tamanho e mtime iguais bastam; com o mesmo tamanho e mtime diferente,
+    decide pelo hash (e alinha o mtime para a próxima vez ser só um `stat`).
+    """
+    try:
+        st_destino = os.stat(destino)
+    except OSError:
+        return False
+    if st_destino.st_size != st_origem.st_size:
+        return False
+    if st_destino.st_mtime_ns == st_origem.st_mtime_ns:
+        return True
+    if hash_arquivo(origem) != hash_arquivo(destino):
+        return False
+    os.utime(destino, ns=(st_origem.st_atime_ns, st_origem.st_mtime_ns))
+    return True
+
+
+def _sincronizar_arquivo(origem, destino, st_origem):
+    """
+    Copia o arquivo se o espelho estiver desatualizado (roda no pool).
+
+    Returns:
+        str: O método de cópia, None se já estava atualizado ou False se falhou.
+    """
+    try:
+        if os.path.isdir(destino) and not os.path.islink(destino):
+            _remover(destino)
+        if _atualizado(origem, destino, st_origem):
+            return None
+        return copiar_arquivo(origem, destino)
+    except OSError:
+        return False
+
+
+def _varrer_diretorio(origem, destino, relatorio, tarefas):
+    """Cria as pastas, propaga remoções e agenda os arquivos em `tarefas`."""
+    if os.path.lexists(destino) and not os.path.isdir(destino):
+        _remover(destino)
+    os.makedirs(destino, exist_ok=True)
+
+    vistos = set()
+    with os.scandir(origem) as entradas:
+        for entrada in entradas:
+            vistos.add(entrada.name)
+            alvo = os.path.join(destino, entrada.name)
+            try:
+                if entrada.is_dir(follow_symlinks=False):
+                    _varrer_diretorio(entrada.path, alvo, relatorio, tarefas)
+                elif entrada.is_file(follow_symlinks=False):
+                    tarefas.append((entrada.path, alvo, entrada.stat(follow_symlinks=False)))
+            except OSError:
+                relatorio.falhas += 1
+
+    # Propaga as remoções
+    for nome in os.listdir(destino):
+        if nome not in vistos:
+            try:
+                _remover(os.path.join(destino, nome))
+                relatorio.removidos += 1
+            except OSError:
+                relatorio.falhas += 1
+
+
+def espelhar(origem, destino, itens, relatorio=None, workers=WORKERS_COPIA):
+    """
+    Sincroniza os `itens` (nomes de arquivos ou pastas) de `origem` em `destino`.
+
+    Só os itens listados são tocados; o restante do espelho (ex: caches
+    criados pelo navegador) é preservado. Itens ausentes na origem são
+    removidos do espelho.
+
+    Args:
+        origem: Diretório de origem.
+        destino: Diretório do espelho (criado se necessário).
+        itens: Nomes relativos a sincronizar.
+        relatorio: RelatorioEspelho a acumular; se None, cria um novo.
+        workers: Threads de cópia.
+
+    Returns:
+        RelatorioEspelho: Os contadores (acumulados) da sincronização.
+    """
+    if relatorio is None:
+        relatorio = RelatorioEspelho()
+    inicio = time.perf_counter()
+    os.makedirs(destino, exist_ok=True)
+
+    tarefas = []
+    for item in itens:
+        caminho_origem = os.path.join(origem, item)
+        caminho_destino = os.path.join(destino, item)
+        try:
+            if os.path.isdir(caminho_origem):
+                _varrer_diretorio(caminho_origem, caminho_destino, relatorio, tarefas)
+            elif os.path.isfile(caminho_origem):
+                tarefas.append((caminho_origem, caminho_destino, os.stat(caminho_origem)))
+            elif os.path.lexists(caminho_destino):
+                _remover(caminho_destino)
+                relatorio.removidos += 1
+        except OSError:
+            relatorio.falhas += 1
+
+    metodos = executar_em_paralelo(_sincronizar_arquivo, tarefas, workers)
+    for (_, _, st_origem), metodo in zip(tarefas, metodos):
+        if metodo is False:
+            relatorio.falhas += 1
+        elif metodo is None:
+            relatorio.ignorados += 1
+            relatorio.bytes_ignorados += st_origem.st_size
+        else:
+            relatorio.copiados += 1
+            relatorio.bytes_copiados += st_origem.st_size
+            relatorio.metodos[metodo] = relatorio.metodos.get(metodo, 0) + 1
+
+    relatorio.duracao += time.perf_counter() - inicio
+    return relatorio
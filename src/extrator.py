@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+Módulo de extração das linhas do boletim do Adalove.
+
+Lê apenas as linhas `tr.styled-tr` da tabela de notas e devolve, para cada
+uma, a tupla `(nome, peso, nota)`. Há vários backends de parsing; todos
+produzem exatamente a mesma lista e o mais rápido instalado é escolhido
+automaticamente.
+"""
+
+import mmap
+import re
+from html.parser import HTMLParser
+
+# Ordem de preferência na escolha automática (do mais rápido ao mais lento)
+ORDEM_BACKENDS = ['selectolax', 'lxml', 'stdlib', 'bs4']
+
+CLASSE_LINHA = 'styled-tr'
+ROTULO_NOME = 'Atividades'
+ROTULO_PESO = 'Pontos'
+ROTULO_NOTA = 'Notas'
+
+
+def parse_float(text):
+    """Converte texto para float lidando com vírgulas e erros."""
+    try:
+        return float(text.replace(',', '.'))
+    except ValueError:
+        return None
+
+
+def eh_prova(nome):
+    """Retorna True se a atividade é a prova do módulo."""
+    return "Prova" in nome and "Módulo" in nome
+
+
+def montar_linha(nome_strings, peso_strings, nota_strings):
+    """
+    Monta a tupla de uma linha a partir das strings de cada célula.
+
+    As strings seguem a semântica de `stripped_strings` do BeautifulSoup:
+    já vêm sem espaços nas pontas e sem entradas vazias.
+    """
+    nome = " ".join(nome_strings)
+    peso = parse_float(peso_strings[-1]) if peso_strings else None
+    nota = parse_float(nota_strings[-1]) if nota_strings else None
+    return (nome, peso, nota)
+
+
+def _extrair_bs4(content):
+    """
+    Backend de referência: BeautifulSoup.
+
+    O `html.parser` não fecha sozinho `<td>` e `<tr>` sem tag de fechamento
+    (opcionais no HTML5) e aninha as linhas seguintes dentro da anterior;
+    por isso a árvore é montada pelo lxml quando ele está instalado.
+    """
+    from bs4 import BeautifulSoup
+
+    construtor = 'lxml' if backend_disponivel('lxml') else 'html.parser'
+    soup = BeautifulSoup(content, construtor)
+    linhas = []
+    for row in soup.find_all('tr', class_=CLASSE_LINHA):
+        celulas = []
+        for rotulo in (ROTULO_NOME, ROTULO_PESO, ROTULO_NOTA):
+            td = row.find('td', attrs={'data-label': rotulo})
+            celulas.append(list(td.stripped_strings) if td is not None else [])
+        linhas.append(montar_linha(*celulas))
+    return linhas
+
+
+def _extrair_lxml(content):
+    """Backend lxml: árvore em C consultada via XPath."""
+    import lxml.html
+
+    root = lxml.html.fromstring(content)
+    linhas = []
+    consulta = "//tr[contains(concat(' ', normalize-space(@class), ' '), ' %s ')]" % CLASSE_LINHA
+    for row in root.xpath(consulta):
+        celulas = []
+        for rotulo in (ROTULO_NOME, ROTULO_PESO, ROTULO_NOTA):
+            tds = row.xpath('.//td[@data-label=$rotulo]', rotulo=rotulo)
+            if tds:
+                textos = (t.strip() for t in tds[0].xpath('.//text()'))
+                celulas.append([t for t in textos if t])
+            else:
+                celulas.append([])
+        linhas.append(montar_linha(*celulas))
+    return linhas
+
+
+def _extrair_selectolax(content):
+    """Backend selectolax (Lexbor): o mais rápido quando instalado."""
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(content)
+    linhas = []
+    for row in tree.css('tr.' + CLASSE_LINHA):
+        celulas = []
+        for rotulo in (ROTULO_NOME, ROTULO_PESO, ROTULO_NOTA):
+            td = row.css_first('td[data-label="%s"]' % rotulo)
+            if td is not None:
+                texto = td.text(deep=True, separator='\x00', strip=True)
+                celulas.append([t for t in texto.split('\x00') if t])
+            else:
+                celulas.append([])
+        linhas.append(montar_linha(*celulas))
+    return linhas
+
+
+class _ColetorLinhas(HTMLParser):
+    """
+    Máquina de estados sobre o `HTMLParser` da stdlib.
+
+    Não monta árvore nenhuma: só acompanha se está dentro de uma linha
+    `styled-tr` e de uma célula com `data-label`, guardando o texto dessas
+    células. Todo o resto do documento é descartado assim que é lido.
+
+    Como no HTML5 `</td>` e `</tr>` são opcionais, a pilha de elementos de
+    tabela abertos fecha implicitamente a célula e a linha anteriores quando
+    chega um novo `<td>`/`<th>` ou `<tr>`, ou quando a seção (`</tbody>`,
+    `</thead>`, `</tfoot>`) ou a `</table>` termina, assim como fazem os
+    parsers dos navegadores.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.linhas = []
+        self._pilha = []          # tags de tabela abertas ('table', 'tr', 'td', 'th')
+        self._nivel_linha = 0     # tamanho da pilha com o <tr> da linha atual (0 = fora)
+        self._nivel_celula = 0    # tamanho da pilha com o <td> rotulado atual (0 = fora)
+        self._rotulo = None
+        self._celulas = None
+
+    def _fechar(self, tags, incluir):
+        """
+        Desempilha até o elemento mais próximo em `tags`, sem passar da
+        `<table>` atual. Com `incluir`, fecha também o próprio elemento, e se
+        ele não estiver aberto nada é fechado; sem `incluir`, um fragmento
+        sem `<table>` tem a pilha inteira fechada.
+        """
+        for posicao in range(len(self._pilha) - 1, -1, -1):
+            tag = self._pilha[posicao]
+            if tag in tags:
+                break
+            if tag == 'table':
+                return
+        else:
+            if incluir:
+                return
+            posicao = -1
+        alvo = posicao if incluir else posicao + 1
+        while len(self._pilha) > alvo:
+            self._desempilhar()
+
+    def _desempilhar(self):
+        nivel = len(self._pilha)
+        self._pilha.pop()
+        if nivel == self._nivel_celula:
+            self._nivel_celula = 0
+            self._rotulo = None
+        elif nivel == self._nivel_linha:
+            self.linhas.append(montar_linha(
+                self._celulas.get(ROTULO_NOME, []),
+                self._celulas.get(ROTULO_PESO, []),
+                self._celulas.get(ROTULO_NOTA, []),
+            ))
+            self._nivel_linha = 0
+            self._celulas = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'table':
+            self._pilha.append(tag)
+        elif tag == 'tr':
+            self._fechar(('table',), incluir=False)
+            self._pilha.append(tag)
+            if not self._nivel_linha:
+                classes = dict(attrs).get('class') or ''
+                if CLASSE_LINHA in classes.split():
+                    self._nivel_linha = len(self._pilha)
+                    self._celulas = {}
+        elif tag in ('td', 'th'):
+            self._fechar(('tr', 'table'), incluir=False)
+            self._pilha.append(tag)
+            if tag == 'td' and self._nivel_linha and not self._nivel_celula:
+                rotulo = dict(attrs).get('data-label')
+                # Assim como o `find` do bs4, vale a primeira célula de cada rótulo
+                if rotulo in (ROTULO_NOME, ROTULO_PESO, ROTULO_NOTA) and rotulo not in self._celulas:
+                    self._nivel_celula = len(self._pilha)
+                    self._rotulo = rotulo
+                    self._celulas[rotulo] = []
+
+    def handle_endtag(self, tag):
+        if tag in ('td', 'th'):
+            self._fechar(('td', 'th'), incluir=True)
+        elif tag == 'tr':
+            self._fechar(('tr',), incluir=True)
+        elif tag in ('tbody', 'thead', 'tfoot'):
+            self._fechar(('table',), incluir=False)
+        elif tag == 'table':
+            self._fechar(('table',), incluir=True)
+
+    def handle_data(self, data):
+        if self._rotulo is not None:
+            texto = data.strip()
+            if texto:
+                self._celulas[self._rotulo].append(texto)
+
+    def close(self):
+        super().close()
+        while self._pilha:
+            self._desempilhar()
+
+
+def _extrair_stdlib(content):
+    """Backend sem dependências: `HTMLParser` da stdlib em modo streaming."""
+    coletor = _ColetorLinhas()
+    coletor.feed(content)
+    coletor.close()
+    return coletor.linhas
+
+
+BACKENDS = {
+    'bs4': _extrair_bs4,
+    'lxml': _extrair_lxml,
+    'selectolax': _extrair_selectolax,
+    'stdlib': _extrair_stdlib,
+}
+
+# Módulo que precisa estar instalado para cada backend
+_MODULOS_BACKEND = {
+    'bs4': 'bs4',
+    'lxml': 'lxml.html',
+    'selectolax': 'selectolax.lexbor',
+    'stdlib': None,
+}
+
+_backend_escolhido = None
+
+
+def backend_disponivel(nome):
+    """Retorna True se as dependências do backend estão instaladas."""
+    modulo = _MODULOS_BACKEND[nome]
+    if modulo is None:
+        return True
+    try:
+        __import__(modulo)
+    except ImportError:
+        return False
+    return True
+
+
+def escolher_backend():
+    """Retorna o nome do backend mais rápido instalado (resultado memorizado)."""
+    global _backend_escolhido
+    if _backend_escolhido is None:
+        for nome in ORDEM_BACKENDS:
+            if backend_disponivel(nome):
+                _backend_escolhido = nome
+                break
+    return _backend_escolhido
+
+
+def extrair_linhas(content, backend=None):
+    """
+    Extrai as linhas da tabela de notas.
+
+    Args:
+        content: HTML da página (str).
+        backend: Nome do backend ('selectolax', 'lxml', 'stdlib' ou 'bs4').
+            Se None, usa o mais rápido instalado.
+
+    Returns:
+        list: Tuplas `(nome, peso, nota)`; peso e nota são float ou None.
+    """
+    if backend is None:
+        backend = escolher_backend()
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend de parsing desconhecido: {backend}")
+    return BACKENDS[backend](content)
+
+
+# Abertura de uma linha da tabela: `<tr ... class="... styled-tr ...">`, em
+# qualquer caixa e com o valor entre aspas ou sem elas (`class=styled-tr`).
+# A classe sozinha não basta, porque também aparece no CSS e nos scripts.
+_RE_INICIO_LINHA = re.compile(
+    rb'<tr\b[^>]*?\sclass\s*=\s*(?:["\'](?:[^"\'>]*?\s)?)?'
+    + re.escape(CLASSE_LINHA.encode()) + rb'(?![\w-])',
+    re.IGNORECASE
+)
+_RE_TABELA = re.compile(rb'<(/?)table\b', re.IGNORECASE)
+_MARCADOR = CLASSE_LINHA.encode()
+_ABRE_WRAPPER = b'<html><body><table><tbody>'
+_FECHA_WRAPPER = b'</tbody></table></body></html>'
+
+
+def _ultima_linha(mm):
+    """Retorna a posição do `<tr` da última linha `styled-tr` ou -1."""
+    fim = len(mm)
+    while True:
+        pos = mm.rfind(_MARCADOR, 0, fim)
+        if pos == -1:
+            return -1
+        inicio_tag = mm.rfind(b'<', 0, pos)
+        if inicio_tag != -1 and _RE_INICIO_LINHA.match(mm, inicio_tag):
+            return inicio_tag
+        fim = pos
+
+
+def _fim_tabela(mm, inicio):
+    """Retorna a posição do `</table>` que fecha a tabela aberta em `inicio`."""
+    profundidade = 0
+    for m in _RE_TABELA.finditer(mm, inicio):
+        if not m.group(1):
+            profundidade += 1  # tabela aninhada dentro de uma célula
+        elif profundidade:
+            profundidade -= 1
+        else:
+            return m.start()
+    return len(mm)
+
+
+def recortar_tabela(file_path):
+    """
+    Recorta do arquivo apenas a região da tabela de notas.
+
+    O arquivo é mapeado em memória e varrido byte a byte em busca da primeira
+    e da última linha `styled-tr`; só esse trecho (até o `</table>` seguinte)
+    é copiado e decodificado, envolto em um wrapper mínimo de tabela. Scripts,
+    CSS e o markup do MUI ao redor nunca chegam ao parser.
+
+    Returns:
+        str: O HTML recortado, ou None se o arquivo não tiver linhas.
+    """
+    with open(file_path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Arquivo vazio não pode ser mapeado
+            return None
+
+        with mm:
+            primeira = _RE_INICIO_LINHA.search(mm)
+            if primeira is None:
+                return None
+            inicio = primeira.start()
+            fim = _fim_tabela(mm, _ultima_linha(mm))
+            trecho = mm[inicio:fim]
+
+    return (_ABRE_WRAPPER + trecho + _FECHA_WRAPPER).decode('utf-8')
+
+
+def extrair_linhas_arquivo(file_path, backend=None):
+    """
+    Extrai as linhas da tabela de notas direto de um arquivo HTML.
+
+    Usa `recortar_tabela`, então o custo acompanha o tamanho da tabela e não
+    o da página salva. O recorte é uma busca em bytes; se ele não render
+    nenhuma linha, o documento inteiro é analisado, para que o resultado seja
+    sempre o mesmo de `extrair_linhas` sobre o arquivo completo.
+
+    Returns:
+        list: Tuplas `(nome, peso, nota)`, vazia se não houver linhas.
+    """
+    trecho = recortar_tabela(file_path)
+    linhas = extrair_linhas(trecho, backend) if trecho is not None else []
+    if linhas:
+        return linhas
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        documento = f.read()
+    if CLASSE_LINHA not in documento:
+        return []
+    return extrair_linhas(documento, backend)
+
+
+# Chaves procuradas nos objetos JSON da API de notas (comparadas sem caixa),
+# em ordem de prioridade: com 'weight' e 'points' no mesmo objeto, vale 'weight'
+CHAVES_NOME = ('name', 'nome', 'title', 'titulo', 'activityname', 'atividade')
+CHAVES_PESO = ('weight', 'peso', 'points', 'pontos')
+CHAVES_NOTA = ('grade', 'nota', 'score')
+
+
+def _valor_numerico(valor):
+    """Converte número ou texto ('8,5') em float; qualquer outra coisa vira None."""
+    if isinstance(valor, bool):
+        return None
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    if isinstance(valor, str):
+        return parse_float(valor.strip())
+    return None
+
+
+def _primeira_chave(item, chaves):
+    """Retorna a chave de `item` (sem caixa) que vem primeiro em `chaves`."""
+    presentes = {chave.lower(): chave for chave in item}
+    for chave in chaves:
+        if chave in presentes:
+            return presentes[chave]
+    return None
+
+
+def _linhas_de_lista(itens):
+    """
+    Tenta ler uma lista de objetos JSON como linhas do boletim.
+
+    Uma lista em que nenhuma nota é numérica não é aceita: mais provavelmente
+    é outra coisa (ex: conceitos ou status), e a coleta volta à tabela.
+    """
+    linhas = []
+    for item in itens:
+        if not isinstance(item, dict):
+            return None
+        chave_nome = _primeira_chave(item, CHAVES_NOME)
+        chave_peso = _primeira_chave(item, CHAVES_PESO)
+        chave_nota = _primeira_chave(item, CHAVES_NOTA)
+        if chave_nome is None or chave_peso is None or chave_nota is None:
+            return None
+        nome = " ".join(str(item[chave_nome]).split())
+        linhas.append((nome, _valor_numerico(item[chave_peso]), _valor_numerico(item[chave_nota])))
+    if all(nota is None for _, _, nota in linhas):
+        return None
+    return linhas
+
+
+def linhas_de_json(dados):
+    """
+    Procura, em um payload JSON, a lista de atividades do boletim.
+
+    O formato exato da API do Adalove não é documentado, então a busca é
+    estrutural: a primeira lista (busca em largura) cujos objetos têm nome,
+    peso e nota, segundo CHAVES_NOME, CHAVES_PESO e CHAVES_NOTA.
+
+    Returns:
+        list: Tuplas `(nome, peso, nota)`, ou None se nada foi reconhecido.
+    """
+    pendentes = [dados]
+    while pendentes:
+        atual = pendentes.pop(0)
+        if isinstance(atual, list):
+            if atual:
+                linhas = _linhas_de_lista(atual)
+                if linhas:
+                    return linhas
+            pendentes.extend(v for v in atual if isinstance(v, (list, dict)))
+        elif isinstance(atual, dict):
+            pendentes.extend(v for v in atual.values() if isinstance(v, (list, dict)))
+    return None
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Processamento em lote de boletins salvos.
+
+Analisa todos os arquivos HTML de um diretório em um pool de processos,
+aplica a mesma nota simulada a todas as atividades pendentes e grava um
+resultado por arquivo em um resumo JSONL ou CSV. Falhas de um arquivo
+(por exemplo, "Nenhuma atividade encontrada") ficam registradas no resumo
+sem interromper o lote.
+"""
+
+import os
+import csv
+import json
+import time
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+
+from extrator import extrair_linhas_arquivo
+from motor import MEDIA_ALVO, Resultado, atividades_de_linhas, consolidar, calcular
+
+EXTENSOES_HTML = ('.html', '.htm')
+CAMPOS_RESUMO = ['arquivo', 'ok', 'erro', 'atividades', 'pendentes'] + list(Resultado.__slots__)
+
+
+def listar_arquivos(diretorio):
+    """Lista os arquivos HTML do diretório, em ordem alfabética."""
+    return sorted(
+        os.path.join(diretorio, nome)
+        for nome in os.listdir(diretorio)
+        if nome.lower().endswith(EXTENSOES_HTML)
+    )
+
+
+def processar_arquivo(file_path, nota_pendentes=MEDIA_ALVO, media_alvo=MEDIA_ALVO):
+    """
+    Analisa e calcula um único boletim, sem nenhuma interação.
+
+    Returns:
+        dict: Uma linha do resumo. Em caso de falha, `ok` é False e `erro`
+        traz a mensagem; os campos do resultado ficam vazios.
+    """
+    registro = dict.fromkeys(CAMPOS_RESUMO)
+    registro['arquivo'] = file_path
+    registro['ok'] = False
+
+    # Qualquer falha (arquivo ilegível, HTML malformado, boletim inválido)
+    # vira o erro do registro, sem derrubar o processo nem o lote
+    try:
+        linhas = extrair_linhas_arquivo(file_path)
+        if not linhas:
+            registro['erro'] = "Nenhuma atividade encontrada"
+            return registro
+        boletim = consolidar(atividades_de_linhas(linhas))
+        resultado = calcular(boletim, nota_pendentes, media_alvo)
+    except Exception as e:
+        registro['erro'] = str(e) or type(e).__name__
+        return registro
+
+    registro.update(resultado.como_dict())
+    registro['ok'] = True
+    registro['atividades'] = len(linhas)
+    registro['pendentes'] = len(boletim.pendentes)
+    return registro
+
+
+def gravar_resumo(registros, saida):
+    """Grava o resumo em CSV (extensão .csv) ou JSON-lines (qualquer outra)."""
+    with open(saida, 'w', encoding='utf-8', newline='') as f:
+        if saida.lower().endswith('.csv'):
+            writer = csv.DictWriter(f, fieldnames=CAMPOS_RESUMO)
+            writer.writeheader()
+            writer.writerows(registros)
+        else:
+            for registro in registros:
+                f.write(json.dumps(registro, ensure_ascii=False))
+                f.write('\n')
+
+
+def processar_diretorio(diretorio, saida=None, workers=None, chunksize=None,
+                        nota_pendentes=MEDIA_ALVO, media_alvo=MEDIA_ALVO):
+    """
+    Processa todos os boletins de um diretório em paralelo.
+
+    Args:
+        diretorio: Diretório com os arquivos HTML.
+        saida: Caminho do resumo (.jsonl ou .csv). Se None, não grava nada.
+        workers: Número de processos (pelo menos 1). Se None, usa o número de CPUs.
+        chunksize: Arquivos enviados a cada processo por vez. Se None,
+            divide a lista em cerca de 4 lotes por processo.
+        nota_pendentes: Nota assumida para as atividades pendentes.
+        media_alvo: Média final desejada.
+
+    Returns:
+        tuple: (lista de registros, duração em segundos).
+
+    Raises:
+        ValueError: Se `workers` ou `chunksize` for menor que 1.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers precisa ser pelo menos 1")
+    if chunksize is not None and chunksize < 1:
+        raise ValueError("chunksize precisa ser pelo menos 1")
+
+    arquivos = listar_arquivos(diretorio)
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(arquivos) // (workers * 4))
+
+    inicio = time.perf_counter()
+    if workers == 1:
+        registros = [processar_arquivo(a, nota_pendentes, media_alvo) for a in arquivos]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            registros = list(executor.map(
+                processar_arquivo, arquivos,
+                repeat(nota_pendentes), repeat(media_alvo),
+                chunksize=chunksize
+            ))
+    duracao = time.perf_counter() - inicio
+
+    if saida:
+        gravar_resumo(registros, saida)
+
+    return registros, duracao
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Estimativa por Monte Carlo da probabilidade de atingir a média alvo.
+
+Cada atividade pendente e a prova são modeladas como normais limitadas a
+[0, 10] (valores fora do intervalo são cortados), com parâmetros informados
+pelo usuário ou ajustados a partir das notas já lançadas. As amostras são
+geradas em blocos vetorizados com NumPy, cada bloco com a sua semente filha
+derivada de uma única semente; para contagens muito grandes, os blocos são
+divididos entre processos. Como as sementes são por bloco, o resultado de
+uma semente é o mesmo com qualquer número de processos.
+"""
+
+import os
+import sys
+import math
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+# Instalação automática de dependências
+def install_dependencies():
+    """Instala o NumPy automaticamente se não estiver presente."""
+    try:
+        __import__('numpy')
+    except ImportError:
+        print("Instalando dependências: numpy...")
+        subprocess.check_call([sys.executable, '-m', 'pip', 'install', '-q', 'numpy'])
+        print("Dependências instaladas! Reiniciando...\n")
+        os.execv(sys.executable, [sys.executable] + sys.argv)
+
+install_dependencies()
+
+import numpy as np
+
+from motor import MEDIA_ALVO, NOTA_MAXIMA
+
+# Configurações
+AMOSTRAS_PADRAO = 1_000_000
+TAMANHO_BLOCO = 200_000      # amostras por bloco (limita a memória usada)
+DISTRIBUICAO_PADRAO = (7.0, 1.5)
+DESVIO_MINIMO = 0.5
+Z_95 = 1.959963984540054
+
+
+class Estimativa:
+    """
+    Resultado da simulação.
+
+    Atributos:
+        probabilidade: Fração das amostras que atingiram a média alvo.
+        intervalo: Intervalo de confiança de 95% (Wilson) como (inf, sup).
+        erro_padrao: Erro padrão da estimativa.
+        amostras: Número total de amostras.
+        convergencia: Lista de (amostras acumuladas, estimativa) por bloco.
+        seed: Semente usada.
+    """
+
+    __slots__ = ('probabilidade', 'intervalo', 'erro_padrao', 'amostras', 'convergencia', 'seed')
+
+    def __init__(self, probabilidade, intervalo, erro_padrao, amostras, convergencia, seed):
+        self.probabilidade = probabilidade
+        self.intervalo = intervalo
+        self.erro_padrao = erro_padrao
+        self.amostras = amostras
+        self.convergencia = convergencia
+        self.seed = seed
+
+
+def ajustar_distribuicao(atividades):
+    """
+    Ajusta (média, desvio) às notas já lançadas do boletim.
+
+    Com menos de duas notas lançadas, usa DISTRIBUICAO_PADRAO.
+    """
+    notas = [atv.nota for atv in atividades if not atv.prova and atv.nota is not None]
+    if len(notas) < 2:
+        return DISTRIBUICAO_PADRAO
+    return (float(np.mean(notas)), max(float(np.std(notas, ddof=1)), DESVIO_MINIMO))
+
+
+def intervalo_wilson(acertos, total, z=Z_95):
+    """Intervalo de confiança de Wilson para uma proporção."""
+    if total == 0:
+        return (0.0, 1.0)
+    p = acertos / total
+    denominador = 1 + z * z / total
+    centro = (p + z * z / (2 * total)) / denominador
+    margem = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denominador
+    return (max(0.0, centro - margem), min(1.0, centro + margem))
+
+
+def _amostrar(rng, media, desvio, tamanho):
+    """Amostras de uma normal, cortadas ao intervalo [0, NOTA_MAXIMA]."""
+    return np.clip(rng.normal(media, desvio, tamanho), 0.0, NOTA_MAXIMA)
+
+
+def _tamanhos_blocos(amostras, tamanho_bloco):
+    """Tamanho de cada bloco em que `amostras` é dividido por `_simular`."""
+    tamanhos = [tamanho_bloco] * (amostras // tamanho_bloco)
+    if amostras % tamanho_bloco:
+        tamanhos.append(amostras % tamanho_bloco)
+    return tamanhos
+
+
+def _simular(parametros, blocos):
+    """
+    Executa a simulação de uma sequência de blocos.
+
+    Args:
+        parametros: Tupla montada por `estimar_probabilidade`.
+        blocos: Lista de (semente do bloco, tamanho do bloco).
+
+    Returns:
+        list: Número de acertos de cada bloco, em ordem.
+    """
+    soma_lancada, limiar, pesos, medias, desvios, peso_prova, dist_prova = parametros
+    pesos = np.asarray(pesos)
+    medias = np.asarray(medias)
+    desvios = np.asarray(desvios)
+
+    acertos = []
+    for semente, n in blocos:
+        rng = np.random.default_rng(semente)
+        soma = np.full(n, soma_lancada)
+        if len(pesos):
+            soma += _amostrar(rng, medias, desvios, (n, len(pesos))) @ pesos
+        soma += _amostrar(rng, dist_prova[0], dist_prova[1], n) * peso_prova
+        acertos.append(int(np.count_nonzero(soma >= limiar)))
+    return acertos
+
+
+def estimar_probabilidade(boletim, dist_pendentes=None, dist_prova=None, media_alvo=MEDIA_ALVO,
+                          amostras=AMOSTRAS_PADRAO, seed=None, workers=1,
+                          tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Estima a probabilidade de fechar o módulo com a média alvo.
+
+    Args:
+        boletim: Boletim retornado por `motor.consolidar`.
+        dist_pendentes: (média, desvio) comum a todas as pendentes, ou uma
+            lista com um par por pendente. Se None, usa DISTRIBUICAO_PADRAO.
+        dist_prova: (média, desvio) da nota da prova. Se None, usa DISTRIBUICAO_PADRAO.
+        media_alvo: Média final desejada.
+        amostras: Número total de amostras.
+        seed: Semente do gerador (None = aleatória, mas registrada no resultado).
+            A mesma semente dá o mesmo resultado com qualquer `workers`.
+        workers: Número de processos; 1 roda tudo no processo atual.
+        tamanho_bloco: Amostras por bloco vetorizado.
+
+    Returns:
+        Estimativa: Probabilidade, intervalo de confiança e convergência.
+    """
+    dist_pendentes = dist_pendentes or DISTRIBUICAO_PADRAO
+    dist_prova = dist_prova or DISTRIBUICAO_PADRAO
+
+    n_pendentes = len(boletim.pendentes)
+    if n_pendentes and isinstance(dist_pendentes[0], (int, float)):
+        dist_pendentes = [dist_pendentes] * n_pendentes
+    if len(dist_pendentes) != n_pendentes and n_pendentes:
+        raise ValueError("É preciso uma distribuição para cada atividade pendente.")
+
+    medias = [d[0] for d in dist_pendentes] if n_pendentes else []
+    desvios = [d[1] for d in dist_pendentes] if n_pendentes else []
+    parametros = (boletim.soma_lancada, media_alvo * boletim.peso_total, list(boletim.pesos_pendentes),
+                  medias, desvios, boletim.peso_prova, tuple(dist_prova))
+
+    # Uma semente filha por bloco: a divisão entre processos não muda as amostras
+    semente = np.random.SeedSequence(seed)
+    tamanhos = _tamanhos_blocos(amostras, tamanho_bloco)
+    blocos = list(zip(semente.spawn(len(tamanhos)), tamanhos))
+    workers = max(1, min(workers, len(blocos)))
+
+    if workers == 1:
+        acertos_blocos = _simular(parametros, blocos)
+    else:
+        # Cada processo recebe uma sequência contígua de blocos
+        fatias = [len(blocos) // workers + (1 if i < len(blocos) % workers else 0) for i in range(workers)]
+        inicios = [sum(fatias[:i]) for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_simular, parametros, blocos[inicio:inicio + fatia])
+                for inicio, fatia in zip(inicios, fatias)
+            ]
+            acertos_blocos = [a for future in futures for a in future.result()]
+
+    convergencia = []
+    acumulado = 0
+    total = 0
+    for acertos, tamanho in zip(acertos_blocos, tamanhos):
+        acumulado += acertos
+        total += tamanho
+        convergencia.append((total, acumulado / total))
+
+    p = acumulado / total if total else 0.0
+    erro_padrao = math.sqrt(p * (1 - p) / total) if total else 0.0
+    return Estimativa(p, intervalo_wilson(acumulado, total), erro_padrao, total,
+                      convergencia, semente.entropy)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Motor de cálculo das notas, sem nenhuma dependência de interface.
+
+Recebe as atividades do boletim e devolve um `Resultado` com a soma
+ponderada, os pesos, a nota necessária na prova e a situação do aluno.
+Nada aqui imprime, limpa a tela ou pergunta algo ao usuário, então as
+funções podem ser chamadas em loop ou a partir de outros módulos.
+"""
+
+from array import array
+
+from extrator import eh_prova
+
+MEDIA_ALVO = 7.0
+NOTA_MAXIMA = 10.0
+
+# Situações possíveis de um Resultado
+STATUS_APROVADO = 'aprovado'      # média alvo já garantida
+STATUS_META = 'meta'              # alcançável com nota entre 0 e 10 na prova
+STATUS_IMPOSSIVEL = 'impossivel'  # exigiria mais que 10 na prova
+STATUS_SEM_PROVA = 'sem_prova'    # boletim sem 'Prova de Módulo'
+
+
+class Atividade:
+    """
+    Uma linha do boletim. `nota` é None enquanto a atividade está pendente;
+    um peso ausente (None) conta como 0.
+    """
+
+    __slots__ = ('nome', 'peso', 'nota', 'prova')
+
+    def __init__(self, nome, peso, nota, prova=False):
+        self.nome = nome
+        self.peso = peso if peso is not None else 0.0
+        self.nota = nota
+        self.prova = prova
+
+    def __repr__(self):
+        return f"Atividade({self.nome!r}, peso={self.peso}, nota={self.nota}, prova={self.prova})"
+
+
+class Boletim:
+    """
+    Boletim já consolidado, pronto para ser simulado várias vezes.
+
+    Atributos:
+        soma_lancada: Soma de nota × peso das atividades com nota lançada.
+        peso_total: Soma dos pesos de todas as atividades (inclusive a prova).
+        peso_prova: Peso da prova do módulo (0.0 se não houver).
+        pendentes: Atividades sem nota (exceto a prova).
+        pesos_pendentes: Pesos das pendentes, em um `array('d')` compacto.
+    """
+
+    __slots__ = ('soma_lancada', 'peso_total', 'peso_prova', 'pendentes', 'pesos_pendentes')
+
+    def __init__(self, soma_lancada, peso_total, peso_prova, pendentes):
+        self.soma_lancada = soma_lancada
+        self.peso_total = peso_total
+        self.peso_prova = peso_prova
+        self.pendentes = pendentes
+        self.pesos_pendentes = array('d', (atv.peso for atv in pendentes))
+
+
+class Resultado:
+    """
+    Resultado do cálculo para um cenário de notas pendentes.
+
+    Atributos:
+        soma_ponderada: Soma ponderada incluindo as notas simuladas.
+        peso_total: Soma dos pesos de todas as atividades.
+        peso_prova: Peso da prova do módulo.
+        nota_necessaria: Nota mínima na prova para a média alvo (None sem prova).
+        media_maxima: Média final tirando 10 na prova (None sem prova).
+        media_projetada: Média com a soma atual, sem contar a prova.
+        media_alvo: Média usada como meta.
+        status: Uma das constantes STATUS_*.
+    """
+
+    __slots__ = ('soma_ponderada', 'peso_total', 'peso_prova', 'nota_necessaria',
+                 'media_maxima', 'media_projetada', 'media_alvo', 'status')
+
+    def __init__(self, soma_ponderada, peso_total, peso_prova, nota_necessaria,
+                 media_maxima, media_projetada, media_alvo, status):
+        self.soma_ponderada = soma_ponderada
+        self.peso_total = peso_total
+        self.peso_prova = peso_prova
+        self.nota_necessaria = nota_necessaria
+        self.media_maxima = media_maxima
+        self.media_projetada = media_projetada
+        self.media_alvo = media_alvo
+        self.status = status
+
+    def como_dict(self):
+        """Retorna os campos do resultado em um dict (útil para JSON/CSV)."""
+        return {campo: getattr(self, campo) for campo in self.__slots__}
+
+    def __repr__(self):
+        return f"Resultado(status={self.status!r}, nota_necessaria={self.nota_necessaria})"
+
+
+def atividades_de_linhas(linhas):
+    """Converte as tuplas `(nome, peso, nota)` do extrator em Atividades."""
+    return [Atividade(nome, peso, nota, eh_prova(nome)) for nome, peso, nota in linhas]
+
+
+def consolidar(atividades):
+    """
+    Consolida as atividades em um Boletim.
+
+    Pesos ausentes contam como 0. Se houver mais de uma prova, vale a última.
+    """
+    soma_lancada = 0.0
+    peso_total = 0.0
+    peso_prova = 0.0
+    pendentes = []
+
+    for atv in atividades:
+        peso_total += atv.peso
+
+        if atv.prova:
+            peso_prova = atv.peso
+        elif atv.nota is not None:
+            soma_lancada += atv.nota * atv.peso
+        else:
+            pendentes.append(atv)
+
+    return Boletim(soma_lancada, peso_total, peso_prova, pendentes)
+
+
+def calcular(boletim, notas_pendentes=MEDIA_ALVO, media_alvo=MEDIA_ALVO):
+    """
+    Calcula a nota necessária na prova para um cenário.
+
+    Args:
+        boletim: Boletim retornado por `consolidar`.
+        notas_pendentes: Nota assumida para todas as pendentes (número) ou
+            uma sequência com uma nota por pendente, na ordem de `boletim.pendentes`.
+        media_alvo: Média final desejada.
+
+    Returns:
+        Resultado: O resultado do cálculo.
+    """
+    soma = boletim.soma_lancada
+    pesos = boletim.pesos_pendentes
+    if isinstance(notas_pendentes, (int, float)):
+        soma += notas_pendentes * sum(pesos)
+    else:
+        if len(notas_pendentes) != len(pesos):
+            raise ValueError("É preciso uma nota para cada atividade pendente.")
+        soma += sum(nota * peso for nota, peso in zip(notas_pendentes, pesos))
+
+    peso_total = boletim.peso_total
+    peso_prova = boletim.peso_prova
+    media_projetada = soma / peso_total if peso_total else None
+
+    if peso_prova == 0:
+        return Resultado(soma, peso_total, peso_prova, None, None,
+                         media_projetada, media_alvo, STATUS_SEM_PROVA)
+
+    nota_necessaria = (media_alvo * peso_total - soma) / peso_prova
+    media_maxima = (soma + NOTA_MAXIMA * peso_prova) / peso_total
+
+    if nota_necessaria <= 0:
+        status = STATUS_APROVADO
+    elif nota_necessaria > NOTA_MAXIMA:
+        status = STATUS_IMPOSSIVEL
+    else:
+        status = STATUS_META
+
+    return Resultado(soma, peso_total, peso_prova, nota_necessaria, media_maxima,
+                     media_projetada, media_alvo, status)
+
+
+def calcular_linhas(linhas, notas_pendentes=MEDIA_ALVO, media_alvo=MEDIA_ALVO):
+    """Atalho: extrai, consolida e calcula a partir das linhas do extrator."""
+    return calcular(consolidar(atividades_de_linhas(linhas)), notas_pendentes, media_alvo)
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Detecção do navegador instalado, com cache por usuário.
+
+A varredura completa testa vários caminhos por navegador (no Windows, em
+`%ProgramFiles%` e `%LocalAppData%`, que podem estar em perfis
+redirecionados pela rede). O navegador encontrado, com a versão, fica
+guardado em um arquivo de estado junto com o tamanho e o mtime do
+executável; nas execuções seguintes a detecção custa um único `stat`.
+A varredura só é refeita se o executável mudou ou sumiu (atualização,
+desinstalação) ou se o cache for descartado.
+"""
+
+import os
+import re
+import json
+import platform
+import plistlib
+import subprocess
+
+from cache import DIRETORIO_CACHE
+
+# Configurações
+ARQUIVO_CACHE_NAVEGADOR = os.path.join(DIRETORIO_CACHE, 'navegador.json')
+VERSAO_FORMATO = 1
+TIMEOUT_VERSAO = 5  # segundos para `navegador --version` responder
+
+PADRAO_VERSAO = re.compile(r'\d+(?:\.\d+)+')
+
+ORIGEM_CACHE = 'cache'
+ORIGEM_VARREDURA = 'varredura'
+
+# Prioridade: Chrome > Brave > Edge > Firefox (ordem do dicionário)
+NAVEGADORES = {
+    'chrome': {
+        'channel': 'chrome',
+        'paths': {
+            'linux': [
+                '/usr/bin/google-chrome',
+                '/usr/bin/google-chrome-stable',
+                '/snap/bin/chromium',
+                '/usr/bin/chromium',
+                '/usr/bin/chromium-browser',
+            ],
+            'darwin': [
+                '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+            ],
+            'windows': [
+                os.path.expandvars(r'%ProgramFiles%\Google\Chrome\Application\chrome.exe'),
+                os.path.expandvars(r'%ProgramFiles(x86)%\Google\Chrome\Application\chrome.exe'),
+                os.path.expandvars(r'%LocalAppData%\Google\Chrome\Application\chrome.exe'),
+            ],
+        }
+    },
+    'brave': {
+        'channel': 'chrome',
+        'executable_path': True,
+        'paths': {
+            'linux': [
+                '/usr/bin/brave-browser',
+                '/usr/bin/brave',
+                '/snap/bin/brave',
+                '/opt/brave.com/brave/brave-browser',
+            ],
+            'darwin': [
+                '/Applications/Brave Browser.app/Contents/MacOS/Brave Browser',
+            ],
+            'windows': [
+                os.path.expandvars(r'%ProgramFiles%\BraveSoftware\Brave-Browser\Application\brave.exe'),
+                os.path.expandvars(r'%ProgramFiles(x86)%\BraveSoftware\Brave-Browser\Application\brave.exe'),
+                os.path.expandvars(r'%LocalAppData%\BraveSoftware\Brave-Browser\Application\brave.exe'),
+            ],
+        }
+    },
+    'edge': {
+        'channel': 'msedge',
+        'paths': {
+            'linux': [
+                '/usr/bin/microsoft-edge',
+                '/usr/bin/microsoft-edge-stable',
+            ],
+            'darwin': [
+                '/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge',
+            ],
+            'windows': [
+                os.path.expandvars(r'%ProgramFiles%\Microsoft\Edge\Application\msedge.exe'),
+                os.path.expandvars(r'%ProgramFiles(x86)%\Microsoft\Edge\Application\msedge.exe'),
+            ],
+        }
+    },
+    'firefox': {
+        'channel': None,
+        'type': 'firefox',
+        'paths': {
+            'linux': [
+                '/usr/bin/firefox',
+                '/snap/bin/firefox',
+            ],
+            'darwin': [
+                '/Applications/Firefox.app/Contents/MacOS/firefox',
+            ],
+            'windows': [
+                os.path.expandvars(r'%ProgramFiles%\Mozilla Firefox\firefox.exe'),
+                os.path.expandvars(r'%ProgramFiles(x86)%\Mozilla Firefox\firefox.exe'),
+            ],
+        }
+    },
+}
+
+
+def _sistema():
+    """Normaliza o nome do sistema para as chaves de NAVEGADORES."""
+    sistema = platform.system().lower()
+    if sistema in ('darwin', 'windows'):
+        return sistema
+    return 'linux'
+
+
+def _assinatura(path):
+    """(tamanho, mtime) do executável, ou None se ele não existir."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def ler_versao(path):
+    """
+    Descobre a versão do navegador sem abri-lo quando possível.
+
+    No Windows, a versão é o nome da pasta ao lado do executável (Chrome,
+    Edge, Brave) ou está no `application.ini` (Firefox); no macOS, no
+    `Info.plist` do app; no Linux, vem de `navegador --version`.
+
+    Returns:
+        str: A versão (ex: '130.0.6723.91'), ou None.
+    """
+    sistema = _sistema()
+    pasta = os.path.dirname(path)
+    try:
+        if sistema == 'windows':
+            versoes = [nome for nome in os.listdir(pasta) if PADRAO_VERSAO.fullmatch(nome)]
+            if versoes:
+                return max(versoes, key=lambda v: tuple(int(parte) for parte in v.split('.')))
+            with open(os.path.join(pasta, 'application.ini'), 'r', encoding='utf-8') as f:
+                achado = re.search(r'^Version=(.+)$', f.read(), re.MULTILINE)
+            return achado.group(1).strip() if achado else None
+        if sistema == 'darwin':
+            with open(os.path.join(os.path.dirname(pasta), 'Info.plist'), 'rb') as f:
+                return plistlib.load(f).get('CFBundleShortVersionString')
+        saida = subprocess.run([path, '--version'], capture_output=True, text=True,
+                               timeout=TIMEOUT_VERSAO).stdout
+    except (OSError, ValueError, subprocess.SubprocessError, plistlib.InvalidFileException):
+        return None
+    achado = PADRAO_VERSAO.search(saida)
+    return achado.group() if achado else None
+
+
+def procurar_navegador():
+    """
+    Varredura completa: testa os caminhos de cada navegador, por prioridade.
+
+    Returns:
+        dict: Informações do navegador (name, channel, type, path,
+        executable_path, version), ou None.
+    """
+    sistema = _sistema()
+    for nome, config in NAVEGADORES.items():
+        for path in config['paths'].get(sistema, []):
+            if os.path.exists(path):
+                return {
+                    'name': nome,
+                    'channel': config.get('channel'),
+                    'type': config.get('type', 'chromium'),
+                    'path': path,
+                    'executable_path': config.get('executable_path', False),
+                    'version': ler_versao(path),
+                }
+    return None
+
+
+def _consultar_cache():
+    """Retorna o navegador do cache se o executável não mudou (um `stat`)."""
+    try:
+        with open(ARQUIVO_CACHE_NAVEGADOR, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return None
+    if cache.get('versao') != VERSAO_FORMATO or cache.get('sistema') != _sistema():
+        return None
+    navegador = cache.get('navegador') or {}
+    if not navegador.get('path') or _assinatura(navegador['path']) != cache.get('assinatura'):
+        return None
+    return navegador
+
+
+def _gravar_cache(navegador):
+    """Grava o navegador e a assinatura do executável (arquivo temporário + rename)."""
+    os.makedirs(DIRETORIO_CACHE, exist_ok=True)
+    temp_path = ARQUIVO_CACHE_NAVEGADOR + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'versao': VERSAO_FORMATO,
+            'sistema': _sistema(),
+            'assinatura': _assinatura(navegador['path']),
+            'navegador': navegador,
+        }, f)
+    os.replace(temp_path, ARQUIVO_CACHE_NAVEGADOR)
+
+
+def descartar_cache_navegador():
+    """Apaga o navegador guardado; a próxima detecção faz a varredura completa."""
+    try:
+        os.remove(ARQUIVO_CACHE_NAVEGADOR)
+    except OSError:
+        pass
+
+
+def descobrir_navegador(usar_cache=True):
+    """
+    Detecta o navegador, pelo cache quando ele ainda é válido.
+
+    Returns:
+        tuple: (navegador ou None, origem), onde origem é ORIGEM_CACHE,
+        ORIGEM_VARREDURA ou None.
+    """
+    if usar_cache:
+        navegador = _consultar_cache()
+        if navegador:
+            return navegador, ORIGEM_CACHE
+
+    navegador = procurar_navegador()
+    if navegador is None:
+        descartar_cache_navegador()
+        return None, None
+    try:
+        _gravar_cache(navegador)
+    except OSError:
+        pass
+    return navegador, ORIGEM_VARREDURA
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Descoberta do perfil do Chrome/Edge/Brave vinculado ao Inteli.
+
+A ordem de busca, da mais barata para a mais cara:
+
+1. cache em disco: o resultado anterior guarda o mtime do arquivo que o
+   originou; se o mtime não mudou, a descoberta custa um único `stat`;
+2. `Local State`: um só arquivo com `profile.info_cache`, que traz o e-mail
+   e o domínio da conta de cada perfil;
+3. varredura dos perfis: `Preferences` e `Secure Preferences` de todos os
+   perfis, lidos em paralelo e em blocos, parando no primeiro acerto e sem
+   passar de LIMITE_LEITURA bytes por arquivo. Um e-mail do Inteli em
+   `Preferences` só vale depois de confirmado nos campos da conta.
+"""
+
+import os
+import re
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from cache import DIRETORIO_CACHE
+
+# Configurações
+ARQUIVO_CACHE_PERFIS = os.path.join(DIRETORIO_CACHE, 'perfis.json')
+DOMINIO_INTELI = 'inteli.edu.br'
+VERSAO_FORMATO = 1
+TAMANHO_BLOCO = 64 * 1024
+LIMITE_LEITURA = 8 * 1024 * 1024  # bytes lidos no máximo por arquivo
+WORKERS_VARREDURA = 8
+
+# Em Preferences, um e-mail do Inteli (inclusive de subdomínios, como
+# @sou.inteli.edu.br) é só o filtro barato: o arquivo também guarda
+# autopreenchimento e histórico de sincronização, então o acerto é confirmado
+# nos campos da conta (`_email_da_conta`). Em Secure Preferences vale
+# qualquer menção ao domínio.
+PADRAO_EMAIL = re.compile(rb'[a-z0-9._%+-]+@(?:[a-z0-9-]+\.)*inteli\.edu\.br')
+PADRAO_DOMINIO = re.compile(rb'inteli\.edu\.br')
+SOBREPOSICAO = 256  # bytes mantidos entre blocos para não perder um acerto na divisa
+
+ORIGEM_CACHE = 'cache'
+ORIGEM_LOCAL_STATE = 'local_state'
+ORIGEM_VARREDURA = 'varredura'
+
+# Perfis de navegadores diferentes podem ser descobertos ao mesmo tempo
+_trava_cache = threading.Lock()
+
+
+def _ordem_perfil(nome):
+    """Default primeiro, depois Profile 1, 2, ... (mesma prioridade de antes)."""
+    if nome == 'Default':
+        return (0, 0, nome)
+    numero = nome.rpartition(' ')[2]
+    return (1, int(numero) if numero.isdigit() else 1 << 30, nome)
+
+
+def _mtime(caminho):
+    try:
+        return os.stat(caminho).st_mtime_ns
+    except OSError:
+        return None
+
+
+def buscar_em_arquivo(caminho, padrao, limite=LIMITE_LEITURA):
+    """
+    Procura `padrao` (regex de bytes, em minúsculas) lendo o arquivo em blocos.
+
+    Returns:
+        bytes: O trecho encontrado, ou None.
+    """
+    try:
+        with open(caminho, 'rb') as f:
+            resto = b''
+            lidos = 0
+            while lidos < limite:
+                bloco = f.read(TAMANHO_BLOCO)
+                if not bloco:
+                    break
+                lidos += len(bloco)
+                janela = resto + bloco.lower()
+                achado = padrao.search(janela)
+                if achado:
+                    return achado.group()
+                resto = janela[-SOBREPOSICAO:]
+    except OSError:
+        pass
+    return None
+
+
+def _eh_email_inteli(email):
+    """Verdadeiro para e-mails do domínio do Inteli ou de um subdomínio dele."""
+    if not isinstance(email, str) or '@' not in email:
+        return False
+    dominio = email.lower().rpartition('@')[2]
+    return dominio == DOMINIO_INTELI or dominio.endswith('.' + DOMINIO_INTELI)
+
+
+def _email_da_conta(prefs_path):
+    """
+    E-mail do Inteli nos campos de conta do `Preferences` (`account_info` e
+    `signin.allowed_first_run_account`), ou None.
+    """
+    try:
+        with open(prefs_path, 'r', encoding='utf-8') as f:
+            prefs = json.load(f)
+    except (json.JSONDecodeError, IOError, UnicodeDecodeError):
+        return None
+    if not isinstance(prefs, dict):
+        return None
+
+    contas = prefs.get('account_info')
+    emails = [conta.get('email') for conta in contas if isinstance(conta, dict)] if isinstance(contas, list) else []
+    signin = prefs.get('signin')
+    if isinstance(signin, dict):
+        emails.append(signin.get('allowed_first_run_account'))
+    for email in emails:
+        if _eh_email_inteli(email):
+            return email
+    return None
+
+
+def _ler_cache():
+    try:
+        with open(ARQUIVO_CACHE_PERFIS, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return {}
+    if cache.get('versao') != VERSAO_FORMATO:
+        return {}
+    return cache.get('entradas', {})
+
+
+def _gravar_cache(user_data_dir, entrada):
+    """
+    Grava a entrada deste diretório de dados (arquivo temporário + rename).
+
+    O cache é só uma otimização: uma falha de escrita (disco cheio, diretório
+    sem permissão) é ignorada em vez de interromper a coleta.
+    """
+    with _trava_cache:
+        entradas = _ler_cache()
+        entradas[os.path.abspath(user_data_dir)] = entrada
+        try:
+            os.makedirs(DIRETORIO_CACHE, exist_ok=True)
+            temp_path = ARQUIVO_CACHE_PERFIS + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'versao': VERSAO_FORMATO, 'entradas': entradas}, f)
+            os.replace(temp_path, ARQUIVO_CACHE_PERFIS)
+        except OSError:
+            pass
+
+
+def _consultar_cache(user_data_dir):
+    """Retorna (perfil, email) do cache se o arquivo de origem não mudou."""
+    entrada = _ler_cache().get(os.path.abspath(user_data_dir))
+    if not entrada:
+        return None
+    # Um stat por arquivo que originou o resultado (normalmente um só)
+    for caminho, mtime in entrada['arquivos'].items():
+        if _mtime(caminho) != mtime:
+            return None
+    return entrada['perfil'], entrada.get('email')
+
+
+def _buscar_local_state(user_data_dir):
+    """Procura a conta do Inteli em `profile.info_cache` do Local State."""
+    try:
+        with open(os.path.join(user_data_dir, 'Local State'), 'r', encoding='utf-8') as f:
+            info_cache = json.load(f).get('profile', {}).get('info_cache', {})
+    except (json.JSONDecodeError, IOError, AttributeError):
+        return None
+
+    for perfil in sorted(info_cache, key=_ordem_perfil):
+        info = info_cache[perfil] or {}
+        dominio = (info.get('hosted_domain') or '').lower()
+        if (_eh_email_inteli(info.get('user_name'))
+                or dominio == DOMINIO_INTELI or dominio.endswith('.' + DOMINIO_INTELI)):
+            if os.path.isdir(os.path.join(user_data_dir, perfil)):
+                return perfil, info.get('user_name') or None
+    return None
+
+
+def _varrer_perfil(perfil_path):
+    """
+    Procura a conta do Inteli nos arquivos de preferências de um perfil.
+
+    Returns:
+        tuple: (arquivo que casou, e-mail ou None), ou None.
+    """
+    prefs = os.path.join(perfil_path, 'Preferences')
+    if buscar_em_arquivo(prefs, PADRAO_EMAIL):
+        email = _email_da_conta(prefs)
+        if email:
+            return prefs, email
+    secure = os.path.join(perfil_path, 'Secure Preferences')
+    if buscar_em_arquivo(secure, PADRAO_DOMINIO):
+        return secure, None
+    return None
+
+
+def _listar_perfis(user_data_dir):
+    try:
+        nomes = [e.name for e in os.scandir(user_data_dir)
+                 if e.is_dir() and (e.name == 'Default' or e.name.startswith('Profile '))]
+    except OSError:
+        return []
+    return sorted(nomes, key=_ordem_perfil)
+
+
+def descobrir_perfil(user_data_dir, usar_cache=True):
+    """
+    Descobre o perfil vinculado ao Inteli.
+
+    Returns:
+        tuple: (perfil ou None, e-mail ou None, origem), onde origem é
+        ORIGEM_CACHE, ORIGEM_LOCAL_STATE, ORIGEM_VARREDURA ou None.
+    """
+    if usar_cache:
+        achado = _consultar_cache(user_data_dir)
+        if achado is not None:
+            return achado[0], achado[1], ORIGEM_CACHE
+
+    local_state = os.path.join(user_data_dir, 'Local State')
+    achado = _buscar_local_state(user_data_dir)
+    if achado:
+        perfil, email = achado
+        _gravar_cache(user_data_dir, {'perfil': perfil, 'email': email,
+                                      'arquivos': {local_state: _mtime(local_state)}})
+        return perfil, email, ORIGEM_LOCAL_STATE
+
+    perfis = _listar_perfis(user_data_dir)
+    caminhos = [os.path.join(user_data_dir, perfil) for perfil in perfis]
+    with ThreadPoolExecutor(max_workers=max(1, min(WORKERS_VARREDURA, len(caminhos)))) as executor:
+        resultados = list(executor.map(_varrer_perfil, caminhos))
+
+    # Respeita a prioridade dos perfis, não a ordem em que as threads terminaram
+    for perfil, resultado in zip(perfis, resultados):
+        if resultado:
+            arquivo, email = resultado
+            _gravar_cache(user_data_dir, {'perfil': perfil, 'email': email,
+                                          'arquivos': {arquivo: _mtime(arquivo)}})
+            return perfil, email, ORIGEM_VARREDURA
+
+    # Sem perfil do Inteli: revalida quando o Local State ou a lista de perfis mudar
+    _gravar_cache(user_data_dir, {'perfil': None, 'email': None,
+                                  'arquivos': {local_state: _mtime(local_state),
+                                               user_data_dir: _mtime(user_data_dir)}})
+    return None, None, None
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Sessão do Adalove salva entre execuções.
+
+Depois de uma coleta bem-sucedida, guarda o `storage_state` do Playwright
+(cookies e localStorage) filtrado para os domínios do Inteli, junto com a
+URL da página do módulo coletado. Na execução seguinte a coleta cria um
+contexto leve a partir desse estado e vai direto ao módulo, sem copiar o
+perfil do navegador nem passar pelo login.
+"""
+
+import os
+import json
+import time
+from urllib.parse import urlparse
+
+from cache import DIRETORIO_CACHE
+
+# Configurações
+ARQUIVO_SESSAO = os.path.join(DIRETORIO_CACHE, 'sessao.json')
+DOMINIO_SESSAO = 'inteli.edu.br'
+VERSAO_FORMATO = 1  # incrementar quando o formato do arquivo mudar
+
+
+def _do_dominio(host, dominio=DOMINIO_SESSAO):
+    """Verdadeiro se `host` é o domínio ou um subdomínio dele."""
+    host = (host or '').lstrip('.').lower()
+    return host == dominio or host.endswith('.' + dominio)
+
+
+def filtrar_storage_state(estado, dominio=DOMINIO_SESSAO):
+    """Mantém do `storage_state` só os cookies e origens do domínio."""
+    return {
+        'cookies': [c for c in estado.get('cookies', []) if _do_dominio(c.get('domain'), dominio)],
+        'origins': [o for o in estado.get('origins', []) if _do_dominio(urlparse(o.get('origin', '')).hostname, dominio)],
+    }
+
+
+def salvar_sessao(context, url_modulo):
+    """
+    Grava o estado filtrado do contexto e a URL do módulo.
+
+    O arquivo contém cookies de login, então é criado legível só pelo dono.
+
+    Returns:
+        bool: True se a sessão foi gravada.
+    """
+    estado = filtrar_storage_state(context.storage_state())
+    if not estado['cookies']:
+        return False
+
+    os.makedirs(DIRETORIO_CACHE, exist_ok=True)
+    temp_path = ARQUIVO_SESSAO + '.tmp'
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump({
+            'versao': VERSAO_FORMATO,
+            'url_modulo': url_modulo,
+            'salvo_em': time.time(),
+            'storage_state': estado,
+        }, f)
+    os.replace(temp_path, ARQUIVO_SESSAO)
+    return True
+
+
+def carregar_sessao():
+    """
+    Lê a sessão salva.
+
+    Returns:
+        dict: Com 'url_modulo' e 'storage_state', ou None se não houver sessão
+        utilizável (arquivo ausente, formato antigo ou todos os cookies vencidos).
+    """
+    try:
+        with open(ARQUIVO_SESSAO, 'r', encoding='utf-8') as f:
+            sessao = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return None
+
+    if sessao.get('versao') != VERSAO_FORMATO or not sessao.get('url_modulo'):
+        return None
+
+    # expires == -1 indica cookie de sessão (sem validade definida)
+    agora = time.time()
+    cookies = sessao['storage_state'].get('cookies', [])
+    if not any(c.get('expires', -1) == -1 or c['expires'] > agora for c in cookies):
+        return None
+
+    return sessao
+
+
+def descartar_sessao():
+    """Apaga a sessão salva (ex: quando o servidor já não a aceita)."""
+    try:
+        os.remove(ARQUIVO_SESSAO)
+    except OSError:
+        pass
+
+
+def sessao_aceita(page, url_modulo):
+    """
+    Verifica se a navegação para o módulo não foi desviada para o login.
+
+    Um redirecionamento para outro host (SSO) indica sessão expirada.
+    """
+    return urlparse(page.url).hostname == urlparse(url_modulo).hostname
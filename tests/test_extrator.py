@@ -0,0 +1,36 @@
+import pytest
+
+from extrator import ORDEM_BACKENDS, backend_disponivel, extrair_linhas, extrair_linhas_arquivo
+
+BACKENDS = [nome for nome in ORDEM_BACKENDS if backend_disponivel(nome)]
+
+CELULAS = '<td data-label="Atividades">Ponderada 1</td><td data-label="Pontos">2</td><td data-label="Notas">8,5</td>'
+ESPERADO = [('Ponderada 1', 2.0, 8.5)]
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('abertura', [
+    '<TR CLASS="MuiTableRow-root styled-tr">',
+    '<tr class=styled-tr>',
+    "<tr data-id='1' class='styled-tr'>",
+])
+def test_recorte_aceita_variacoes_da_tag(tmp_path, backend, abertura):
+    html = f'<html><body><style>.styled-tr{{}}</style><table>{abertura}{CELULAS}</tr></table></body></html>'
+    caminho = tmp_path / 'Adalove.html'
+    caminho.write_text(html, encoding='utf-8')
+
+    assert extrair_linhas_arquivo(str(caminho), backend) == extrair_linhas(html, backend) == ESPERADO
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_fechamentos_opcionais_do_html5(tmp_path, backend):
+    linhas = ''.join(
+        f'<tr class="styled-tr"><td data-label="Atividades">{nome}'
+        f'<td data-label="Pontos">{peso}<td data-label="Notas">{nota}'
+        for nome, peso, nota in (('Ponderada 1', '2', '8,5'), ('Prova do Módulo', '3', '7')))
+    html = f'<html><body><table><tbody>{linhas}</tbody></table><p>Rodapé</body></html>'
+    caminho = tmp_path / 'Adalove.html'
+    caminho.write_text(html, encoding='utf-8')
+
+    esperado = [('Ponderada 1', 2.0, 8.5), ('Prova do Módulo', 3.0, 7.0)]
+    assert extrair_linhas(html, backend) == extrair_linhas_arquivo(str(caminho), backend) == esperado
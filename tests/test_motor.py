@@ -0,0 +1,17 @@
+from motor import STATUS_META, atividades_de_linhas, consolidar, calcular
+
+
+def test_pendente_sem_peso_conta_como_zero():
+    boletim = consolidar(atividades_de_linhas([
+        ('Autoestudo 1', 2.0, 8.0),
+        ('Ponderada 1', None, None),
+        ('Prova de Módulo', 3.0, None),
+    ]))
+
+    assert boletim.peso_total == 5.0
+    assert boletim.peso_prova == 3.0
+    assert list(boletim.pesos_pendentes) == [0.0]
+
+    resultado = calcular(boletim)
+    assert resultado.status == STATUS_META
+    assert resultado.nota_necessaria == (7.0 * 5.0 - 16.0) / 3.0
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+import perfis
+
+
+@pytest.fixture(autouse=True)
+def cache_temporario(tmp_path, monkeypatch):
+    monkeypatch.setattr(perfis, 'ARQUIVO_CACHE_PERFIS', str(tmp_path / 'perfis.json'))
+
+
+def _criar_perfil(user_data_dir, nome, prefs):
+    perfil = user_data_dir / nome
+    perfil.mkdir(parents=True)
+    (perfil / 'Preferences').write_text(json.dumps(prefs), encoding='utf-8')
+
+
+def test_email_fora_da_conta_nao_escolhe_o_perfil(tmp_path):
+    user_data_dir = tmp_path / 'User Data'
+    _criar_perfil(user_data_dir, 'Default', {
+        'account_info': [{'email': 'pessoal@gmail.com'}],
+        'autofill': {'ultimo': 'colega@sou.inteli.edu.br'},
+    })
+    _criar_perfil(user_data_dir, 'Profile 1', {
+        'account_info': [{'email': 'aluno@sou.inteli.edu.br'}],
+    })
+
+    perfil, email, origem = perfis.descobrir_perfil(str(user_data_dir), usar_cache=False)
+
+    assert (perfil, email, origem) == ('Profile 1', 'aluno@sou.inteli.edu.br', perfis.ORIGEM_VARREDURA)
+
+
+def test_conta_do_signin_e_aceita(tmp_path):
+    user_data_dir = tmp_path / 'User Data'
+    _criar_perfil(user_data_dir, 'Default', {'signin': {'allowed_first_run_account': 'prof@inteli.edu.br'}})
+
+    assert perfis.descobrir_perfil(str(user_data_dir), usar_cache=False)[:2] == ('Default', 'prof@inteli.edu.br')